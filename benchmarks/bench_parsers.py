@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import about_page_html, discovery_page_html, profile_page_html
+from parsers import parse_creator_profile_href, parse_discovery_cards, parse_profile_details
+
+
+def read_fixture(path, default):
+    """
+    Reads a saved HTML fixture, or returns the synthetic default when no path is given.
+
+    Args:
+        path (str): The fixture path, or None.
+        default (str): The HTML to use when `path` is None.
+
+    Returns:
+        str: The fixture HTML.
+    """
+    if path is None:
+        return default
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def time_parser(name, parser, html, repeat):
+    """
+    Times a parser over the same page and prints the per-page cost.
+
+    Args:
+        name (str): The label printed for the parser.
+        parser (callable): The parse function, called with the HTML.
+        html (str): The page HTML.
+        repeat (int): How many times to parse the page.
+
+    Returns:
+        float: The mean time per page in milliseconds.
+    """
+    result = parser(html)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parser(html)
+    per_page_ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"{name:<12} {per_page_ms:8.3f} ms/page  {1000 / per_page_ms:10.1f} pages/s  -> {result!r:.80}")
+    return per_page_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the offline HTML parsers on saved or synthetic pages.")
+    parser.add_argument('--discovery', help="Saved discovery page HTML")
+    parser.add_argument('--about', help="Saved community /about page HTML")
+    parser.add_argument('--profile', help="Saved creator profile page HTML")
+    parser.add_argument('--cards', type=int, default=30, help="Cards on the synthetic discovery page")
+    parser.add_argument('--repeat', type=int, default=200, help="Parses per page")
+    args = parser.parse_args()
+
+    time_parser('discovery', parse_discovery_cards, read_fixture(args.discovery, discovery_page_html(args.cards)), args.repeat)
+    time_parser('about', parse_creator_profile_href, read_fixture(args.about, about_page_html()), args.repeat)
+    time_parser('profile', parse_profile_details, read_fixture(args.profile, profile_page_html()), args.repeat)
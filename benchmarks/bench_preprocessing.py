@@ -0,0 +1,119 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import preprocess_frame
+
+PRICES = [' $49 /month', ' $9 /month', ' $1,299 /month', ' Free', ' $120']
+# Counts the row-wise engine can parse; it has no comma or 'M' support.
+COUNTS = ['0', '7', '12', '999', '1k', '1.5k', '12.3k', '250k']
+
+
+def synthetic_full_data(rows, missing=0.0, seed=0):
+    """
+    Builds a full_data-like DataFrame of scraped strings.
+
+    Args:
+        rows (int): The number of rows.
+        missing (float): The share of Price, Contributions and Followers values left empty (default is 0).
+        seed (int): The random seed (default is 0).
+
+    Returns:
+        pd.DataFrame: The synthetic rows, every column holding strings as read from CSV.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Full URL': [f'https://www.skool.com/community-{i}' for i in range(rows)],
+        'Community Name': [f'Community {i}' for i in range(rows)],
+        'Status': rng.choice(['Private', 'Public'], rows),
+        'Members': rng.choice(['1200.0', '87', '15000.0'], rows),
+        'Price': rng.choice(PRICES, rows),
+        'Contributions': rng.choice(COUNTS, rows),
+        'Followers': rng.choice(COUNTS, rows),
+    })
+    if missing:
+        for column in ('Price', 'Contributions', 'Followers'):
+            df[column] = df[column].mask(rng.random(rows) < missing)
+    return df
+
+
+def legacy_transform_price(price):
+    # The row-wise transform this benchmark compares against
+    if '/month' in price:
+        return price.split(' /month')[0]
+    return price
+
+
+def legacy_transform_contributions_followers(contribution):
+    # The row-wise transform this benchmark compares against
+    if 'k' in contribution:
+        return float(contribution.split('k')[0]) * 1000
+    return int(contribution)
+
+
+def legacy_preprocess_frame(df):
+    """
+    Preprocesses a DataFrame the way preprocess_data did before it was vectorized.
+
+    Args:
+        df (pd.DataFrame): The scraped rows; missing values are not supported.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with the transformed columns.
+    """
+    df['Price'] = df['Price'].apply(legacy_transform_price)
+    df['Contributions'] = df['Contributions'].apply(legacy_transform_contributions_followers)
+    df['Followers'] = df['Followers'].apply(legacy_transform_contributions_followers)
+    return df
+
+
+def time_engine(name, engine, df, repeat):
+    """
+    Times a preprocessing engine on fresh copies of the same DataFrame.
+
+    Args:
+        name (str): The label printed for the engine.
+        engine (callable): Called with a copy of the DataFrame.
+        df (pd.DataFrame): The input rows.
+        repeat (int): How many times to run the engine.
+
+    Returns:
+        float: The best time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        copy = df.copy()
+        start = time.perf_counter()
+        engine(copy)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<12} {best:8.3f} s  {len(df) / best / 1e6:8.2f} M rows/s")
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the row-wise and vectorized preprocessing engines.")
+    parser.add_argument('--input', help="A scraped CSV file to use instead of synthetic rows")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Synthetic rows")
+    parser.add_argument('--missing', type=float, default=0.0,
+                        help="Share of missing values; the row-wise engine is skipped when above 0")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per engine; the best is reported")
+    args = parser.parse_args()
+
+    if args.input:
+        df = pd.read_csv(args.input, dtype=str)
+    else:
+        df = synthetic_full_data(args.rows, args.missing)
+    print(f"{len(df)} rows")
+
+    vectorized = time_engine('vectorized', preprocess_frame, df, args.repeat)
+    if args.missing == 0 and not df[['Price', 'Contributions', 'Followers']].isna().any().any():
+        row_wise = time_engine('row-wise', legacy_preprocess_frame, df, args.repeat)
+        print(f"speedup      {row_wise / vectorized:8.1f}x")
+    else:
+        print("row-wise     skipped: it cannot handle missing values")
@@ -0,0 +1,177 @@
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import (CARDS_CLASS, CARD_LINK_CLASS, CARD_CONTENT_CLASS, CARD_META_CLASS, TYPOGRAPHY_CLASS,
+                     PAGINATION_CLASS, PAGINATION_BUTTON_CLASS, GROUP_INFO_CLASSES, INFO_ITEM_CLASS, LINK_CLASS,
+                     SOCIAL_LINKS_CLASS, NEXT_DATA_ID)
+
+
+def discovery_card_html(slug, name, status='Private', members='1.2kMembers', price='$49 /month'):
+    """
+    Builds the markup of a single discovery card.
+
+    Args:
+        slug (str): The community slug used in the card's href.
+        name (str): The community name.
+        status (str): The status shown in the meta line.
+        members (str): The members text shown in the meta line.
+        price (str): The price shown in the meta line.
+
+    Returns:
+        str: The card HTML.
+    """
+    return (
+        f'<a class="{CARD_LINK_CLASS}" href="/{slug}">'
+        f'<div class="{CARD_CONTENT_CLASS}">'
+        f'<div class="{TYPOGRAPHY_CLASS}">{name}</div>'
+        f'<div class="{CARD_META_CLASS}"><span>{status}</span> • <span>{members}</span> • <span>{price}</span></div>'
+        f'</div></a>'
+    )
+
+
+def synthetic_card(page, i, category=None):
+    """
+    Returns the fields of the i-th synthetic card of a discovery page.
+
+    Args:
+        page (int): The page number.
+        i (int): The card's position on the page.
+        category (str, optional): The category the page is filtered by, used in the slug.
+
+    Returns:
+        tuple: The slug, the name, the members text shown on the card, and the monthly price in
+            dollars (0 for free communities).
+    """
+    prefix = f'{category}-' if category else ''
+    members = f'{(i % 9) + 1}.{i % 10}kMembers' if i % 2 else f'{i + 10}Members'
+    return f'community-{prefix}{page}-{i}', f'Community {prefix}{page}-{i}', members, 49 if i % 3 else 0
+
+
+def discovery_listing_props(cards=30, page=1, last_page=1, category=None, page_size=None):
+    """
+    Builds the Next.js page props of a synthetic discovery listing, as read by `parsers.parse_listing_payload`.
+
+    Args:
+        cards (int): The number of cards on each HTML page (default is 30).
+        page (int): The page number (default is 1).
+        last_page (int): The number of HTML pages (default is 1).
+        category (str, optional): The category the listing is filtered by.
+        page_size (int, optional): Cards per listing page. Defaults to `cards`; the same
+            communities are then spread over fewer or more pages.
+
+    Returns:
+        dict: The page props, with the 'groups' and 'totalPages' keys.
+    """
+    total = cards * last_page
+    size = page_size or cards
+    groups = []
+    for position in range((page - 1) * size, min(page * size, total)):
+        slug, name, members, price = synthetic_card(position // cards + 1, position % cards, category)
+        count = round(float(members.split('k')[0]) * 1000) if 'kMembers' in members else int(members.split('M')[0])
+        groups.append({'name': slug, 'metadata': {'displayName': name, 'privacy': 1, 'totalMembers': count,
+                                                  'price': price}})
+    return {'groups': groups, 'totalPages': math.ceil(total / size) if size else 0}
+
+
+def discovery_page_html(cards=30, page=1, last_page=1, category=None, build_id=None):
+    """
+    Builds a synthetic discovery page that matches the selectors in `parsers`.
+
+    Args:
+        cards (int): The number of cards on the page (default is 30).
+        page (int): The page number, used to make card slugs unique (default is 1).
+        last_page (int): The number shown on the last pagination button (default is 1).
+        category (str, optional): The category the page is filtered by, used in card slugs.
+        build_id (str, optional): When given, the page embeds its listing as Next.js data of this build.
+
+    Returns:
+        str: The page HTML.
+    """
+    card_markup = ''
+    for i in range(cards):
+        slug, name, members, price = synthetic_card(page, i, category)
+        card_markup += discovery_card_html(slug, name, members=members, price='$49 /month' if price else 'Free')
+    buttons = ''.join(f'<span class="{PAGINATION_BUTTON_CLASS}">{n}</span>' for n in (1, last_page))
+    next_data = ''
+    if build_id:
+        props = discovery_listing_props(cards, page, last_page, category)
+        payload = {'buildId': build_id, 'props': {'pageProps': props}}
+        next_data = f'<script id="{NEXT_DATA_ID}" type="application/json">{json.dumps(payload)}</script>'
+    return (
+        '<html><head><title>Discovery</title></head><body>'
+        f'<div class="{PAGINATION_CLASS}">{buttons}</div>'
+        f'<div class="{CARDS_CLASS}">{card_markup}</div>'
+        f'{next_data}</body></html>'
+    )
+
+
+def about_page_html(profile_href='/@creator'):
+    """
+    Builds a synthetic community /about page.
+
+    Args:
+        profile_href (str): The creator's profile href (default is '/@creator').
+
+    Returns:
+        str: The page HTML.
+    """
+    return (
+        '<html><body>'
+        f'<div class="{GROUP_INFO_CLASSES[0]}">'
+        f'<div class="{INFO_ITEM_CLASS}">Private</div>'
+        f'<div class="{INFO_ITEM_CLASS}">1.2k members</div>'
+        f'<div class="{INFO_ITEM_CLASS}"><a class="{LINK_CLASS}" href="{profile_href}">Creator</a></div>'
+        '</div></body></html>'
+    )
+
+
+def profile_page_html(contributions='312', followers='1.2k', links=None):
+    """
+    Builds a synthetic creator profile page.
+
+    Args:
+        contributions (str): The contributions counter text (default is '312').
+        followers (str): The followers counter text (default is '1.2k').
+        links (list, optional): Social link hrefs. Defaults to one link per platform.
+
+    Returns:
+        str: The page HTML.
+    """
+    if links is None:
+        links = ['https://instagram.com/creator', 'https://x.com/creator', 'https://youtube.com/@creator',
+                 'https://facebook.com/creator', 'https://linkedin.com/in/creator', 'https://creator.dev']
+    anchors = ''.join(f'<a class="{LINK_CLASS}" href="{href}">link</a>' for href in links)
+    return (
+        '<html><body>'
+        f'<div class="{TYPOGRAPHY_CLASS}">{contributions}</div>'
+        f'<div class="{TYPOGRAPHY_CLASS}">{followers}</div>'
+        f'<div class="{SOCIAL_LINKS_CLASS}">{anchors}</div>'
+        '</body></html>'
+    )
+
+
+def write_fixtures(directory, cards=30):
+    """
+    Saves one synthetic page of each kind to a directory.
+
+    Args:
+        directory (str): The directory to write 'discovery.html', 'about.html' and 'profile.html' to.
+        cards (int): The number of cards on the discovery page (default is 30).
+    """
+    os.makedirs(directory, exist_ok=True)
+    pages = {
+        'discovery.html': discovery_page_html(cards),
+        'about.html': about_page_html(),
+        'profile.html': profile_page_html(),
+    }
+    for name, html in pages.items():
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+
+if __name__ == "__main__":
+    write_fixtures(sys.argv[1] if len(sys.argv) > 1 else 'fixtures')
@@ -0,0 +1,200 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import about_page_html, discovery_listing_props, discovery_page_html, profile_page_html
+
+
+def load_recordings(directory):
+    """
+    Loads recorded pages from an HtmlCache directory, keyed by path and query.
+
+    Args:
+        directory (str): The cache directory, as written by html_cache.HtmlCache.
+
+    Returns:
+        dict: A mapping from 'path?query' (or 'path') to the recorded HTML.
+    """
+    pages = {}
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.json.gz'):
+            continue
+        with gzip.open(entry.path, 'rt', encoding='utf-8') as f:
+            record = json.load(f)
+        parts = urlsplit(record['url'])
+        pages[f'{parts.path}?{parts.query}' if parts.query else parts.path] = record['html']
+    return pages
+
+
+class ReplayServer:
+    """
+    A local HTTP server that replays discovery, /about and profile pages for benchmarks.
+
+    Recorded pages (from an HtmlCache directory) are served by path; every other URL gets a
+    synthetic page built from `fixtures`. Synthetic discovery pages live under /discovery?p=N,
+    each card links to /community-P-I, whose /about page links to one of `creators` creator
+    profiles, so several communities share a creator as on the real site. A ?c=<category> filter
+    serves a separate listing of `pages` pages per category.
+
+    With a `build_id`, discovery pages embed their listing as Next.js data, and the listing is
+    also served as JSON under /_next/data/<build_id>/discovery.json?p=N, where a ?limit=<n>
+    parameter returns n cards per page.
+
+    Attributes:
+        cards (int): The number of cards on each synthetic discovery page.
+        pages (int): The number of synthetic discovery pages.
+        creators (int): The number of distinct synthetic creators.
+        latency (float): Seconds added before every response.
+        jitter (float): Up to this many extra random seconds added before every response.
+        recordings (dict): Recorded pages keyed by 'path?query'.
+        build_id (str): The Next.js build id of the listing endpoint, or None to serve HTML only.
+        port (int): The port the server listens on.
+        requests (int): The number of requests served so far.
+    """
+
+    def __init__(self, cards=30, pages=3, creators=10, latency=0.0, jitter=0.0, recordings=None, port=0,
+                 build_id=None):
+        """
+        Initializes the server without starting it.
+
+        Args:
+            cards (int): Cards per synthetic discovery page (default is 30).
+            pages (int): Synthetic discovery pages (default is 3).
+            creators (int): Distinct synthetic creators (default is 10).
+            latency (float): Seconds added before every response (default is 0).
+            jitter (float): Maximum random extra seconds per response (default is 0).
+            recordings (str, optional): An HtmlCache directory with recorded pages to replay.
+            port (int): The port to listen on; 0 picks a free one (default is 0).
+            build_id (str, optional): Serve the Next.js listing endpoint under this build id.
+        """
+        self.cards = cards
+        self.pages = pages
+        self.creators = creators
+        self.latency = latency
+        self.jitter = jitter
+        self.recordings = load_recordings(recordings) if recordings else {}
+        self.port = port
+        self.build_id = build_id
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        Returns the base URL of the running server.
+
+        Returns:
+            str: The base URL, e.g. 'http://127.0.0.1:8765'.
+        """
+        return f'http://127.0.0.1:{self.port}'
+
+    def render(self, path, query):
+        """
+        Returns the page for a request path.
+
+        Args:
+            path (str): The URL path.
+            query (str): The URL query string.
+
+        Returns:
+            str: The page HTML (or JSON for the listing endpoint), or None if there is no such page.
+        """
+        recorded = self.recordings.get(f'{path}?{query}' if query else path)
+        if recorded is not None:
+            return recorded
+        path = path.rstrip('/')
+        params = parse_qs(query)
+        page = int(params.get('p', ['1'])[0])
+        category = params.get('c', [None])[0]
+        if path == '/discovery':
+            if page > self.pages:
+                return None
+            return discovery_page_html(self.cards, page, self.pages, category, self.build_id)
+        if self.build_id and path == f'/_next/data/{self.build_id}/discovery.json':
+            page_size = int(params['limit'][0]) if 'limit' in params else None
+            props = discovery_listing_props(self.cards, page, self.pages, category, page_size)
+            return json.dumps({'pageProps': props}) if page <= max(1, props['totalPages']) else None
+        if path.startswith('/@creator-'):
+            return profile_page_html()
+        if path.endswith('/about'):
+            creator = zlib.crc32(path.encode('utf-8')) % max(1, self.creators)
+            return about_page_html(f'/@creator-{creator}')
+        return None
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+
+        Returns:
+            ReplayServer: The server itself, so it can be started inline.
+        """
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with replay._lock:
+                    replay.requests += 1
+                delay = replay.latency + (random.uniform(0, replay.jitter) if replay.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                parts = urlsplit(self.path)
+                html = replay.render(parts.path, parts.query)
+                body = (html or 'Not found').encode('utf-8')
+                self.send_response(200 if html is not None else 404)
+                content_type = 'application/json' if parts.path.endswith('.json') else 'text/html; charset=utf-8'
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded and synthetic Skool pages locally.")
+    parser.add_argument('--port', type=int, default=8765, help="The port to listen on")
+    parser.add_argument('--cards', type=int, default=30, help="Cards per synthetic discovery page")
+    parser.add_argument('--pages', type=int, default=3, help="Synthetic discovery pages")
+    parser.add_argument('--creators', type=int, default=10, help="Distinct synthetic creators")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added before every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Maximum random extra seconds per response")
+    parser.add_argument('--recordings', help="An html_cache directory whose pages are replayed")
+    parser.add_argument('--build-id', help="Also serve the Next.js listing endpoint under this build id")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.cards, args.pages, args.creators, args.latency, args.jitter, args.recordings,
+                          args.port, args.build_id).start()
+    print(f"Serving on {server.url}/discovery. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,316 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from DrissionPage._base.driver import Driver
+from metrics import METRICS
+from preprocessing import preprocess_data
+from ratelimit import AdaptiveRateLimiter
+from replay_server import ReplayServer
+from scrape import AgentScraper
+from storage import read_table
+import scrape_profile
+import scrape_profile_details
+
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+
+class CdpCounter:
+    """
+    Counts the CDP commands DrissionPage sends to the browser.
+
+    While active, every Driver.run call, which is how DrissionPage sends each CDP command,
+    goes through a counting proxy.
+
+    Attributes:
+        calls (int): The number of CDP commands sent while active.
+    """
+
+    def __init__(self):
+        """
+        Initializes the counter.
+        """
+        self.calls = 0
+        self._run = None
+
+    def __enter__(self):
+        counter = self
+        self._run = run = Driver.run
+
+        def counted_run(driver, *args, **kwargs):
+            counter.calls += 1
+            return run(driver, *args, **kwargs)
+
+        Driver.run = counted_run
+        return self
+
+    def __exit__(self, *exc_info):
+        Driver.run = self._run
+
+
+def timed(obj, method_name, latencies):
+    """
+    Replaces a method on one object with a wrapper that records each call's duration.
+
+    Args:
+        obj: The scraper instance.
+        method_name (str): The per-page method to time.
+        latencies (list): The list the durations in seconds are appended to.
+    """
+    method = getattr(obj, method_name)
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    setattr(obj, method_name, wrapper)
+
+
+def summarize(latencies, elapsed, cdp_calls):
+    """
+    Builds the metrics of one stage.
+
+    Args:
+        latencies (list): Per-page durations in seconds.
+        elapsed (float): The wall time of the stage in seconds.
+        cdp_calls (int): The CDP commands sent during the stage.
+
+    Returns:
+        dict: pages, seconds, pages_per_s, p50_ms, p95_ms and cdp_calls_per_page.
+    """
+    pages = len(latencies)
+    return {
+        'pages': pages,
+        'seconds': round(elapsed, 4),
+        'pages_per_s': round(pages / elapsed, 2) if elapsed else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 2) if pages else None,
+        'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 2) if pages else None,
+        'cdp_calls_per_page': round(cdp_calls / pages, 2) if pages else None,
+    }
+
+
+def run_stage(name, scraper, method_name, work, verbose):
+    """
+    Runs one scraper stage while timing its per-page method and counting CDP commands.
+
+    Args:
+        name (str): The stage name, used for printing.
+        scraper: The scraper instance.
+        method_name (str): The scraper's per-page method.
+        work (callable): Runs the stage.
+        verbose (bool): Whether to show the scraper's own output.
+
+    Returns:
+        dict: The stage metrics.
+    """
+    latencies = []
+    timed(scraper, method_name, latencies)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with CdpCounter() as cdp, output:
+        start = time.perf_counter()
+        work()
+        elapsed = time.perf_counter() - start
+    metrics = summarize(latencies, elapsed, cdp.calls)
+    print(f"{name:<12} {metrics['pages']:6d} pages  {metrics['pages_per_s'] or 0:9.1f} pages/s  "
+          f"p50 {metrics['p50_ms'] or 0:8.2f} ms  p95 {metrics['p95_ms'] or 0:8.2f} ms  "
+          f"{metrics['cdp_calls_per_page'] or 0:6.1f} CDP/page")
+    return metrics
+
+
+def peak_rss_mb():
+    """
+    Returns the peak resident memory of this process.
+
+    The browser runs in its own processes and is not included.
+
+    Returns:
+        float: The peak RSS in MiB.
+    """
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KiB elsewhere
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def run_suite(base_url, backend='http', extraction='html', concurrency=1, verbose=False):
+    """
+    Runs discovery, /about, profile and preprocessing end to end against a replay server.
+
+    Args:
+        base_url (str): The replay server's base URL.
+        backend (str): The scrapers' backend, 'http' or 'browser' (default is 'http').
+        extraction (str): The browser extraction mode (default is 'html').
+        concurrency (int): Discovery tabs (default is 1).
+        verbose (bool): Whether to show the scrapers' own output (default is False).
+
+    Returns:
+        dict: The metrics of each stage, keyed by stage name.
+    """
+    # The limiter is opened wide so the benchmark measures the scrapers, not the pacing.
+    rate_limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=concurrency)
+    stages = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        listing_path = os.path.join(work_dir, 'main_content_data.csv')
+        profiles_path = os.path.join(work_dir, 'data_with_creator_profiles.csv')
+        details_path = os.path.join(work_dir, 'full_data.csv')
+
+        discovery = AgentScraper(base_url=f'{base_url}/discovery', user_profile='Benchmark', concurrency=concurrency,
+                                 backend=backend, extraction=extraction, rate_limiter=rate_limiter)
+        try:
+            stages['discovery'] = run_stage(
+                'discovery', discovery, 'extract_data_from_page',
+                lambda: discovery.scrape_all_pages(output_path=listing_path), verbose)
+        finally:
+            discovery.close()
+
+        profile_scraper = scrape_profile.Scraper(base_url=base_url, user_profile='Benchmark', backend=backend,
+                                                 extraction='dom' if extraction == 'dom' else 'html',
+                                                 rate_limiter=rate_limiter)
+        try:
+            stages['about'] = run_stage(
+                'about', profile_scraper, 'fetch_creator_profile_url',
+                lambda: profile_scraper.process_dataframe(read_table(listing_path), output_path=profiles_path),
+                verbose)
+        finally:
+            profile_scraper.close()
+
+        details_scraper = scrape_profile_details.Scraper(user_profile='Benchmark', backend=backend,
+                                                         extraction='dom' if extraction == 'dom' else 'html',
+                                                         rate_limiter=rate_limiter)
+        try:
+            stages['profile'] = run_stage(
+                'profile', details_scraper, 'fetch_profile_details',
+                lambda: details_scraper.process_dataframe(read_table(profiles_path), output_path=details_path),
+                verbose)
+        finally:
+            details_scraper.close()
+
+        rows = len(read_table(details_path))
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            preprocess_data(details_path, os.path.join(work_dir, 'preprocessed_data.csv'))
+        elapsed = time.perf_counter() - start
+        stages['preprocess'] = {'rows': rows, 'seconds': round(elapsed, 4), 'rows_per_s': round(rows / elapsed, 1)}
+        print(f"{'preprocess':<12} {rows:6d} rows   {rows / elapsed:9.1f} rows/s")
+    return stages
+
+
+def current_commit():
+    """
+    Returns the checked-out commit, marked '-dirty' when the tree has uncommitted changes.
+
+    Returns:
+        str: The short commit hash, or 'unknown' outside a git checkout.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+
+def find_baseline(baseline, result_path):
+    """
+    Locates the results to compare against.
+
+    Args:
+        baseline (str): A commit hash or a results file, or None for the most recent other results.
+        result_path (str): The file of the current results, which is never its own baseline.
+
+    Returns:
+        str: The baseline results file, or None if there is none.
+    """
+    if baseline:
+        path = baseline if os.path.exists(baseline) else os.path.join(RESULTS_DIR, f'{baseline}.json')
+        return path if os.path.exists(path) else None
+    others = [path for path in glob.glob(os.path.join(RESULTS_DIR, '*.json'))
+              if os.path.abspath(path) != os.path.abspath(result_path)]
+    return max(others, key=os.path.getmtime) if others else None
+
+
+def compare(results, baseline):
+    """
+    Prints the change of each stage's throughput and p95 latency against a baseline.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): Earlier results of the same benchmark.
+    """
+    print(f"\nCompared with {baseline['commit']}:")
+    for stage, metrics in results['stages'].items():
+        before = baseline['stages'].get(stage)
+        if not before:
+            continue
+        for key in ('pages_per_s', 'p95_ms', 'cdp_calls_per_page', 'rows_per_s'):
+            if metrics.get(key) and before.get(key):
+                change = (metrics[key] - before[key]) / before[key] * 100
+                print(f"{stage:<12} {key:<12} {before[key]:10.2f} -> {metrics[key]:10.2f}  ({change:+.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the scrapers end to end against a local replay server.")
+    parser.add_argument('--backend', choices=['http', 'browser'], default='http', help="The scrapers' backend")
+    parser.add_argument('--extraction', choices=['html', 'js', 'dom'], default='html', help="Browser extraction mode")
+    parser.add_argument('--concurrency', type=int, default=1, help="Discovery tabs")
+    parser.add_argument('--cards', type=int, default=30, help="Cards per synthetic discovery page")
+    parser.add_argument('--pages', type=int, default=5, help="Synthetic discovery pages")
+    parser.add_argument('--creators', type=int, default=40, help="Distinct synthetic creators")
+    parser.add_argument('--latency', type=float, default=0.02, help="Seconds added before every response")
+    parser.add_argument('--jitter', type=float, default=0.01, help="Maximum random extra seconds per response")
+    parser.add_argument('--recordings', help="An html_cache directory whose pages are replayed")
+    parser.add_argument('--baseline', help="A commit or results file to compare with (default: the latest other run)")
+    parser.add_argument('--no-save', action='store_true', help="Do not store the results")
+    parser.add_argument('--verbose', action='store_true', help="Show the scrapers' output")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR, format='%(message)s')
+
+    server = ReplayServer(args.cards, args.pages, args.creators, args.latency, args.jitter, args.recordings).start()
+    try:
+        stages = run_suite(server.url, args.backend, args.extraction, args.concurrency, args.verbose)
+    finally:
+        server.stop()
+    peak_rss = peak_rss_mb()
+
+    results = {
+        'commit': current_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {key: value for key, value in vars(args).items() if key not in ('baseline', 'no_save', 'verbose')},
+        'stages': stages,
+        'requests': server.requests,
+        'metrics': METRICS.snapshot(),
+        'peak_rss_mb': peak_rss,
+    }
+    print(f"Peak RSS: {results['peak_rss_mb']} MiB")
+
+    result_path = os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    baseline_path = find_baseline(args.baseline, result_path)
+    if baseline_path:
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != results['config']:
+            print(f"\nNote: {baseline_path} was run with a different configuration.")
+        compare(results, baseline)
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to '{result_path}'.")
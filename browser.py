@@ -0,0 +1,199 @@
+import logging
+import threading
+from DrissionPage import ChromiumPage, ChromiumOptions
+
+logger = logging.getLogger(__name__)
+
+# URL patterns (Network.setBlockedURLs wildcards) of each resource type the scrapers never read.
+RESOURCE_PATTERNS = {
+    'image': ('*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*'),
+    'font': ('*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'),
+    'media': ('*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*.wav*', '*.ogg*'),
+}
+
+# Analytics, tag managers and player embeds loaded by skool.com pages.
+TRACKER_PATTERNS = (
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*facebook.net*',
+    '*connect.facebook.*', '*hotjar.com*', '*segment.io*', '*segment.com/analytics*', '*intercom.io*',
+    '*sentry.io*', '*clarity.ms*', '*tiktok.com/i18n/pixel*', '*youtube.com/embed*', '*player.vimeo.com*',
+    '*wistia.*', '*loom.com/embed*',
+)
+
+
+class BrowserSettings:
+    """
+    How the shared browser is launched and what each of its tabs refuses to download.
+
+    Blocking works on URL patterns through the CDP Network.setBlockedURLs command, so it
+    applies to every request of the tab, including ones issued by scripts.
+
+    Attributes:
+        headless (bool): Whether Chromium runs without a window.
+        no_sandbox (bool): Whether Chromium runs with --no-sandbox, e.g. in containers.
+        block_resources (tuple): Resource types from RESOURCE_PATTERNS that are not downloaded.
+        block_urls (tuple): Extra URL patterns that are not downloaded, e.g. TRACKER_PATTERNS.
+        clear_cookies (bool): Whether cookies are cleared when the browser starts.
+        load_mode (str): When page.get() returns: 'normal' after every resource, 'eager' once the
+            DOM is ready, 'none' right away. The scrapers wait for their target elements themselves.
+    """
+
+    def __init__(self, headless=False, no_sandbox=False, block_resources=('image', 'font', 'media'),
+                 block_urls=TRACKER_PATTERNS, clear_cookies=False, load_mode='eager'):
+        """
+        Initializes the settings.
+
+        Args:
+            headless (bool): Run Chromium without a window (default is False).
+            no_sandbox (bool): Pass --no-sandbox (default is False).
+            block_resources (tuple): Resource types to block (default is images, fonts and media).
+            block_urls (tuple): Extra URL patterns to block (default is TRACKER_PATTERNS).
+            clear_cookies (bool): Start from an empty cookie jar instead of the profile's session
+                (default is False).
+            load_mode (str): 'normal', 'eager' or 'none' (default is 'eager').
+        """
+        unknown = set(block_resources) - set(RESOURCE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {', '.join(sorted(unknown))}")
+        self.headless = headless
+        self.no_sandbox = no_sandbox
+        self.block_resources = tuple(block_resources)
+        self.block_urls = tuple(block_urls)
+        self.clear_cookies = clear_cookies
+        self.load_mode = load_mode
+
+    @property
+    def blocked_patterns(self):
+        """
+        Returns every URL pattern blocked in a tab.
+
+        Returns:
+            list: The Network.setBlockedURLs patterns.
+        """
+        patterns = [pattern for kind in self.block_resources for pattern in RESOURCE_PATTERNS[kind]]
+        return patterns + list(self.block_urls)
+
+    def options(self, user, local_port=None):
+        """
+        Builds the Chromium launch options.
+
+        Args:
+            user (str): The browser user profile.
+            local_port (int, optional): A dedicated debugging port.
+
+        Returns:
+            ChromiumOptions: The launch options.
+        """
+        options = ChromiumOptions()
+        options.set_user(user=user)
+        if local_port:
+            options.set_local_port(local_port)
+        options.headless(self.headless)
+        options.set_load_mode(self.load_mode)
+        if self.no_sandbox:
+            options.set_argument('--no-sandbox')
+        if 'image' in self.block_resources:
+            options.no_imgs(True)
+        if 'media' in self.block_resources:
+            options.mute(True)
+        return options
+
+
+DEFAULT_SETTINGS = BrowserSettings()
+
+# Browsers started in this process, keyed by debugging address, with their user profile and the number of
+# scrapers using each.
+_browsers = {}
+_lock = threading.Lock()
+
+
+def configure_tab(tab, settings=None):
+    """
+    Applies the URL blocking of the settings to one tab.
+
+    Blocking is per tab, so tabs opened with new_tab() must be configured too.
+
+    Args:
+        tab (ChromiumPage or ChromiumTab): The tab.
+        settings (BrowserSettings, optional): Defaults to DEFAULT_SETTINGS.
+
+    Returns:
+        ChromiumPage or ChromiumTab: The same tab.
+    """
+    patterns = (settings or DEFAULT_SETTINGS).blocked_patterns
+    if patterns:
+        tab.run_cdp('Network.enable')
+        tab.run_cdp('Network.setBlockedURLs', urls=patterns)
+    return tab
+
+
+def new_tab(page, settings=None):
+    """
+    Opens a tab in a shared browser, configured like its first tab.
+
+    Args:
+        page (ChromiumPage): The browser page from acquire_page().
+        settings (BrowserSettings, optional): Defaults to DEFAULT_SETTINGS.
+
+    Returns:
+        ChromiumTab: The new tab.
+    """
+    return configure_tab(page.new_tab(), settings)
+
+
+def acquire_page(user, local_port=None, settings=None):
+    """
+    Returns the running browser on a debugging port, starting it on first use.
+
+    Scrapers in the same process that ask for the same port share one warmed browser, with
+    its cookies, cache and open connections, instead of each cold-starting Chromium. A port
+    serves one browser, so scrapers without `local_port` all share the one on the default
+    port, whatever profile they ask for; give each scraper that must drive its own browser
+    its own port. Every call must be matched by release_page().
+
+    Args:
+        user (str): The browser user profile.
+        local_port (int, optional): A dedicated debugging port. Defaults to DrissionPage's port 9222.
+        settings (BrowserSettings, optional): Defaults to DEFAULT_SETTINGS. Only the first
+            caller's settings take effect for a running browser.
+
+    Returns:
+        ChromiumPage: The browser page.
+    """
+    settings = settings or DEFAULT_SETTINGS
+    options = settings.options(user, local_port)
+    key = options.address
+    with _lock:
+        if key in _browsers:
+            page, running_user, users = _browsers[key]
+            _browsers[key] = (page, running_user, users + 1)
+            if running_user != user:
+                logger.warning(f"The browser on {key} runs user profile {running_user}, not {user}. "
+                               f"Give the scraper its own local_port to use {user}.")
+            logger.info(f"Reusing the running browser on {key} (user profile: {running_user})")
+            return page
+        logger.info(f"Starting a {'headless ' if settings.headless else ''}browser on {key} with user profile: {user}")
+        page = ChromiumPage(addr_or_opts=options)
+        if settings.clear_cookies:
+            page.set.cookies.clear()
+            logger.info("Cookies cleared.")
+        configure_tab(page, settings)
+        _browsers[key] = (page, user, 1)
+        return page
+
+
+def release_page(page):
+    """
+    Gives back a page from acquire_page(), quitting the browser once nobody uses it.
+
+    Args:
+        page (ChromiumPage): The browser page.
+    """
+    with _lock:
+        for key, (running, user, users) in list(_browsers.items()):
+            if running is page:
+                if users > 1:
+                    _browsers[key] = (running, user, users - 1)
+                    return
+                del _browsers[key]
+                break
+    page.quit()
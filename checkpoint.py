@@ -0,0 +1,104 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+class CheckpointStore:
+    """
+    A durable, URL-keyed progress journal for one scraping stage, backed by SQLite.
+
+    Every finished URL is committed as soon as it completes, so an interrupted run can be
+    restarted and only the failed or missing URLs are fetched again. Several stages can share
+    one database file; their rows are separated by the `stage` name.
+
+    Attributes:
+        path (str): The path to the SQLite database file.
+        stage (str): The name of the stage whose progress is tracked.
+    """
+
+    def __init__(self, path='crawl_state.db', stage='default'):
+        """
+        Opens (or creates) the progress database.
+
+        Args:
+            path (str): The path to the SQLite database file (default is 'crawl_state.db').
+            stage (str): The name of the stage whose progress is tracked (default is 'default').
+        """
+        self.path = path
+        self.stage = stage
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS progress ('
+            ' stage TEXT NOT NULL,'
+            ' url TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' result TEXT,'
+            ' error TEXT,'
+            ' updated_at REAL NOT NULL,'
+            ' PRIMARY KEY (stage, url))'
+        )
+        self._conn.commit()
+
+    def _record(self, url, status, result=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO progress (stage, url, status, result, error, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (self.stage, url, status, json.dumps(result), error, time.time())
+            )
+            self._conn.commit()
+
+    def mark_done(self, url, result):
+        """
+        Records a successfully processed URL together with its result.
+
+        Args:
+            url (str): The URL that was processed.
+            result: A JSON-serializable result to return on later runs.
+        """
+        self._record(url, 'done', result=result)
+
+    def mark_failed(self, url, error=None):
+        """
+        Records a URL whose processing failed, so the next run retries it.
+
+        Args:
+            url (str): The URL that failed.
+            error (str, optional): A description of the failure.
+        """
+        self._record(url, 'failed', error=error)
+
+    def completed(self, max_age=None):
+        """
+        Returns the results of every URL already completed in this stage.
+
+        Args:
+            max_age (float, optional): Only return results recorded within this many seconds.
+
+        Returns:
+            dict: A mapping from URL to its stored result.
+        """
+        since = time.time() - max_age if max_age is not None else 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, result FROM progress WHERE stage = ? AND status = 'done' AND updated_at >= ?",
+                (self.stage, since)
+            ).fetchall()
+        return {url: json.loads(result) for url, result in rows}
+
+    def clear(self):
+        """
+        Removes every record of this stage, so the next run starts from scratch.
+        """
+        with self._lock:
+            self._conn.execute('DELETE FROM progress WHERE stage = ?', (self.stage,))
+            self._conn.commit()
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self._conn.close()
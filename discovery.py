@@ -0,0 +1,271 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import requests
+from parsers import parse_discovery_cards, parse_last_page_number, parse_listing_payload, parse_next_data
+
+logger = logging.getLogger(__name__)
+
+# The stage label of the planner's metrics, shared with scrape.AgentScraper.
+STAGE = 'discovery'
+
+# The discovery query parameters that filter the listing by category and size its pages.
+CATEGORY_PARAM = 'c'
+PAGE_SIZE_PARAM = 'limit'
+
+
+def with_query(url, **params):
+    """
+    Returns a URL with query parameters added or replaced.
+
+    Args:
+        url (str): The URL.
+        **params: The parameters; None values are left out.
+
+    Returns:
+        str: The new URL.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({name: value for name, value in params.items() if value is not None})
+    return parts._replace(query=urlencode(query)).geturl()
+
+
+def data_url(url, build_id):
+    """
+    Returns the Next.js data endpoint serving the page props of a page.
+
+    Args:
+        url (str): The page URL, e.g. 'https://www.skool.com/discovery?p=2'.
+        build_id (str): The site's current Next.js build id.
+
+    Returns:
+        str: The endpoint URL, e.g. 'https://www.skool.com/_next/data/<build_id>/discovery.json?p=2'.
+    """
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/') or '/index'
+    return parts._replace(path=f'/_next/data/{build_id}{path}.json').geturl()
+
+
+@dataclass
+class Partition:
+    """
+    One independently paginated slice of the discovery listing, e.g. a category.
+
+    Attributes:
+        url (str): The partition's first page.
+        last_page (int): The number of pages.
+        build_id (str): The Next.js build id if the listing endpoint serves this partition, else None.
+        page_size (int): Cards per listing endpoint page when it serves larger pages than the HTML,
+            else None.
+    """
+    url: str
+    last_page: int = 1
+    build_id: str = None
+    page_size: int = None
+
+    def page_url(self, number):
+        """
+        Returns the URL of one of the partition's pages.
+
+        Args:
+            number (int): The page number, from 1.
+
+        Returns:
+            str: The page URL, which also keys the page in checkpoints.
+        """
+        return with_query(self.url, p=number, **{PAGE_SIZE_PARAM: self.page_size})
+
+
+class DiscoveryPlanner:
+    """
+    Plans every discovery page up front and fetches each one the cheapest way available.
+
+    The page count of each partition is read once, from its first page, and all pages are
+    then known before the first one is fetched, so they can be fetched in parallel. Over
+    HTTP, the cards of that first page are kept instead of being fetched again. When
+    the first page embeds its listing as Next.js data, later pages are read from the
+    /_next/data JSON endpoint instead of the full HTML, and with `page_size` the endpoint
+    is probed for larger pages, which need fewer requests. A page the endpoint fails on
+    falls back to the scraper's usual HTML and browser path.
+
+    Partitions (one per category) are planned in parallel when the scraper has an HTTP
+    fetcher. A community listed in several partitions is kept once by
+    AgentScraper.scrape_all_pages.
+
+    Attributes:
+        scraper (AgentScraper): The scraper whose fetcher, browser, metrics and rate limiter are used.
+        categories (list): The category of each partition; [None] plans the unfiltered listing.
+        data_api (bool): Whether the listing endpoint is probed. Needs the HTTP or cache backend.
+        page_size (int): The page size requested from the listing endpoint, or None for the site's default.
+        partitions (list): The planned Partition records, empty until plan() runs.
+    """
+
+    def __init__(self, scraper, categories=None, data_api=True, page_size=None):
+        """
+        Initializes the planner.
+
+        Args:
+            scraper (AgentScraper): The discovery scraper.
+            categories (list, optional): Category values of the ?c= filter, one partition each.
+                Defaults to a single partition with the whole listing.
+            data_api (bool): Probe the Next.js listing endpoint (default is True).
+            page_size (int, optional): Cards per page to ask the listing endpoint for.
+        """
+        self.scraper = scraper
+        self.categories = list(categories) if categories else [None]
+        self.data_api = data_api and scraper.fetcher is not None
+        self.page_size = page_size
+        self.partitions = []
+        self._pages = {}
+        self._prefetched = {}
+        self._lock = threading.Lock()
+
+    def plan(self):
+        """
+        Returns every page of every partition, probing the partitions on the first call only.
+
+        Returns:
+            list: The page URLs, partition by partition in page order.
+        """
+        if not self.partitions:
+            urls = [with_query(self.scraper.base_url, **{CATEGORY_PARAM: category}) for category in self.categories]
+            # Without an HTTP fetcher every probe drives the scraper's one browser page
+            workers = min(len(urls), self.scraper.concurrency) if self.scraper.fetcher else 1
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                self.partitions = list(executor.map(self.probe, urls))
+            for partition in self.partitions:
+                for number in range(1, partition.last_page + 1):
+                    self._pages[partition.page_url(number)] = (partition, number)
+            logger.info(f"Planned {len(self._pages)} discovery pages in {len(self.partitions)} partition(s).")
+        return list(self._pages)
+
+    def probe(self, url):
+        """
+        Reads a partition's page count and checks whether the listing endpoint serves it.
+
+        When the first page is fetched over HTTP, its cards are kept, so that page is not
+        fetched again. With the browser, or when the first page cannot be parsed, only the
+        page count is read and page 1 is loaded again by extract().
+
+        Args:
+            url (str): The partition's first page.
+
+        Returns:
+            Partition: The planned partition.
+        """
+        partition = Partition(url)
+        html = None
+        if self.scraper.fetcher:
+            try:
+                with self.scraper.metrics.time('fetch', stage=STAGE, source='http'):
+                    html = self.scraper.fetcher.get_html(url)
+            except requests.RequestException as e:
+                self.scraper.metrics.inc('fetch_errors', stage=STAGE, source='http')
+                logger.warning(f"HTTP request failed: {e}")
+        if html is None:
+            partition.last_page = self.scraper.get_last_page_number(url)
+            return partition
+
+        try:
+            with self.scraper.metrics.time('parse', stage=STAGE, source='http'):
+                last_page = parse_last_page_number(html)
+                cards = [card.to_dict() for card in parse_discovery_cards(html, self.scraper.site_url)]
+                next_data = parse_next_data(html) if self.data_api else None
+        except ValueError as e:
+            # get_last_page_number falls back to the browser, or to one page offline
+            self.scraper.metrics.inc('fetch_errors', stage=STAGE, source='http')
+            logger.warning(f"Could not parse the first page of {url}: {e}")
+            partition.last_page = self.scraper.get_last_page_number(url)
+            return partition
+        if last_page is None:
+            self.scraper.metrics.inc('selector_misses', stage=STAGE, selector='pagination')
+            last_page = self.scraper.get_last_page_number(url)
+        partition.last_page = last_page
+        if cards:
+            self._prefetched[partition.page_url(1)] = cards
+
+        build_id = next_data.get('buildId') if next_data else None
+        if build_id and parse_listing_payload(next_data, self.scraper.site_url)[0]:
+            partition.build_id = build_id
+            logger.info(f"Listing endpoint found for {url} (build {build_id}).")
+            if self.page_size and self.page_size > len(cards):
+                self.probe_page_size(partition, len(cards))
+        return partition
+
+    def probe_page_size(self, partition, html_page_size):
+        """
+        Switches a partition to larger listing endpoint pages if the endpoint honors `page_size`.
+
+        Args:
+            partition (Partition): A partition served by the listing endpoint.
+            html_page_size (int): The number of cards on its first HTML page.
+        """
+        sized = Partition(partition.url, partition.last_page, partition.build_id, self.page_size)
+        cards, last_page = self.fetch_listing(sized.page_url(1), sized.build_id)
+        if cards is None or len(cards) <= html_page_size or not last_page:
+            logger.info(f"The listing endpoint ignores {PAGE_SIZE_PARAM}={self.page_size}; keeping the site's pages.")
+            return
+        logger.info(f"The listing endpoint serves {len(cards)} cards per page: {partition.last_page} pages "
+                    f"become {last_page}.")
+        self._prefetched.pop(partition.page_url(1), None)
+        partition.page_size, partition.last_page = self.page_size, last_page
+        self._prefetched[partition.page_url(1)] = cards
+
+    def fetch_listing(self, url, build_id):
+        """
+        Fetches one page of the listing endpoint.
+
+        Args:
+            url (str): The page URL.
+            build_id (str): The Next.js build id.
+
+        Returns:
+            tuple: The cards as dictionaries and the page count, or (None, None) on failure.
+        """
+        try:
+            with self.scraper.metrics.time('fetch', stage=STAGE, source='api'):
+                payload = self.scraper.fetcher.get_html(data_url(url, build_id))
+            with self.scraper.metrics.time('parse', stage=STAGE, source='api'):
+                cards, last_page = parse_listing_payload(json.loads(payload), self.scraper.site_url)
+        except (requests.RequestException, ValueError) as e:
+            self.scraper.metrics.inc('fetch_errors', stage=STAGE, source='api')
+            logger.warning(f"Listing endpoint request failed: {e}")
+            return None, None
+        return [card.to_dict() for card in cards], last_page
+
+    def extract(self, url, tab=None):
+        """
+        Extracts the cards of a planned page.
+
+        Args:
+            url (str): A URL returned by plan().
+            tab (ChromiumTab, optional): The tab to use if the page falls back to the browser.
+
+        Returns:
+            list: A list of dictionaries containing the extracted data.
+        """
+        with self._lock:
+            data = self._prefetched.pop(url, None)
+        partition, number = self._pages.get(url, (None, None))
+        if data is not None:
+            self.scraper.count_page(url, data, 'api' if partition and partition.page_size else 'http')
+            return data
+
+        if partition is not None and partition.build_id:
+            data, _ = self.fetch_listing(url, partition.build_id)
+            if data is not None:
+                self.scraper.count_page(url, data, 'api')
+            if data or partition.page_size:  # A resized page has no HTML counterpart to fall back to
+                if self.scraper.backend == 'http':
+                    self.scraper.record_outcome(bool(data))
+                return data or []
+            if data is None:
+                # Usually a new deployment retired the build id; the other pages use HTML too
+                logger.warning(f"Reading the rest of {partition.url} from HTML pages.")
+                partition.build_id = None
+            self.scraper.metrics.inc('retries', stage=STAGE, reason='html_fallback')
+        return self.scraper.extract_data_from_page(url, tab)
@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class HtmlCache:
+    """
+    A content-addressed on-disk cache of fetched page HTML.
+
+    Each URL is stored as a gzip-compressed JSON file named after the SHA-256 of the URL,
+    holding the URL, the fetch timestamp, and the HTML. Entries older than `ttl` are treated
+    as stale for normal fetches but can still be read for offline re-parsing. When the cache
+    grows past `max_bytes`, the least recently used entries (by file modification time, which
+    is refreshed on every hit) are deleted.
+
+    Attributes:
+        directory (str): The directory holding the cache files.
+        ttl (float): Maximum age in seconds of an entry served to a normal fetch.
+        max_bytes (int): Size budget for the cache directory in bytes.
+    """
+
+    def __init__(self, directory='html_cache', ttl=24 * 3600, max_bytes=512 * 1024 * 1024):
+        """
+        Initializes the cache and measures its current size.
+
+        Args:
+            directory (str): The directory holding the cache files (default is 'html_cache').
+            ttl (float): Maximum age in seconds of a fresh entry (default is one day).
+            max_bytes (int): Size budget for the cache in bytes (default is 512 MiB).
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json.gz')]
+
+    def _path(self, url):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{digest}.json.gz')
+
+    def get(self, url, ignore_ttl=False):
+        """
+        Returns the cached HTML for a URL.
+
+        Args:
+            url (str): The URL to look up.
+            ignore_ttl (bool): Whether to return entries older than the TTL (default is False).
+
+        Returns:
+            str: The cached HTML, or None if there is no usable entry.
+        """
+        path = self._path(url)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not ignore_ttl and time.time() - entry['fetched_at'] > self.ttl:
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return entry['html']
+
+    def put(self, url, html):
+        """
+        Stores the HTML for a URL and evicts old entries if the cache is over budget.
+
+        Args:
+            url (str): The URL the HTML was fetched from.
+            html (str): The page HTML.
+        """
+        path = self._path(url)
+        data = gzip.compress(json.dumps({'url': url, 'fetched_at': time.time(), 'html': html}).encode('utf-8'))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        self._size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def size(self):
+        """
+        Returns the current size of the cache.
+
+        Returns:
+            int: The total size of the cache files in bytes.
+        """
+        return self._size
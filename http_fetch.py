@@ -0,0 +1,100 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+class CacheMissError(requests.RequestException):
+    """
+    Raised by an offline fetcher when a URL is not in the HTML cache.
+    """
+
+
+class HttpFetcher:
+    """
+    A browser-free page fetcher backed by a pooled keep-alive HTTP session.
+
+    skool.com renders its pages on the server, so the HTML returned here can be fed
+    straight into the functions in `parsers` without starting Chromium.
+
+    Attributes:
+        timeout (float): Timeout in seconds for each request.
+        cache (HtmlCache): The HTML cache consulted before the network, or None.
+        offline (bool): Whether pages are served from the cache only, without network access.
+        rate_limiter (AdaptiveRateLimiter): Paces network requests (cache hits are not paced), or None.
+        metrics (Metrics): Counts cache hits and HTTP responses by status, or None.
+        session (requests.Session): The shared session holding the connection pool.
+    """
+
+    def __init__(self, pool_size=10, timeout=15, headers=None, cache=None, offline=False, rate_limiter=None,
+                 metrics=None):
+        """
+        Initializes the fetcher with a connection pool and default headers.
+
+        Args:
+            pool_size (int): The maximum number of keep-alive connections per host (default is 10).
+            timeout (float): Timeout in seconds for each request (default is 15).
+            headers (dict, optional): Headers that replace DEFAULT_HEADERS.
+            cache (HtmlCache, optional): A cache for fetched HTML.
+            offline (bool): Serve every page from `cache`, regardless of age (default is False).
+            rate_limiter (AdaptiveRateLimiter, optional): A limiter acquired before each network request.
+            metrics (Metrics, optional): A registry for the cache hit and response counters.
+        """
+        if offline and cache is None:
+            raise ValueError("Offline mode needs an HtmlCache.")
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_html(self, url):
+        """
+        Returns a page's HTML, from the cache when a fresh copy exists, else from the network.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            str: The page HTML.
+
+        Raises:
+            CacheMissError: If the fetcher is offline and the URL is not cached.
+            requests.RequestException: If the request fails or returns an error status.
+        """
+        if self.cache:
+            html = self.cache.get(url, ignore_ttl=self.offline)
+            if html is not None:
+                if self.metrics:
+                    self.metrics.inc('cache_hits')
+                return html
+            if self.offline:
+                raise CacheMissError(f"{url} is not in the HTML cache.")
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        response = self.session.get(url, timeout=self.timeout)
+        if self.metrics:
+            self.metrics.inc('http_responses', status=response.status_code)
+        response.raise_for_status()
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            response.encoding = 'utf-8'
+        if self.cache:
+            self.cache.put(url, response.text)
+        return response.text
+
+    def close(self):
+        """
+        Closes the session and its pooled connections.
+        """
+        self.session.close()
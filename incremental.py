@@ -0,0 +1,363 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+from checkpoint import CheckpointStore
+from html_cache import HtmlCache
+from metrics import METRICS
+from retry import TRANSIENT, DeadLetters
+from scrape import AgentScraper
+import scrape_profile
+import scrape_profile_details
+from storage import read_table, write_table
+
+logger = logging.getLogger(__name__)
+
+# The discovery card fields whose change marks a community for a refresh.
+META_COLUMNS = ('Community Name', 'Status', 'Members', 'Price')
+
+LISTING_PATH = 'main_content_data.csv'
+PROFILES_PATH = 'data_with_creator_profiles.csv'
+DETAILS_PATH = 'full_data.csv'
+DELTA_LISTING_PATH = 'delta_content_data.csv'
+DELTA_PROFILES_PATH = 'delta_with_creator_profiles.csv'
+DELTA_DETAILS_PATH = 'delta_full_data.csv'
+
+# The columns of the creator profile output that link a creator to its communities.
+PROFILE_URL_COLUMNS = ['Full URL', 'Creator Profile URL']
+
+
+def _text(value):
+    return '' if value is None or pd.isna(value) else str(value)
+
+
+class CommunityIndex:
+    """
+    Remembers every community seen on the discovery listing, backed by SQLite.
+
+    Each community is keyed by its Full URL and stores the card fields it was last seen with,
+    together with when it was first seen, last seen and last changed. Comparing a new listing
+    against the index tells which communities are new or changed and need their /about and
+    profile pages fetched again.
+
+    Attributes:
+        path (str): The path to the SQLite database file.
+    """
+
+    def __init__(self, path='crawl_state.db'):
+        """
+        Opens (or creates) the community index.
+
+        Args:
+            path (str): The path to the SQLite database file (default is 'crawl_state.db').
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS communities ('
+            ' full_url TEXT PRIMARY KEY,'
+            ' community_name TEXT,'
+            ' status TEXT,'
+            ' members TEXT,'
+            ' price TEXT,'
+            ' first_seen REAL NOT NULL,'
+            ' last_seen REAL NOT NULL,'
+            ' last_changed REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    def _known(self):
+        rows = self._conn.execute(
+            'SELECT full_url, community_name, status, members, price, first_seen, last_changed FROM communities'
+        ).fetchall()
+        return {row[0]: (row[1:5], row[5], row[6]) for row in rows}
+
+    def diff(self, records):
+        """
+        Returns the records whose community is new or whose card fields changed.
+
+        The index itself is not modified, so a refresh that fails downstream is detected
+        again on the next run.
+
+        Args:
+            records (list): Discovery records with 'Full URL' and the META_COLUMNS fields.
+
+        Returns:
+            list: The new or changed records, in listing order.
+        """
+        with self._lock:
+            known = self._known()
+        delta = []
+        new_count = 0
+        for record in records:
+            previous = known.get(_text(record['Full URL']))
+            if previous is None:
+                new_count += 1
+                delta.append(record)
+            elif previous[0] != tuple(_text(record[column]) for column in META_COLUMNS):
+                delta.append(record)
+        logger.info(f"{new_count} new and {len(delta) - new_count} changed communities "
+                    f"out of {len(records)} on the listing.")
+        return delta
+
+    def record(self, records, seen_at=None):
+        """
+        Stores a listing, updating last-seen times and, for changed communities, last-changed times.
+
+        Args:
+            records (list): Discovery records with 'Full URL' and the META_COLUMNS fields.
+            seen_at (float, optional): The crawl time as a Unix timestamp. Defaults to now.
+        """
+        seen_at = seen_at or time.time()
+        with self._lock:
+            known = self._known()
+            rows = []
+            for record in records:
+                full_url = _text(record['Full URL'])
+                meta = tuple(_text(record[column]) for column in META_COLUMNS)
+                first_seen, last_changed = seen_at, seen_at
+                if full_url in known:
+                    previous_meta, first_seen, last_changed = known[full_url]
+                    if previous_meta != meta:
+                        last_changed = seen_at
+                known[full_url] = (meta, first_seen, last_changed)
+                rows.append((full_url, *meta, first_seen, seen_at, last_changed))
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO communities (full_url, community_name, status, members, price, '
+                'first_seen, last_seen, last_changed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            self._conn.commit()
+
+    def get(self, full_url):
+        """
+        Returns what the index knows about a community.
+
+        Args:
+            full_url (str): The community's Full URL.
+
+        Returns:
+            dict: The stored card fields and the 'First Seen', 'Last Seen' and 'Last Changed'
+                timestamps, or None if the community was never seen.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT community_name, status, members, price, first_seen, last_seen, last_changed '
+                'FROM communities WHERE full_url = ?', (full_url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(META_COLUMNS + ('First Seen', 'Last Seen', 'Last Changed'), row))
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+
+def read_output(path, columns=None):
+    """
+    Reads a stage's output as strings, the way the files are merged.
+
+    Args:
+        path (str): The CSV or Parquet file.
+        columns (list, optional): The columns to load. Defaults to all of them.
+
+    Returns:
+        pd.DataFrame: The rows, or None if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    return read_table(path, columns=columns, text=True)
+
+
+def merge_results(listing, delta, previous, output_path, key='Full URL', stage=None):
+    """
+    Rebuilds a stage's full output from the current listing, the refreshed rows and the previous output.
+
+    Communities in the delta take their fresh results, the others keep the results of the
+    previous run, and communities that left the listing are dropped. Listing columns always
+    come from the current listing, in its row order.
+
+    Args:
+        listing (pd.DataFrame): The current stage input.
+        delta (pd.DataFrame): The stage output for the new or changed communities.
+        previous (pd.DataFrame): The previous full stage output, or None.
+        output_path (str): The merged CSV or Parquet file.
+        key (str): The column identifying a community (default is 'Full URL').
+        stage (str, optional): The stage name, which types the columns of a Parquet file.
+
+    Returns:
+        pd.DataFrame: The merged output.
+    """
+    result_columns = [column for column in delta.columns if column not in listing.columns]
+    parts = [delta]
+    if previous is not None:
+        parts.insert(0, previous[~previous[key].isin(delta[key])])
+    results = pd.concat(parts, ignore_index=True).drop_duplicates(key, keep='last')
+    merged = listing.merge(results[[key] + result_columns], on=key, how='left').fillna('')
+    write_table(merged, output_path, stage=stage)
+    logger.info(f"Merged {len(delta)} refreshed and {len(merged) - len(delta)} kept rows into '{output_path}'.")
+    return merged
+
+
+def dead_letter_urls(dead_letters, profiles=None):
+    """
+    Returns the communities whose /about or creator profile fetch was given up in earlier runs.
+
+    Only network errors and blocks are returned. Pages that lacked their target element or were
+    missing from the HTML cache stay in the file but are not fetched again, since that would
+    give the same result.
+
+    Args:
+        dead_letters (DeadLetters): The dead-letter file.
+        profiles (pd.DataFrame, optional): The previous data_with_creator_profiles rows, used to
+            find the communities of dead creator profiles.
+
+    Returns:
+        set: The communities' 'Full URL' values.
+    """
+    urls = set(dead_letters.urls('creator_profile', kinds=TRANSIENT))
+    dead_profiles = set(dead_letters.urls('profile_details', kinds=TRANSIENT))
+    if profiles is not None and dead_profiles:
+        urls |= set(profiles.loc[profiles['Creator Profile URL'].isin(dead_profiles), 'Full URL'])
+    return urls
+
+
+def refresh_communities(listing, delta_urls, profile_scraper, details_scraper, checkpoint_path='crawl_state.db',
+                        dead_letters=None):
+    """
+    Refetches the /about and profile pages of some communities and merges them into the stage outputs.
+
+    Args:
+        listing (pd.DataFrame): The current discovery listing.
+        delta_urls (set): The 'Full URL' values of the communities to refresh.
+        profile_scraper (scrape_profile.Scraper): The scraper for community /about pages.
+        details_scraper (scrape_profile_details.Scraper): The scraper for creator profiles.
+        checkpoint_path (str): The progress database used to resume interrupted stages, or None.
+        dead_letters (DeadLetters, optional): Records URLs that still fail and drops ones that succeed.
+
+    Returns:
+        pd.DataFrame: The merged full_data rows.
+    """
+    def stage_checkpoint(stage):
+        return CheckpointStore(checkpoint_path, stage=stage) if checkpoint_path else None
+
+    def finish(checkpoint):
+        if checkpoint:
+            checkpoint.clear()
+            checkpoint.close()
+
+    previous_details = read_output(DETAILS_PATH)
+    delta = listing[listing['Full URL'].isin(delta_urls)].drop_duplicates('Full URL')
+    write_table(delta, DELTA_LISTING_PATH, stage='discovery')
+    logger.info(f"Refreshing {len(delta)} communities.")
+
+    checkpoint = stage_checkpoint('creator_profile')
+    profile_scraper.process_dataframe(delta.copy(), checkpoint=checkpoint, output_path=DELTA_PROFILES_PATH,
+                                      dead_letters=dead_letters)
+    finish(checkpoint)
+    profiles = merge_results(listing, read_output(DELTA_PROFILES_PATH), read_output(PROFILES_PATH), PROFILES_PATH,
+                             stage='creator_profile')
+
+    checkpoint = stage_checkpoint('profile_details')
+    delta_profiles = read_output(DELTA_PROFILES_PATH).replace('', None)
+    details_scraper.process_dataframe(delta_profiles, checkpoint=checkpoint, output_path=DELTA_DETAILS_PATH,
+                                      dead_letters=dead_letters)
+    finish(checkpoint)
+    return merge_results(profiles, read_output(DELTA_DETAILS_PATH), previous_details, DETAILS_PATH,
+                         stage='profile_details')
+
+
+def refresh(discovery, profile_scraper, details_scraper, index, checkpoint_path='crawl_state.db', dead_letters=None):
+    """
+    Crawls the discovery listing and refreshes only the communities that are new or changed.
+
+    The delta is written to the delta_*.csv files and merged into the usual stage outputs, so
+    downstream consumers keep reading main_content_data.csv, data_with_creator_profiles.csv
+    and full_data.csv. Communities missing from the previous full_data.csv, and communities in
+    the dead-letter file, are refreshed even if the index already knows them. The index is
+    only updated after both stages finished.
+
+    Args:
+        discovery (AgentScraper): The scraper for discovery pages.
+        profile_scraper (scrape_profile.Scraper): The scraper for community /about pages.
+        details_scraper (scrape_profile_details.Scraper): The scraper for creator profiles.
+        index (CommunityIndex): The index of previously seen communities.
+        checkpoint_path (str): The progress database used to resume interrupted stages, or None.
+        dead_letters (DeadLetters, optional): Permanently failed URLs of earlier runs, retried here.
+
+    Returns:
+        pd.DataFrame: The merged full_data rows.
+    """
+    checkpoint = CheckpointStore(checkpoint_path, stage='discovery') if checkpoint_path else None
+    discovery.scrape_all_pages(checkpoint=checkpoint, output_path=LISTING_PATH)
+    if checkpoint:
+        checkpoint.clear()
+        checkpoint.close()
+    listing = read_output(LISTING_PATH)
+    records = listing.to_dict('records')
+
+    previous_details = read_output(DETAILS_PATH, columns=['Full URL'])
+    delta_urls = {record['Full URL'] for record in index.diff(records)}
+    if previous_details is not None:
+        delta_urls |= set(listing['Full URL']) - set(previous_details['Full URL'])
+    if dead_letters:
+        delta_urls |= dead_letter_urls(dead_letters, read_output(PROFILES_PATH, columns=PROFILE_URL_COLUMNS))
+    full_data = refresh_communities(listing, delta_urls, profile_scraper, details_scraper, checkpoint_path,
+                                    dead_letters)
+
+    index.record(records)
+    return full_data
+
+
+def replay_dead_letters(profile_scraper, details_scraper, dead_letters, checkpoint_path='crawl_state.db'):
+    """
+    Refetches only the transiently failed communities in the dead-letter file, without crawling the discovery listing.
+
+    Args:
+        profile_scraper (scrape_profile.Scraper): The scraper for community /about pages.
+        details_scraper (scrape_profile_details.Scraper): The scraper for creator profiles.
+        dead_letters (DeadLetters): The dead-letter file written by earlier runs.
+        checkpoint_path (str): The progress database used to resume interrupted stages, or None.
+
+    Returns:
+        pd.DataFrame: The merged full_data rows.
+    """
+    listing = read_output(LISTING_PATH)
+    if listing is None:
+        raise FileNotFoundError(f"'{LISTING_PATH}' is required to replay dead letters.")
+    delta_urls = dead_letter_urls(dead_letters, read_output(PROFILES_PATH, columns=PROFILE_URL_COLUMNS))
+    return refresh_communities(listing, delta_urls, profile_scraper, details_scraper, checkpoint_path, dead_letters)
+
+
+if __name__ == "__main__":
+    log_level = logging.INFO  # logging.DEBUG also logs every page load and parsed field
+    logging.basicConfig(level=log_level, format='%(message)s')
+    cache = HtmlCache('html_cache')
+    # The stages run one after another, so they share one warmed browser, which the HTTP backend
+    # only starts for pages it cannot parse.
+    user_profile = 'Profile 1'
+    discovery = AgentScraper(base_url='https://www.skool.com/discovery', user_profile=user_profile, concurrency=4,
+                             backend='http', cache=cache)
+    profile_scraper = scrape_profile.Scraper(base_url='https://www.skool.com', user_profile=user_profile,
+                                             backend='http', cache=cache)
+    memo = CheckpointStore('crawl_state.db', stage='profile_memo')  # Creators fetched by earlier runs
+    details_scraper = scrape_profile_details.Scraper(user_profile=user_profile, backend='http', cache=cache, memo=memo)
+    index = CommunityIndex('crawl_state.db')
+    dead_letters = DeadLetters('dead_letter.csv')  # Communities that failed in earlier runs are retried
+    try:
+        refresh(discovery, profile_scraper, details_scraper, index, dead_letters=dead_letters)
+    finally:
+        index.close()
+        discovery.close()
+        profile_scraper.close()
+        details_scraper.close()
+        memo.close()
+        METRICS.append_jsonl('metrics.jsonl', stage='incremental')
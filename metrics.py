@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _label_text(labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels)
+
+
+class Metrics:
+    """
+    A thread-safe registry of crawl counters and timers.
+
+    Counters count events such as pages, cards, selector misses and retries. Timers record how
+    many times a phase (fetch, wait, parse, write) ran, its total and its longest duration.
+    Both take labels such as the stage and the source of the page. The registry can be
+    exported as Prometheus text, served over HTTP, or appended to a JSONL file.
+
+    Attributes:
+        namespace (str): The prefix of every exported metric name.
+    """
+
+    def __init__(self, namespace='skool_scraper'):
+        """
+        Initializes an empty registry.
+
+        Args:
+            namespace (str): The prefix of every exported metric name (default is 'skool_scraper').
+        """
+        self.namespace = namespace
+        self._counters = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def inc(self, name, amount=1, **labels):
+        """
+        Increases a counter.
+
+        Args:
+            name (str): The counter name, e.g. 'pages'; it is exported as '<namespace>_pages_total'.
+            amount (int): The increment (default is 1).
+            **labels: Label values, e.g. stage='discovery'.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        """
+        Records one duration of a timer.
+
+        Args:
+            name (str): The timer name, e.g. 'fetch'; it is exported as '<namespace>_fetch_seconds'.
+            seconds (float): The duration.
+            **labels: Label values, e.g. stage='discovery'.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            count, total, longest = self._timers.get(key, (0, 0.0, 0.0))
+            self._timers[key] = (count + 1, total + seconds, max(longest, seconds))
+
+    @contextmanager
+    def time(self, name, **labels):
+        """
+        Times the enclosed block with a timer, also when it raises.
+
+        Args:
+            name (str): The timer name.
+            **labels: Label values.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        """
+        Clears every counter and timer.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def snapshot(self):
+        """
+        Returns the current values.
+
+        Returns:
+            dict: 'counters' maps 'name{labels}' to a count, and 'timers' maps 'name{labels}'
+                to its count, sum and max in seconds.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            timers = dict(self._timers)
+        return {
+            'counters': {f'{name}{{{_label_text(labels)}}}': value for (name, labels), value in sorted(counters.items())},
+            'timers': {
+                f'{name}{{{_label_text(labels)}}}': {'count': count, 'sum': round(total, 6), 'max': round(longest, 6)}
+                for (name, labels), (count, total, longest) in sorted(timers.items())
+            },
+        }
+
+    def prometheus_text(self):
+        """
+        Renders the registry in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics text.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timers = sorted(self._timers.items())
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:  # Sorted, so each family's samples are adjacent
+            metric = f'{self.namespace}_{name}_total'
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric}{{{_label_text(labels)}}} {value}')
+        for timer in dict.fromkeys(name for (name, _), _ in timers):
+            metric = f'{self.namespace}_{timer}_seconds'
+            samples = [(_label_text(labels), values) for (name, labels), values in timers if name == timer]
+            # The longest duration is a separate gauge family, listed after the summary's samples
+            lines.append(f'# TYPE {metric} summary')
+            for labels, (count, total, _) in samples:
+                lines.append(f'{metric}_count{{{labels}}} {count}')
+                lines.append(f'{metric}_sum{{{labels}}} {total:.6f}')
+            lines.append(f'# TYPE {metric}_max gauge')
+            for labels, (_, _, longest) in samples:
+                lines.append(f'{metric}_max{{{labels}}} {longest:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Writes the Prometheus text to a file, e.g. for node_exporter's textfile collector.
+
+        Args:
+            path (str): The output file.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+
+    def append_jsonl(self, path, **fields):
+        """
+        Appends a timestamped snapshot as one line of a JSONL file.
+
+        Args:
+            path (str): The JSONL file.
+            **fields: Extra fields stored with the snapshot, e.g. stage='creator_profile'.
+        """
+        record = {'timestamp': time.time(), **fields, **self.snapshot()}
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        """
+        Serves the Prometheus text at http://host:port/metrics from a background thread.
+
+        Args:
+            port (int): The port to listen on (default is 9464).
+            host (str): The interface to listen on (default is '127.0.0.1').
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True).start()
+
+    def stop(self):
+        """
+        Stops the HTTP endpoint if it is running.
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# The registry the scrapers report to unless they are given their own.
+METRICS = Metrics()
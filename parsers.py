@@ -0,0 +1,414 @@
+import json
+import re
+from dataclasses import dataclass
+from lxml import etree, html as lxml_html
+
+# Class names used by skool.com's styled-components markup. The browser path
+# matches them with DrissionPage's '.<class>' locator, which compares the whole
+# class attribute, so the HTML parsers below do the same.
+PAGINATION_CLASS = 'styled__DesktopPaginationControls-sc-4zz1jl-1 iBxcTJ'
+PAGINATION_BUTTON_CLASS = 'styled__ButtonWrapper-sc-dscagy-1 ikjxol'
+CARDS_CLASS = 'styled__DiscoveryCards-sc-jt9hr-7 lnuLcQ'
+CARD_LINK_CLASS = 'styled__ChildrenLink-sc-i4j3i6-1 kbNjnr styled__DiscoveryCardLink-sc-13ysp3k-0 eyLtsl'
+CARD_CONTENT_CLASS = 'styled__DiscoveryCardContent-sc-13ysp3k-4 cggWfX'
+CARD_META_CLASS = 'styled__DiscoveryCardMeta-sc-13ysp3k-7 jjNZwk'
+TYPOGRAPHY_CLASS = 'styled__TypographyWrapper-sc-m28jfn-0 eoHmvk'
+LINK_CLASS = 'styled__ChildrenLink-sc-i4j3i6-1 kbNjnr'
+GROUP_INFO_CLASSES = ('styled__GroupInfo-sc-ahd4cu-3 gdabfl', 'styled__GroupInfo-sc-ahd4cu-3 hJcEW')
+INFO_ITEM_CLASS = 'styled__InfoItem-sc-ahd4cu-5 bSfAkV'
+SOCIAL_LINKS_CLASS = 'styled__UserSocialLinksWrapper-sc-vbxyw2-0 kILtEf'
+
+SITE_URL = 'https://www.skool.com'
+
+# Next.js embeds a page's server-side props as JSON in this script element, and serves the same
+# props on their own under /_next/data/<buildId>/<path>.json. The discovery listing is read from
+# these keys of the props (see parse_listing_payload).
+NEXT_DATA_ID = '__NEXT_DATA__'
+LISTING_GROUPS_KEY = 'groups'
+LISTING_PAGES_KEY = 'totalPages'
+
+
+@dataclass
+class CommunityCard:
+    """
+    A community listed on a discovery page.
+
+    Attributes:
+        full_url (str): The absolute URL of the community.
+        community_name (str): The community's display name, or 'N/A'.
+        status (str): 'Private' or 'Public', or 'N/A'.
+        members (int | str): The member count, or 'N/A'.
+        price (str): The monthly price without '/month', e.g. '$49' or 'Free', or 'N/A'.
+    """
+    full_url: str
+    community_name: str = 'N/A'
+    status: str = 'N/A'
+    members: object = 'N/A'
+    price: str = 'N/A'
+
+    def to_dict(self):
+        """
+        Returns the card keyed by the column names of main_content_data.csv.
+
+        Returns:
+            dict: The card as a CSV row.
+        """
+        return {
+            'Full URL': self.full_url,
+            'Community Name': self.community_name,
+            'Status': self.status,
+            'Members': self.members,
+            'Price': self.price
+        }
+
+
+@dataclass
+class ProfileDetails:
+    """
+    The counters and social links shown on a creator's profile page.
+
+    Attributes:
+        followers (str): The followers count as displayed (e.g. '1.2k'), or None.
+        contributions (str): The contributions count as displayed, or None.
+        instagram (str): The Instagram URL, or None.
+        twitter (str): The Twitter/X URL, or None.
+        youtube (str): The YouTube URL, or None.
+        facebook (str): The Facebook URL, or None.
+        linkedin (str): The LinkedIn URL, or None.
+        website (str): Any other linked URL, or None.
+    """
+    followers: str = None
+    contributions: str = None
+    instagram: str = None
+    twitter: str = None
+    youtube: str = None
+    facebook: str = None
+    linkedin: str = None
+    website: str = None
+
+    def as_tuple(self):
+        """
+        Returns the fields in the order returned by Scraper.fetch_profile_details.
+
+        Returns:
+            tuple: Followers, contributions, and the six social URLs.
+        """
+        return (self.followers, self.contributions, self.instagram, self.twitter, self.youtube,
+                self.facebook, self.linkedin, self.website)
+
+
+def parse_document(html):
+    """
+    Parses page HTML into an element tree.
+
+    Args:
+        html (str): The page HTML.
+
+    Returns:
+        lxml.html.HtmlElement: The root element, or None if the document is empty or unparseable,
+            e.g. an empty response body or cache entry.
+    """
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.fromstring(html)
+    except etree.ParserError:
+        return None
+
+
+def find_all(node, class_name):
+    """
+    Finds all elements under a node (including the node itself) whose class attribute equals the given value.
+
+    Args:
+        node (lxml.html.HtmlElement): The node to search under.
+        class_name (str): The full class attribute value to match.
+
+    Returns:
+        list: The matching elements in document order.
+    """
+    return node.xpath('descendant-or-self::*[@class=$cls]', cls=class_name)
+
+
+def find_first(node, class_name):
+    """
+    Finds the first element under a node whose class attribute equals the given value.
+
+    Args:
+        node (lxml.html.HtmlElement): The node to search under.
+        class_name (str): The full class attribute value to match.
+
+    Returns:
+        lxml.html.HtmlElement: The first matching element, or None if not found.
+    """
+    found = find_all(node, class_name)
+    return found[0] if found else None
+
+
+def text_of(node):
+    """
+    Returns the stripped text content of a node.
+
+    Args:
+        node (lxml.html.HtmlElement): The node to read.
+
+    Returns:
+        str: The text content with surrounding whitespace removed.
+    """
+    return node.text_content().strip()
+
+
+def parse_card_meta(text_content):
+    """
+    Splits a discovery card meta line into status, members, and price.
+
+    Args:
+        text_content (str): The meta text, e.g. 'Private • 1.2kMembers • $49 /month'.
+
+    Returns:
+        tuple: The status, the member count as an int, and the price without the '/month'
+            suffix, e.g. '$49' or 'Free' ('N/A' for missing parts). parse_listing_payload
+            returns the same types and formatting.
+    """
+    status, members, price = 'N/A', 'N/A', 'N/A'
+    parts = re.split(r'•', text_content)
+    if len(parts) > 0:
+        status = parts[0].strip()
+    if len(parts) > 1:
+        members = parts[1].strip()
+        if 'k' in members:
+            members = round(float(members.split('kMembers')[0]) * 1000)
+        else:
+            members = int(members.split('Members')[0])
+    if len(parts) > 2:
+        price = parts[2].strip()
+        if '/month' in price:
+            price = price.split('/month')[0].strip()
+    return status, members, price
+
+
+def classify_social_links(hrefs):
+    """
+    Sorts social link hrefs into the platforms stored for each creator.
+
+    Args:
+        hrefs (list): The href values of the creator's social links.
+
+    Returns:
+        tuple: Instagram, Twitter, YouTube, Facebook, LinkedIn, and Website URLs (None when absent).
+    """
+    instagram_url = twitter_url = youtube_url = facebook_url = linkedin_url = website_url = None
+    for href in hrefs:
+        if 'instagram.com' in href:
+            instagram_url = href
+        elif 'twitter.com' in href or 'x.com' in href:
+            twitter_url = href
+        elif 'youtube.com' in href:
+            youtube_url = href
+        elif 'facebook.com' in href:
+            facebook_url = href
+        elif 'linkedin.com' in href:
+            linkedin_url = href
+        else:
+            website_url = href
+    return instagram_url, twitter_url, youtube_url, facebook_url, linkedin_url, website_url
+
+
+def parse_last_page_number(html):
+    """
+    Reads the last page number from a discovery page's pagination controls.
+
+    Args:
+        html (str): The discovery page HTML.
+
+    Returns:
+        int: The last page number, or None if the pagination is not rendered.
+    """
+    tree = parse_document(html)
+    if tree is None:
+        return None
+    pagination_div = find_first(tree, PAGINATION_CLASS)
+    if pagination_div is None:
+        return None
+    buttons = find_all(pagination_div, PAGINATION_BUTTON_CLASS)
+    if not buttons:
+        return 1
+    return int(text_of(buttons[-1]))
+
+
+def parse_discovery_cards(html, site_url=SITE_URL):
+    """
+    Extracts community records from a discovery page.
+
+    Args:
+        html (str): The discovery page HTML.
+        site_url (str): The site root prepended to each card's href.
+
+    Returns:
+        list: A list of CommunityCard records in page order.
+    """
+    tree = parse_document(html)
+    if tree is None:
+        return []
+    cards_div = find_first(tree, CARDS_CLASS)
+    if cards_div is None:
+        return []
+
+    data = []
+    for link in find_all(cards_div, CARD_LINK_CLASS):
+        href = link.get('href')
+        if not href:
+            continue
+        content_div = find_first(link, CARD_CONTENT_CLASS)
+        if content_div is None:
+            continue
+
+        community_name_div = find_first(content_div, TYPOGRAPHY_CLASS)
+        community_name = text_of(community_name_div) if community_name_div is not None else 'N/A'
+        meta_div = find_first(content_div, CARD_META_CLASS)
+        status, members, price = parse_card_meta(text_of(meta_div)) if meta_div is not None else ('N/A', 'N/A', 'N/A')
+
+        data.append(CommunityCard(f'{site_url}{href}', community_name, status, members, price))
+    return data
+
+
+def parse_card_payload(items, site_url=SITE_URL):
+    """
+    Builds community records from the card list collected by the in-page extraction script.
+
+    Args:
+        items (list): Dictionaries with 'href', 'name' and 'meta' keys, one per card link.
+            'name' and 'meta' are None when the element is missing, and cards without
+            content have 'content' set to False.
+        site_url (str): The site root prepended to each card's href.
+
+    Returns:
+        list: A list of CommunityCard records in page order.
+    """
+    data = []
+    for item in items:
+        href = item.get('href')
+        if not href or not item.get('content'):
+            continue
+        name = item.get('name')
+        meta = item.get('meta')
+        community_name = name.strip() if name is not None else 'N/A'
+        status, members, price = parse_card_meta(meta.strip()) if meta is not None else ('N/A', 'N/A', 'N/A')
+        data.append(CommunityCard(f'{site_url}{href}', community_name, status, members, price))
+    return data
+
+
+def parse_next_data(html):
+    """
+    Reads the JSON that Next.js embeds in a server-rendered page.
+
+    Args:
+        html (str): The page HTML.
+
+    Returns:
+        dict: The decoded __NEXT_DATA__ payload, with the 'buildId' and 'props' keys, or None if
+            the page has none.
+    """
+    tree = parse_document(html)
+    if tree is None:
+        return None
+    scripts = tree.xpath('//script[@id=$id]', id=NEXT_DATA_ID)
+    if not scripts or not scripts[0].text:
+        return None
+    try:
+        return json.loads(scripts[0].text)
+    except ValueError:
+        return None
+
+
+def parse_listing_payload(payload, site_url=SITE_URL):
+    """
+    Extracts community records and the page count from the discovery listing in Next.js page props.
+
+    Args:
+        payload (dict): A /_next/data response ({'pageProps': ...}) or a page's __NEXT_DATA__
+            ({'props': {'pageProps': ...}}).
+        site_url (str): The site root prepended to each community's slug.
+
+    Returns:
+        tuple: A list of CommunityCard records in listing order, formatted like the cards of
+            parse_discovery_cards, and the number of listing pages (None if the props do not say).
+    """
+    if not isinstance(payload, dict):
+        return [], None
+    props = payload.get('pageProps') or (payload.get('props') or {}).get('pageProps') or {}
+    data = []
+    for group in props.get(LISTING_GROUPS_KEY) or []:
+        slug = group.get('name')
+        if not slug:
+            continue
+        metadata = group.get('metadata') or {}
+        privacy = metadata.get('privacy')
+        status = 'N/A' if privacy is None else 'Private' if privacy else 'Public'
+        members = metadata.get('totalMembers')
+        price = metadata.get('price')  # The monthly price in dollars, 0 for free communities
+        if price is None:
+            price = 'N/A'
+        elif isinstance(price, (int, float)):
+            price = f'${price:g}' if price else 'Free'
+        else:
+            price = str(price).strip()
+        data.append(CommunityCard(f'{site_url}/{slug}', (metadata.get('displayName') or 'N/A').strip(), status,
+                                  round(members) if isinstance(members, (int, float)) else 'N/A', price))
+    pages = props.get(LISTING_PAGES_KEY)
+    return data, int(pages) if pages else None
+
+
+def parse_creator_profile_href(html):
+    """
+    Extracts the creator's profile href from a community's /about page.
+
+    Args:
+        html (str): The /about page HTML.
+
+    Returns:
+        str: The profile href (site-relative), or None if not found.
+    """
+    tree = parse_document(html)
+    if tree is None:
+        return None
+    for class_name in GROUP_INFO_CLASSES:
+        group_info = find_first(tree, class_name)
+        if group_info is not None:
+            break
+    else:
+        return None
+
+    info_items = find_all(group_info, INFO_ITEM_CLASS)
+    if not info_items:
+        return None
+    a_tag = find_first(info_items[-1], LINK_CLASS)
+    return a_tag.get('href') if a_tag is not None else None
+
+
+def parse_profile_details(html):
+    """
+    Extracts follower, contribution, and social link data from a creator profile page.
+
+    Args:
+        html (str): The profile page HTML.
+
+    Returns:
+        ProfileDetails: The parsed counters and social links.
+    """
+    tree = parse_document(html)
+    if tree is None:
+        return ProfileDetails()
+    counters = find_all(tree, TYPOGRAPHY_CLASS)
+    if len(counters) >= 2:
+        contributions_count = text_of(counters[0])
+        followers_count = text_of(counters[1])
+    else:
+        followers_count, contributions_count = None, None
+
+    hrefs = []
+    social_media_div = find_first(tree, SOCIAL_LINKS_CLASS)
+    if social_media_div is not None:
+        hrefs = [a_tag.get('href', '') for a_tag in find_all(social_media_div, LINK_CLASS)]
+
+    return ProfileDetails(followers_count, contributions_count, *classify_social_links(hrefs))
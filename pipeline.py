@@ -0,0 +1,318 @@
+import csv
+import logging
+import threading
+from queue import Queue
+import pandas as pd
+from checkpoint import CheckpointStore
+from discovery import DiscoveryPlanner
+from html_cache import HtmlCache
+from metrics import METRICS
+from preprocessing import preprocess_record
+from ratelimit import AdaptiveRateLimiter
+from scrape import AgentScraper
+import scrape_profile
+import scrape_profile_details
+from scrape_profile_details import DETAIL_COLUMNS
+from storage import CsvStorage, storage_for, write_table
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output on its queue.
+_DONE = object()
+
+# The storage stage of each sink, which types its columns in a Parquet file.
+SINK_STAGES = {
+    'discovery': 'discovery',
+    'profiles': 'creator_profile',
+    'details': 'profile_details',
+    'preprocessed': None,
+}
+
+
+class CsvSink:
+    """
+    Appends pipeline records to a CSV file as they arrive.
+
+    The header is taken from the keys of the first record, so the columns match what the
+    stand-alone scripts write with DataFrame.to_csv. Values are written as they arrive, so a
+    number may be formatted differently than in a DataFrame column that mixes ints and floats.
+
+    Attributes:
+        path (str): The path of the CSV file.
+        encoding (str): The file encoding.
+    """
+
+    def __init__(self, path, encoding='utf-8-sig'):
+        """
+        Initializes the sink. The file is created when the first record is written.
+
+        Args:
+            path (str): The path of the CSV file.
+            encoding (str): The file encoding (default is 'utf-8-sig').
+        """
+        self.path = path
+        self.encoding = encoding
+        self._file = None
+        self._writer = None
+
+    def write(self, record):
+        """
+        Writes one record to the file.
+
+        Args:
+            record (dict): The row to write.
+        """
+        if self._writer is None:
+            self._file = open(self.path, 'w', newline='', encoding=self.encoding)
+            self._writer = csv.DictWriter(self._file, fieldnames=list(record))
+            self._writer.writeheader()
+        self._writer.writerow(record)
+        self._file.flush()
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        if self._file:
+            self._file.close()
+
+
+class TableSink:
+    """
+    Collects pipeline records and writes them with storage.write_table when the stage ends.
+
+    Used for sink paths that are not CSV files, such as Parquet files, which cannot be
+    appended to row by row.
+
+    Attributes:
+        path (str): The path of the output file.
+        stage (str): The storage stage name, or None to infer the column types.
+    """
+
+    def __init__(self, path, stage=None):
+        """
+        Initializes the sink.
+
+        Args:
+            path (str): The path of the output file.
+            stage (str, optional): The storage stage name.
+        """
+        self.path = path
+        self.stage = stage
+        self._records = []
+
+    def write(self, record):
+        """
+        Adds one record to the output.
+
+        Args:
+            record (dict): The row to write.
+        """
+        self._records.append(record)
+
+    def close(self):
+        """
+        Writes the collected records, if any.
+        """
+        if self._records:
+            write_table(pd.DataFrame(self._records), self.path, stage=self.stage)
+
+
+class Pipeline:
+    """
+    Runs discovery, /about, profile and preprocessing as concurrent stages joined by bounded queues.
+
+    A community found on the first discovery page moves on to its /about and profile fetches
+    while discovery is still walking later pages. With a concurrency above 1 on the discovery
+    scraper, discovery pages are fetched in parallel and their cards enter the queue in the
+    order the pages complete; a community seen on an earlier page is not passed on again.
+    Each stage runs in its own thread, and the queue bounds cap how many records are in
+    flight. Per-stage CSV or Parquet files are optional sinks.
+
+    The three scrapers must not share a ChromiumPage, since every stage drives its own page
+    concurrently. Give each stage its own `local_port` (and user profile), since scrapers on
+    the same debugging port share one browser whatever profile they ask for. The 'http'
+    backend still falls back to the browser for pages it cannot parse, so it needs the ports too.
+
+    Attributes:
+        discovery (AgentScraper): The scraper for discovery pages.
+        profile_scraper (scrape_profile.Scraper): The scraper for community /about pages.
+        details_scraper (scrape_profile_details.Scraper): The scraper for creator profiles.
+        queue_size (int): The maximum number of records waiting between two stages.
+        sinks (dict): Optional CSV or Parquet paths keyed by 'discovery', 'profiles', 'details' and 'preprocessed'.
+        planner (DiscoveryPlanner): Plans and extracts the discovery pages, or None for the ?p=N pages.
+    """
+
+    def __init__(self, discovery, profile_scraper, details_scraper, queue_size=100, sinks=None, planner=None):
+        """
+        Initializes the pipeline with one scraper per stage.
+
+        Args:
+            discovery (AgentScraper): The scraper for discovery pages.
+            profile_scraper (scrape_profile.Scraper): The scraper for community /about pages.
+            details_scraper (scrape_profile_details.Scraper): The scraper for creator profiles.
+            queue_size (int): The maximum number of records waiting between two stages (default is 100).
+            sinks (dict, optional): CSV or Parquet paths keyed by 'discovery', 'profiles', 'details' and 'preprocessed'.
+            planner (DiscoveryPlanner, optional): A planner built on the discovery scraper.
+        """
+        self.discovery = discovery
+        self.profile_scraper = profile_scraper
+        self.details_scraper = details_scraper
+        self.queue_size = queue_size
+        self.sinks = sinks or {}
+        self.planner = planner
+        self._errors = []
+
+    def _sink(self, name):
+        path = self.sinks.get(name)
+        if not path:
+            return None
+        if isinstance(storage_for(path), CsvStorage):
+            return CsvSink(path)
+        return TableSink(path, stage=SINK_STAGES[name])
+
+    def _run_stage(self, name, work, inbox, outbox):
+        sink = self._sink(name)
+        try:
+            work(inbox, outbox, sink)
+        except Exception as e:
+            logger.error(f"Stage '{name}' failed: {e}")
+            self._errors.append(e)
+            if inbox is not None:
+                # Keep draining so upstream stages are not blocked on a full queue
+                while inbox.get() is not _DONE:
+                    pass
+        finally:
+            if sink:
+                sink.close()
+            outbox.put(_DONE)
+
+    def _discover(self, inbox, outbox, sink):
+        if self.planner:
+            urls, extract = self.planner.plan(), self.planner.extract
+        else:
+            last_page = self.discovery.get_last_page_number()
+            logger.info(f"Total number of pages: {last_page}")
+            urls = [f'{self.discovery.base_url}?p={page_num}' for page_num in range(1, last_page + 1)]
+            extract = self.discovery.extract_data_from_page
+        seen = set()
+        lock = threading.Lock()
+
+        def emit(url, records):
+            with lock:
+                for record in records:
+                    if record['Full URL'] in seen:
+                        continue
+                    seen.add(record['Full URL'])
+                    if sink:
+                        sink.write(record)
+                    outbox.put(record)
+
+        concurrency = self.discovery.concurrency
+        if concurrency > 1 and len(urls) > 1:
+            self.discovery.scrape_pages_concurrently(urls, min(concurrency, len(urls)), emit, extract)
+        else:
+            for page_num, url in enumerate(urls, 1):
+                logger.info(f"Scraping page {page_num}...")
+                emit(url, extract(url))
+
+    def _fetch_profiles(self, inbox, outbox, sink):
+        index = 0
+        while (record := inbox.get()) is not _DONE:
+            index += 1
+            creator_profile_url = self.profile_scraper.fetch_creator_profile_url(index, record['Full URL'])
+            logger.info(f"Scraped Profile URL: {creator_profile_url}")
+            record = {**record, 'Creator Profile URL': creator_profile_url or None}
+            if sink:
+                sink.write(record)
+            outbox.put(record)
+
+    def _fetch_details(self, inbox, outbox, sink):
+        index = 0
+        while (record := inbox.get()) is not _DONE:
+            index += 1
+            details = self.details_scraper.lookup_profile_details(index, record['Creator Profile URL'])
+            record = {**record, **dict(zip(DETAIL_COLUMNS, details))}
+            if sink:
+                sink.write(record)
+            outbox.put(record)
+
+    def _preprocess(self, inbox, outbox, sink):
+        while (record := inbox.get()) is not _DONE:
+            record = preprocess_record(record)
+            if sink:
+                sink.write(record)
+            outbox.put(record)
+
+    def run(self, on_record=None):
+        """
+        Runs all stages until discovery is exhausted and every record has been processed.
+
+        Args:
+            on_record (callable, optional): Called with each fully processed record, in discovery order.
+
+        Returns:
+            int: The number of records that reached the end of the pipeline.
+
+        Raises:
+            Exception: The first error raised by any stage, after all stages have stopped.
+        """
+        self._errors = []
+        stages = [('discovery', self._discover), ('profiles', self._fetch_profiles),
+                  ('details', self._fetch_details), ('preprocessed', self._preprocess)]
+        queues = [None] + [Queue(maxsize=self.queue_size) for _ in stages]
+        threads = [
+            threading.Thread(target=self._run_stage, args=(name, work, queues[i], queues[i + 1]),
+                             name=f'pipeline-{name}', daemon=True)
+            for i, (name, work) in enumerate(stages)
+        ]
+        for thread in threads:
+            thread.start()
+
+        count = 0
+        while (record := queues[-1].get()) is not _DONE:
+            count += 1
+            if on_record:
+                on_record(record)
+
+        for thread in threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+        logger.info(f"Pipeline finished: {count} communities processed.")
+        return count
+
+
+if __name__ == "__main__":
+    log_level = logging.INFO  # logging.DEBUG also logs every page load and parsed field
+    logging.basicConfig(level=log_level, format='%(message)s')
+    metrics_port = 9464  # Prometheus scrapes http://127.0.0.1:9464/metrics while the crawl runs
+    METRICS.serve(metrics_port)
+    cache = HtmlCache('html_cache')
+    # One limiter paces all stages, since they all hit the same site.
+    rate_limiter = AdaptiveRateLimiter()
+    # The HTTP backend keeps the stages from competing for a browser page, and each stage's
+    # browser fallback runs on its own port.
+    discovery = AgentScraper(base_url='https://www.skool.com/discovery', user_profile='Profile 5', backend='http',
+                             cache=cache, rate_limiter=rate_limiter, local_port=9231)
+    profile_scraper = scrape_profile.Scraper(base_url='https://www.skool.com', user_profile='Profile 1',
+                                             backend='http', cache=cache, rate_limiter=rate_limiter, local_port=9232)
+    memo = CheckpointStore('crawl_state.db', stage='profile_memo')  # Creators fetched by earlier runs
+    details_scraper = scrape_profile_details.Scraper(user_profile='Profile 2', backend='http', cache=cache,
+                                                     rate_limiter=rate_limiter, memo=memo, local_port=9233)
+    planner = DiscoveryPlanner(discovery)  # Reads later pages from the listing endpoint when the site has one
+    pipeline = Pipeline(discovery, profile_scraper, details_scraper, planner=planner, sinks={
+        'discovery': 'main_content_data.csv',
+        'profiles': 'data_with_creator_profiles.csv',
+        'details': 'full_data.csv',
+        'preprocessed': 'preprocessed_data.csv',
+    })
+    try:
+        pipeline.run()
+    finally:
+        discovery.close()
+        profile_scraper.close()
+        details_scraper.close()
+        memo.close()
+        METRICS.append_jsonl('metrics.jsonl', stage='pipeline')
+        METRICS.stop()
@@ -1,53 +1,186 @@
+import re
 import pandas as pd
 
+# A count as shown on the site, e.g. '12', '1,234', '1.5k' or '2M'.
+COUNT_PATTERN = r'^\s*(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<suffix>[kKmM]?)'
+# The first amount in a price, e.g. '49' in '$49' or '1,299.99' in '€1,299.99'.
+AMOUNT_PATTERN = r'(?P<amount>\d[\d,]*(?:\.\d+)?)'
+SUFFIX_MULTIPLIERS = {'': 1, 'k': 1_000, 'm': 1_000_000}
+
+_COUNT_RE = re.compile(COUNT_PATTERN)
+_AMOUNT_RE = re.compile(AMOUNT_PATTERN)
+
 def transform_price(price):
     """
     Transforms price values to remove the '/month' suffix if present.
 
     Args:
-        price (str): The price value as a string.
+        price (str): The price value as a string. Missing values are returned unchanged.
 
     Returns:
         str: The transformed price value without the '/month' suffix.
     """
-    if '/month' in price:
+    if isinstance(price, str) and '/month' in price:
         return price.split(' /month')[0]
     return price
 
+def transform_monthly_price(price):
+    """
+    Converts a price string into a number: '$49 /month' becomes 49.0 and 'Free' becomes 0.0.
+
+    Args:
+        price (str): The price value as a string.
+
+    Returns:
+        float: The amount, or None if the price is missing or has no amount.
+    """
+    if not isinstance(price, str):
+        return None
+    if price.strip().lower() == 'free':
+        return 0.0
+    match = _AMOUNT_RE.search(price)
+    return float(match.group('amount').replace(',', '')) if match else None
+
 def transform_contributions_followers(contribution):
     """
-    Transforms contribution values from a string with 'k' notation to an integer.
+    Transforms contribution values from a string with 'k' or 'M' notation to an integer.
+
+    Args:
+        contribution (str): The contribution value as a string, potentially including 'k' or 'M'.
+
+    Returns:
+        int: The transformed contribution value, or None if it is missing or not a count.
+    """
+    if not isinstance(contribution, str):
+        return None
+    match = _COUNT_RE.match(contribution)
+    if not match:
+        return None
+    number = float(match.group('number').replace(',', ''))
+    return round(number * SUFFIX_MULTIPLIERS[match.group('suffix').lower()])
+
+def _transform_distinct(values, transform):
+    # Scraped prices and counts repeat a lot, so each distinct value is parsed only once
+    codes, uniques = pd.factorize(values)
+    results = transform(pd.Series(uniques, dtype='string'))
+    if not isinstance(results, tuple):
+        return pd.Series(results.array.take(codes, allow_fill=True), index=values.index, name=values.name)
+    return tuple(pd.Series(result.array.take(codes, allow_fill=True), index=values.index, name=values.name)
+                 for result in results)
+
+def _parse_prices(prices):
+    stripped = prices.str.replace(r' /month.*$', '', regex=True)
+    amounts = stripped.str.extract(AMOUNT_PATTERN)['amount'].str.replace(',', '', regex=False)
+    monthly = pd.to_numeric(amounts, errors='coerce').astype('Float64')
+    return stripped, monthly.mask(stripped.str.strip().str.lower().eq('free').fillna(False), 0.0)
+
+def _parse_counts(counts):
+    parts = counts.str.extract(COUNT_PATTERN)
+    numbers = pd.to_numeric(parts['number'].str.replace(',', '', regex=False), errors='coerce')
+    multipliers = parts['suffix'].str.lower().map(SUFFIX_MULTIPLIERS).astype('float64')
+    return (numbers * multipliers).round().astype('Int64')
+
+def transform_price_column(prices):
+    """
+    Vectorized transform_price and transform_monthly_price over a whole column.
+
+    Args:
+        prices (pd.Series): The scraped price strings; missing values are allowed.
+
+    Returns:
+        tuple: The prices without the '/month' suffix (a string pd.Series) and the numeric
+            monthly prices (a nullable Float64 pd.Series, missing when there is no amount).
+    """
+    return _transform_distinct(prices, _parse_prices)
+
+def transform_count_column(counts):
+    """
+    Vectorized transform_contributions_followers over a whole column.
+
+    Args:
+        counts (pd.Series): The scraped counts; missing values are allowed.
+
+    Returns:
+        pd.Series: The counts as a nullable integer (Int64) column.
+    """
+    return _transform_distinct(counts, _parse_counts)
+
+def preprocess_frame(df):
+    """
+    Applies the preprocessing transforms to every row of a DataFrame at once.
+
+    Args:
+        df (pd.DataFrame): The scraped rows with 'Price', 'Contributions' and 'Followers' columns.
+
+    Returns:
+        pd.DataFrame: The same DataFrame, with 'Monthly Price' added after 'Price'.
+    """
+    df['Price'], monthly_price = transform_price_column(df['Price'])
+    df.insert(df.columns.get_loc('Price') + 1, 'Monthly Price', monthly_price)
+    df['Contributions'] = transform_count_column(df['Contributions'])
+    df['Followers'] = transform_count_column(df['Followers'])
+    return df
+
+def preprocess_record(record):
+    """
+    Applies the preprocessing transforms to a single scraped row.
+
+    Missing values (None or NaN) become None.
 
     Args:
-        contribution (str): The contribution value as a string, potentially including 'k'.
+        record (dict): A row with 'Price', 'Contributions' and 'Followers' keys.
 
     Returns:
-        float: The transformed contribution value in integer form.
+        dict: A new dictionary with the transformed values and 'Monthly Price' after 'Price'.
     """
-    if 'k' in contribution:
-        if '.' in contribution:
-            return float(contribution.split('k')[0]) * 1000
-        return float(contribution.split('k')[0]) * 1000
-    return int(contribution)
+    transformed = {}
+    for key, value in record.items():
+        if key == 'Price':
+            transformed['Price'] = transform_price(value) if isinstance(value, str) else None
+            transformed['Monthly Price'] = transform_monthly_price(value)
+        elif key in ('Contributions', 'Followers'):
+            transformed[key] = transform_contributions_followers(value)
+        else:
+            transformed[key] = value
+    return transformed
 
-def preprocess_data(file_path, output_path):
+def preprocess_data(file_path, output_path, chunksize=None, columns=None):
     """
-    Reads a CSV file, transforms specific columns, and saves the preprocessed data to a new CSV file.
+    Reads a stage output, transforms specific columns, and saves the preprocessed data to a new file.
+
+    Every column is read as text, so columns that are not transformed are written back exactly
+    as they were scraped. With `chunksize`, a CSV file is streamed through in chunks of that many
+    rows, so memory use does not grow with the input; the output is identical to the in-memory mode.
 
     Args:
-        file_path (str): The path to the input CSV file.
-        output_path (str): The path to the output CSV file where preprocessed data will be saved.
+        file_path (str): The path to the input CSV or Parquet file.
+        output_path (str): The path to the output CSV or Parquet file where preprocessed data will be saved.
+        chunksize (int, optional): The number of rows per chunk. Defaults to loading the whole file.
+        columns (list, optional): The columns to keep, which must include 'Price', 'Contributions'
+            and 'Followers'. Defaults to all of them.
     """
+    # storage imports this module for its count transform
+    from storage import CsvStorage, read_table, storage_for, write_table
+
+    if chunksize:
+        if not (isinstance(storage_for(file_path), CsvStorage) and isinstance(storage_for(output_path), CsvStorage)):
+            raise ValueError("Chunked preprocessing reads and writes CSV files.")
+        with pd.read_csv(file_path, usecols=columns, dtype=str, keep_default_na=False, chunksize=chunksize) as reader:
+            for index, chunk in enumerate(reader):
+                # Only the first chunk starts the file, so only it carries the BOM
+                preprocess_frame(chunk).to_csv(output_path, index=False, mode='w' if index == 0 else 'a',
+                                               header=index == 0, encoding='utf-8-sig' if index == 0 else 'utf-8')
+        print(f"Preprocessed data has been saved to '{output_path}'.")
+        return
+
     # Load the dataset
-    df = pd.read_csv(file_path)
-    
+    df = read_table(file_path, columns=columns, text=True)
+
     # Apply transformations
-    df['Price'] = df['Price'].apply(transform_price)
-    df['Contributions'] = df['Contributions'].apply(transform_contributions_followers)
-    df['Followers'] = df['Followers'].apply(transform_contributions_followers)
-    
+    df = preprocess_frame(df)
+
     # Save the preprocessed dataset
-    df.to_csv(output_path, index=False)
+    write_table(df, output_path)
     print(f"Preprocessed data has been saved to '{output_path}'.")
 
 # Example usage
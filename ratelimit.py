@@ -0,0 +1,108 @@
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """
+    A thread-safe token bucket whose refill rate adapts to how the site responds.
+
+    The rate follows AIMD (additive increase, multiplicative decrease): every healthy response
+    raises it by `increase` requests per second, and every error or empty selector multiplies
+    it by `decrease`. Consecutive failures also pause all requests for an exponentially growing,
+    jittered backoff. One limiter can be shared by several scrapers, tabs and threads so they
+    draw from the same budget.
+
+    Attributes:
+        min_rate (float): The lowest rate in requests per second.
+        max_rate (float): The highest rate in requests per second.
+        burst (int): The number of requests that may be sent back to back.
+        increase (float): Requests per second added after each success.
+        decrease (float): Factor applied to the rate after each failure.
+        base_backoff (float): Pause in seconds after the first failure; doubles per consecutive failure.
+        max_backoff (float): The longest pause in seconds.
+    """
+
+    def __init__(self, rate=1 / 1.5, min_rate=0.05, max_rate=4.0, burst=1, increase=0.05, decrease=0.5,
+                 base_backoff=2.0, max_backoff=120.0):
+        """
+        Initializes the limiter.
+
+        Args:
+            rate (float): The starting rate in requests per second (default is one per 1.5 seconds).
+            min_rate (float): The lowest rate (default is 0.05).
+            max_rate (float): The highest rate (default is 4.0).
+            burst (int): The bucket capacity (default is 1).
+            increase (float): Additive increase per success (default is 0.05).
+            decrease (float): Multiplicative decrease per failure (default is 0.5).
+            base_backoff (float): First backoff pause in seconds (default is 2.0).
+            max_backoff (float): Longest backoff pause in seconds (default is 120.0).
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._rate = min(max(rate, min_rate), max_rate)
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """
+        Returns the current rate.
+
+        Returns:
+            float: The current rate in requests per second.
+        """
+        return self._rate
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def acquire(self):
+        """
+        Blocks until the caller may send its next request.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+    def record_success(self):
+        """
+        Reports a healthy response and speeds up.
+        """
+        with self._lock:
+            self._failures = 0
+            self._rate = min(self.max_rate, self._rate + self.increase)
+
+    def record_failure(self):
+        """
+        Reports an error or an empty selector, slows down, and pauses for a jittered backoff.
+        """
+        with self._lock:
+            self._failures += 1
+            self._rate = max(self.min_rate, self._rate * self.decrease)
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (self._failures - 1))
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, now + backoff * random.uniform(0.5, 1.0))
+            logger.warning(f"Backing off for up to {backoff:.1f}s. Rate lowered to {self._rate:.2f} req/s.")
@@ -0,0 +1,114 @@
+import json
+import logging
+import time
+from DrissionPage.errors import ContextLostError, JavaScriptError
+
+logger = logging.getLogger(__name__)
+
+# Reports, in one CDP round-trip, which target selector matched first (or -1), the document's
+# ready state and how many subresources the page has requested so far.
+READY_STATE_JS = """
+const selectors = arguments[0];
+return JSON.stringify({
+    found: selectors.findIndex(selector => document.querySelector(selector) !== null),
+    state: document.readyState,
+    resources: performance.getEntriesByType('resource').length
+});
+"""
+
+
+def class_selector(class_name):
+    """
+    Returns a CSS selector matching the whole class attribute, like DrissionPage's '.<class>' locators.
+
+    Args:
+        class_name (str): The full class attribute value.
+
+    Returns:
+        str: The CSS selector.
+    """
+    return f'[class={json.dumps(class_name)}]'
+
+
+class Readiness:
+    """
+    Waits until a freshly navigated page is ready to be parsed.
+
+    The page is polled for its target selectors, so the scraper proceeds the moment the cards,
+    group info or social links appear. If the document has finished loading and no new
+    request has started for `idle_time`, the page has settled without the target and the
+    wait ends early instead of running into `timeout`.
+
+    Attributes:
+        timeout (float): The longest wait in seconds.
+        idle_time (float): Seconds without new requests after which a loaded page counts as settled.
+        poll_interval (float): Seconds between two checks.
+    """
+
+    def __init__(self, timeout=10.0, idle_time=0.5, poll_interval=0.05):
+        """
+        Initializes the waiter.
+
+        Args:
+            timeout (float): The longest wait in seconds (default is 10).
+            idle_time (float): The network-idle window in seconds (default is 0.5).
+            poll_interval (float): Seconds between two checks (default is 0.05).
+        """
+        self.timeout = timeout
+        self.idle_time = idle_time
+        self.poll_interval = poll_interval
+
+    def wait(self, tab, *class_names):
+        """
+        Waits until one of the target elements appears, the network goes idle, or the timeout passes.
+
+        Args:
+            tab (ChromiumPage or ChromiumTab): The tab that was just navigated.
+            *class_names (str): Full class attribute values of the target elements; any one suffices.
+
+        Returns:
+            str: 'selector' if a target appeared, 'idle' if the page settled without one,
+                or 'timeout'.
+        """
+        selectors = [class_selector(class_name) for class_name in class_names]
+        start = time.monotonic()
+        deadline = start + self.timeout
+        resources, idle_since = -1, start
+        while True:
+            try:
+                payload = tab.run_js(READY_STATE_JS, selectors)
+            except (ContextLostError, JavaScriptError):  # The document is being replaced by the navigation
+                payload = None
+            state = json.loads(payload) if payload else {'found': -1, 'state': 'loading', 'resources': 0}
+            if state['found'] >= 0:
+                return 'selector'
+            now = time.monotonic()
+            if state['resources'] != resources or state['state'] != 'complete':
+                resources, idle_since = state['resources'], now
+            elif now - idle_since >= self.idle_time:
+                return 'idle'
+            if now >= deadline:
+                return 'timeout'
+            time.sleep(min(self.poll_interval, max(0.0, deadline - now)))
+
+
+def wait_until_ready(tab, readiness, metrics, stage, *class_names):
+    """
+    Waits for the target elements of a freshly loaded page, timing the wait and counting its outcome.
+
+    Args:
+        tab (ChromiumPage or ChromiumTab): The tab that was just navigated.
+        readiness (Readiness): The scraper's waiter.
+        metrics (Metrics): The scraper's metrics registry.
+        stage (str): The stage label of the 'wait' timer and 'waits' counter.
+        *class_names (str): Full class attribute values of the target elements; any one suffices.
+
+    Returns:
+        str: 'selector', 'idle' or 'timeout', see Readiness.wait.
+    """
+    with metrics.time('wait', stage=stage):
+        outcome = readiness.wait(tab, *class_names)
+    metrics.inc('waits', stage=stage, outcome=outcome)
+    if outcome != 'selector':
+        logger.debug(f"Page ready without its target element ({outcome}).")
+    return outcome
@@ -0,0 +1,263 @@
+import csv
+import heapq
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+import requests
+from DrissionPage.errors import BaseError
+from http_fetch import CacheMissError
+
+logger = logging.getLogger(__name__)
+
+# Failure kinds. Network errors and blocks usually pass, a page without its target element or
+# missing from the HTML cache of an offline run does not.
+NETWORK = 'network'
+SELECTOR_MISSING = 'selector_missing'
+BLOCKED = 'blocked'
+CACHE_MISS = 'cache_miss'
+TRANSIENT = (NETWORK, BLOCKED)
+
+# HTTP statuses the site answers with when it throttles or refuses the crawler.
+BLOCKED_STATUSES = (401, 403, 429)
+
+# Lowercase snippets of challenge, captcha and rate-limit pages.
+BLOCKED_MARKERS = ('cf-challenge', 'challenge-platform', 'captcha', 'attention required', 'access denied',
+                   'too many requests', 'rate limit')
+
+DEAD_LETTER_FIELDS = ('stage', 'url', 'kind', 'reason', 'attempts', 'failed_at')
+
+
+@dataclass
+class Failure:
+    """
+    Why fetching one URL failed.
+
+    Attributes:
+        kind (str): NETWORK, SELECTOR_MISSING, BLOCKED or CACHE_MISS.
+        reason (str): A description of the failure.
+    """
+    kind: str
+    reason: str
+
+    @property
+    def transient(self):
+        """
+        Returns whether a later attempt may succeed.
+
+        Returns:
+            bool: True for network errors and blocks.
+        """
+        return self.kind in TRANSIENT
+
+
+def classify_error(error):
+    """
+    Classifies an exception raised while fetching a page.
+
+    Args:
+        error (Exception): The exception.
+
+    Returns:
+        Failure: BLOCKED for 401/403/429 responses, CACHE_MISS for pages an offline fetcher
+            does not have, NETWORK for other request and browser errors and 5xx responses,
+            SELECTOR_MISSING for anything else (e.g. a 404).
+    """
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status in BLOCKED_STATUSES:
+            return Failure(BLOCKED, f"HTTP {status}")
+        if status >= 500:
+            return Failure(NETWORK, f"HTTP {status}")
+        return Failure(SELECTOR_MISSING, f"HTTP {status}")
+    if isinstance(error, CacheMissError):  # A RequestException, but retrying cannot fill the cache
+        return Failure(CACHE_MISS, str(error))
+    if isinstance(error, (requests.RequestException, BaseError, OSError)):
+        return Failure(NETWORK, f"{type(error).__name__}: {error}")
+    return Failure(SELECTOR_MISSING, f"{type(error).__name__}: {error}")
+
+
+def classify_page(html, selector):
+    """
+    Classifies a page that loaded but lacks its target element.
+
+    Args:
+        html (str): The page HTML, or None.
+        selector (str): A short name of the missing element, used in the reason.
+
+    Returns:
+        Failure: BLOCKED if the page looks like a challenge or rate-limit page, else SELECTOR_MISSING.
+    """
+    text = (html or '').lower()
+    for marker in BLOCKED_MARKERS:
+        if marker in text:
+            return Failure(BLOCKED, f"Blocked page ('{marker}')")
+    return Failure(SELECTOR_MISSING, f"No {selector} on the page")
+
+
+class RetryQueue:
+    """
+    Collects transient failures during a run and retries them once the main loop is done.
+
+    The main loop never waits: a failed URL is scheduled with an exponentially growing,
+    jittered delay and the loop moves on. drain() then retries each URL when its delay has
+    passed, re-scheduling it on another transient failure until `max_attempts` is reached.
+
+    Attributes:
+        max_attempts (int): The attempts per URL, including the first one.
+        base_delay (float): The delay in seconds before the first retry; doubles per attempt.
+        max_delay (float): The longest delay in seconds.
+        dead (dict): Failures given up on, keyed by URL, as (Failure, attempts).
+    """
+
+    def __init__(self, max_attempts=3, base_delay=5.0, max_delay=120.0):
+        """
+        Initializes an empty queue.
+
+        Args:
+            max_attempts (int): Attempts per URL, including the first (default is 3).
+            base_delay (float): Seconds before the first retry (default is 5).
+            max_delay (float): The longest delay in seconds (default is 120).
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.dead = {}
+        self._heap = []
+        self._attempts = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, url, failure):
+        """
+        Records a failed attempt and schedules a retry if the failure is transient.
+
+        Args:
+            url (str): The URL that failed.
+            failure (Failure): Why it failed.
+
+        Returns:
+            bool: Whether the URL will be retried.
+        """
+        with self._lock:
+            attempts = self._attempts.get(url, 0) + 1
+            self._attempts[url] = attempts
+            if not failure.transient or attempts >= self.max_attempts:
+                self.dead[url] = (failure, attempts)
+                return False
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+            heapq.heappush(self._heap, (time.monotonic() + delay, url, failure))
+            return True
+
+    def drain(self, fetch):
+        """
+        Retries every scheduled URL, in due order, until it succeeds or is given up.
+
+        Args:
+            fetch (callable): Called with a URL; returns None on success or a Failure.
+
+        Returns:
+            int: The number of URLs that succeeded on a retry.
+        """
+        recovered = 0
+        while True:
+            with self._lock:
+                if not self._heap:
+                    return recovered
+                due, url, failure = heapq.heappop(self._heap)
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            logger.info(f"Retrying {url} after {failure.kind} failure (attempt {self._attempts[url] + 1}).")
+            failure = fetch(url)
+            if failure is None:
+                recovered += 1
+                with self._lock:
+                    self.dead.pop(url, None)
+            elif not self.add(url, failure):
+                logger.warning(f"Giving up on {url}: {failure.reason}")
+
+
+class DeadLetters:
+    """
+    A CSV file of URLs that failed permanently, with the reason, per stage.
+
+    Later runs can refetch exactly these URLs (see incremental.replay_dead_letters). A URL
+    that succeeds later is removed from the file.
+
+    Attributes:
+        path (str): The CSV file.
+    """
+
+    def __init__(self, path='dead_letter.csv'):
+        """
+        Loads the file if it exists.
+
+        Args:
+            path (str): The CSV file (default is 'dead_letter.csv').
+        """
+        self.path = path
+        self._rows = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    self._rows[(row['stage'], row['url'])] = row
+
+    def record(self, stage, url, failure, attempts):
+        """
+        Adds or updates a permanently failed URL.
+
+        Args:
+            stage (str): 'creator_profile' or 'profile_details'.
+            url (str): The URL.
+            failure (Failure): The last failure.
+            attempts (int): How many times it was tried.
+        """
+        with self._lock:
+            self._rows[(stage, url)] = {'stage': stage, 'url': url, 'kind': failure.kind, 'reason': failure.reason,
+                                        'attempts': attempts, 'failed_at': round(time.time(), 3)}
+
+    def discard(self, stage, url):
+        """
+        Removes a URL that has since succeeded.
+
+        Args:
+            stage (str): The stage name.
+            url (str): The URL.
+        """
+        with self._lock:
+            self._rows.pop((stage, url), None)
+
+    def urls(self, stage, kinds=None):
+        """
+        Returns the dead URLs of a stage.
+
+        Args:
+            stage (str): The stage name.
+            kinds (iterable, optional): Only return failures of these kinds.
+
+        Returns:
+            list: The URLs, oldest failure first.
+        """
+        with self._lock:
+            rows = [row for (row_stage, _), row in self._rows.items()
+                    if row_stage == stage and (kinds is None or row['kind'] in kinds)]
+        return [row['url'] for row in sorted(rows, key=lambda row: float(row['failed_at']))]
+
+    def save(self):
+        """
+        Writes the file, atomically replacing the previous version.
+        """
+        with self._lock:
+            rows = list(self._rows.values())
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=DEAD_LETTER_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(temp_path, self.path)
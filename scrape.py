@@ -1,8 +1,53 @@
 import pandas as pd
-import re
-from time import sleep
-import random
-from DrissionPage import ChromiumPage, ChromiumOptions
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from urllib.parse import urlsplit
+import requests
+from browser import BrowserSettings, acquire_page, new_tab, release_page
+from checkpoint import CheckpointStore
+from discovery import DiscoveryPlanner
+from html_cache import HtmlCache
+from http_fetch import HttpFetcher
+from metrics import METRICS
+from ratelimit import AdaptiveRateLimiter
+from readiness import Readiness, wait_until_ready
+from storage import write_table
+from store import CommunityStore
+from parsers import (CARDS_CLASS, CARD_LINK_CLASS, CARD_CONTENT_CLASS, CARD_META_CLASS, TYPOGRAPHY_CLASS,
+                     PAGINATION_CLASS, PAGINATION_BUTTON_CLASS, parse_card_meta, parse_card_payload,
+                     parse_discovery_cards, parse_last_page_number)
+
+logger = logging.getLogger(__name__)
+
+STAGE = 'discovery'
+
+# Upper bound on simultaneously open tabs, to stay polite towards the site.
+MAX_CONCURRENCY = 8
+
+# Collects every discovery card in one CDP round-trip. Class selectors are matched on the
+# whole attribute value, like DrissionPage's '.<class>' locators.
+DISCOVERY_CARDS_JS = """
+const cardsDiv = document.querySelector(%s);
+if (!cardsDiv) {
+    return null;
+}
+const links = cardsDiv.querySelectorAll(%s);
+return JSON.stringify(Array.from(links, link => {
+    const content = link.querySelector(%s);
+    const name = content && content.querySelector(%s);
+    const meta = content && content.querySelector(%s);
+    return {
+        href: link.getAttribute('href'),
+        content: Boolean(content),
+        name: name ? name.innerText : null,
+        meta: meta ? meta.innerText : null
+    };
+}));
+""" % tuple(json.dumps(f'[class="{class_name}"]') for class_name in
+              (CARDS_CLASS, CARD_LINK_CLASS, CARD_CONTENT_CLASS, TYPOGRAPHY_CLASS, CARD_META_CLASS))
 
 class AgentScraper:
     """
@@ -12,11 +57,30 @@ class AgentScraper:
         base_url (str): The base URL of the website to scrape.
         user_profile (str): The user profile for ChromiumPage.
         waited_time (int): Time to wait between page requests.
+        concurrency (int): Number of browser tabs fetching pages at the same time.
+        backend (str): 'browser' to render pages in Chromium, 'http' to parse the
+            server-rendered HTML and fall back to the browser when that fails, or 'cache'
+            to re-parse pages from the HTML cache without any network access.
+        cache (HtmlCache): The HTML cache that fetched pages are written to, or None.
+        extraction (str): How the browser path reads a rendered page: 'html' grabs page.html
+            once and parses it offline, 'js' collects the cards with one in-page script, and
+            'dom' queries each field through DrissionPage. Pages read with 'js' are not
+            cached, since that would cost a second round-trip for page.html.
+        site_url (str): The site root used to build absolute community URLs.
+        rate_limiter (AdaptiveRateLimiter): Paces page loads across all tabs and adapts to the site's health.
+        metrics (Metrics): The registry the fetch, wait, parse and write timers and the page,
+            card, selector miss and retry counters are reported to.
+        browser_settings (BrowserSettings): How the browser is launched and what its tabs block.
+        readiness (Readiness): Decides when a page loaded in the browser can be parsed.
+        local_port (int): The debugging port of the launched browser, or None for the default.
+        fetcher (HttpFetcher): The HTTP fetcher, or None for the browser backend.
         parsed_info (list): List to store parsed information.
-        page (ChromiumPage): ChromiumPage object for browser interaction.
+        page (ChromiumPage): ChromiumPage object for browser interaction, started on first use.
     """
 
-    def __init__(self, base_url, user_profile, waited_time=5):
+    def __init__(self, base_url, user_profile, waited_time=5, concurrency=1, backend='browser', cache=None,
+                 extraction='html', rate_limiter=None, metrics=None, browser_settings=None,
+                 readiness=None, local_port=None):
         """
         Initializes the scraper with the base URL, user profile, and wait time.
 
@@ -24,16 +88,63 @@ class AgentScraper:
             base_url (str): The base URL of the website.
             user_profile (str): The user profile for ChromiumPage.
             waited_time (int): Time to wait between requests (default is 5).
+            concurrency (int): Number of tabs used to fetch pages in parallel (default is 1).
+                Values above MAX_CONCURRENCY are capped.
+            backend (str): 'browser', 'http' or 'cache' (default is 'browser').
+            cache (HtmlCache, optional): A cache for fetched HTML; required by the 'cache' backend.
+            extraction (str): 'html', 'js' or 'dom' (default is 'html').
+            rate_limiter (AdaptiveRateLimiter, optional): A limiter to share with other scrapers.
+                Defaults to a new limiter starting at one page per `waited_time`.
+            metrics (Metrics, optional): The metrics registry. Defaults to metrics.METRICS.
+            browser_settings (BrowserSettings, optional): Defaults to browser.DEFAULT_SETTINGS.
+            readiness (Readiness, optional): The page readiness waiter. Defaults to a 10 second timeout.
+            local_port (int, optional): A dedicated debugging port, so several scrapers can run
+                separate browsers side by side.
         """
+        if backend not in ('browser', 'http', 'cache'):
+            raise ValueError(f"Unknown backend: {backend}")
+        if extraction not in ('html', 'js', 'dom'):
+            raise ValueError(f"Unknown extraction mode: {extraction}")
         self.base_url = base_url
         self.user_profile = user_profile
         self.waited_time = waited_time
+        self.concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+        self.backend = backend
+        self.cache = cache
+        self.extraction = extraction
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(rate=1 / waited_time)
+        self.metrics = metrics or METRICS
+        self.browser_settings = browser_settings
+        self.readiness = readiness or Readiness()
+        self.local_port = local_port
+        parts = urlsplit(base_url)
+        self.site_url = f'{parts.scheme}://{parts.netloc}'
+        self.fetcher = None
+        if backend != 'browser':
+            self.fetcher = HttpFetcher(pool_size=MAX_CONCURRENCY, cache=cache, offline=backend == 'cache',
+                                       rate_limiter=self.rate_limiter, metrics=self.metrics)
         self.parsed_info = []
-        self.page = self.select_user_return_page(user_profile)
+        self._page = None
+        self._page_lock = threading.RLock()
+        if backend == 'browser':
+            self._page = self.select_user_return_page(user_profile)
+
+    @property
+    def page(self):
+        """
+        Returns the ChromiumPage, starting the browser if it is not running yet.
+
+        Returns:
+            ChromiumPage: The browser page.
+        """
+        with self._page_lock:
+            if self._page is None:
+                self._page = self.select_user_return_page(self.user_profile)
+            return self._page
 
     def select_user_return_page(self, user):
         """
-        Sets up the ChromiumPage with the specified user profile.
+        Returns the shared browser on the scraper's debugging port, starting it with the user profile if needed.
 
         Args:
             user (str): The user profile name.
@@ -41,108 +152,238 @@ class AgentScraper:
         Returns:
             ChromiumPage: The initialized ChromiumPage object.
         """
-        print(f"Initializing ChromiumPage with user profile: {user}")
-        options = ChromiumOptions()
-        options.set_user(user=user)
-        page = ChromiumPage(addr_or_opts=options)
-        page.set.cookies.clear()
-        print("ChromiumPage initialized and cookies cleared.")
-        return page
+        return acquire_page(user, self.local_port, self.browser_settings)
 
-    def get_last_page_number(self):
+    def get_last_page_number(self, url=None):
         """
         Fetches the last page number from the pagination of the website.
 
+        Args:
+            url (str, optional): The first page of the listing. Defaults to the base URL.
+
         Returns:
             int: The number of the last page.
         """
-        print(f"Fetching last page number from {self.base_url}")
-        self.page.get(self.base_url)
-        sleep(random.random() * 3)  # Wait randomly to mimic human interaction
-        print(f"Page loaded: {self.base_url}")
-
-        pagination_div = self.page.ele('.styled__DesktopPaginationControls-sc-4zz1jl-1 iBxcTJ')
-        if pagination_div:
-            print("Pagination div found.")
-            last_page_buttons = pagination_div.eles('.styled__ButtonWrapper-sc-dscagy-1 ikjxol')
-            if last_page_buttons:
-                last_page_button = last_page_buttons[-1]
-                last_page = int(last_page_button.text.strip())
-                print(f"Last page button found with page number: {last_page}")
+        url = url or self.base_url
+        if self.fetcher:
+            try:
+                with self.metrics.time('fetch', stage=STAGE, source='http'):
+                    html = self.fetcher.get_html(url)
+                with self.metrics.time('parse', stage=STAGE, source='http'):
+                    last_page = parse_last_page_number(html)
+                if last_page is not None:
+                    logger.info(f"Last page number fetched over HTTP: {last_page}")
+                    return last_page
+                self.metrics.inc('selector_misses', stage=STAGE, selector='pagination')
+                logger.warning("Pagination not found in HTTP response. Falling back to the browser.")
+            except (requests.RequestException, ValueError) as e:
+                self.metrics.inc('fetch_errors', stage=STAGE, source='http')
+                logger.warning(f"HTTP request failed: {e}. Falling back to the browser.")
+            if self.backend == 'cache':
+                logger.warning("Offline mode. Defaulting to page 1.")
+                return 1
+            self.metrics.inc('retries', stage=STAGE, reason='browser_fallback')
+
+        logger.info(f"Fetching last page number from {url}")
+        self.rate_limiter.acquire()
+        with self.metrics.time('fetch', stage=STAGE, source='browser'):
+            self.page.get(url)
+        logger.debug(f"Page loaded: {url}")
+        wait_until_ready(self.page, self.readiness, self.metrics, STAGE, PAGINATION_CLASS)
+        if self.cache:
+            self.cache.put(url, self.page.html)
+
+        with self.metrics.time('parse', stage=STAGE, source='browser'):
+            pagination_div = self.page.ele(f'.{PAGINATION_CLASS}')
+            if pagination_div:
+                logger.debug("Pagination div found.")
+                last_page_buttons = pagination_div.eles(f'.{PAGINATION_BUTTON_CLASS}')
+                if last_page_buttons:
+                    last_page_button = last_page_buttons[-1]
+                    last_page = int(last_page_button.text.strip())
+                    logger.info(f"Last page button found with page number: {last_page}")
+                else:
+                    logger.warning("No last page button found. Defaulting to page 1.")
+                    last_page = 1
             else:
-                print("No last page button found. Defaulting to page 1.")
+                self.metrics.inc('selector_misses', stage=STAGE, selector='pagination')
+                logger.warning("Pagination div not found. Defaulting to page 1.")
                 last_page = 1
-        else:
-            print("Pagination div not found. Defaulting to page 1.")
-            last_page = 1
 
         return last_page
 
-    def extract_data_from_page(self, url):
+    def extract_data_from_page(self, url, tab=None):
         """
         Extracts data from a single page.
 
+        With the HTTP backend the page is parsed from the server-rendered HTML first,
+        and the browser is only used when that yields no cards.
+
+        Args:
+            url (str): The URL of the page to scrape.
+            tab (ChromiumTab, optional): The tab to load the page in. Defaults to the main page.
+
+        Returns:
+            list: A list of dictionaries containing the extracted data.
+        """
+        if self.fetcher:
+            data = self.extract_data_over_http(url)
+            if data or self.backend == 'cache':
+                return data
+            self.metrics.inc('retries', stage=STAGE, reason='browser_fallback')
+            logger.warning("No cards parsed from HTTP response. Falling back to the browser.")
+
+        if tab is not None:
+            data = self.extract_data_with_browser(url, tab)
+        else:
+            with self._page_lock:
+                data = self.extract_data_with_browser(url, self.page)
+        self.record_outcome(bool(data))
+        return data
+
+    def record_outcome(self, succeeded):
+        """
+        Reports a page result to the rate limiter, which speeds up on success and backs off otherwise.
+
+        Args:
+            succeeded (bool): Whether the page yielded cards.
+        """
+        if succeeded:
+            self.rate_limiter.record_success()
+        else:
+            self.rate_limiter.record_failure()
+
+    def count_page(self, url, data, source):
+        """
+        Counts a parsed page and its cards, or a selector miss when it has none.
+
+        Args:
+            url (str): The page URL.
+            data (list): The cards parsed from the page.
+            source (str): 'http' or 'browser'.
+        """
+        self.metrics.inc('pages', stage=STAGE, source=source)
+        self.metrics.inc('cards', len(data), stage=STAGE)
+        if data:
+            logger.info(f"Parsed {len(data)} cards from {url}")
+        else:
+            self.metrics.inc('selector_misses', stage=STAGE, selector='cards')
+            logger.warning(f"No cards found on {url}")
+
+    def extract_data_over_http(self, url):
+        """
+        Extracts data from a single page without a browser.
+
+        Args:
+            url (str): The URL of the page to scrape.
+
+        Returns:
+            list: A list of dictionaries containing the extracted data, empty on failure.
+        """
+        logger.debug(f"Fetching {url} over HTTP")
+        try:
+            with self.metrics.time('fetch', stage=STAGE, source='http'):
+                html = self.fetcher.get_html(url)
+            with self.metrics.time('parse', stage=STAGE, source='http'):
+                data = [card.to_dict() for card in parse_discovery_cards(html, self.site_url)]
+        except (requests.RequestException, ValueError) as e:
+            self.metrics.inc('fetch_errors', stage=STAGE, source='http')
+            logger.warning(f"HTTP request failed: {e}")
+            data = []
+        else:
+            self.count_page(url, data, 'http')
+        if self.backend == 'http':
+            self.record_outcome(bool(data))
+        return data
+
+    def extract_data_with_browser(self, url, tab):
+        """
+        Extracts data from a single page by rendering it in a browser tab.
+
         Args:
             url (str): The URL of the page to scrape.
+            tab (ChromiumTab): The tab to load the page in.
 
         Returns:
             list: A list of dictionaries containing the extracted data.
         """
-        print(f"Extracting data from {url}")
-        self.page.get(url)
-        sleep(random.random() * 3)  # Wait randomly to mimic human interaction
-        print(f"Page loaded: {url}")
+        logger.debug(f"Extracting data from {url}")
+        self.rate_limiter.acquire()
+        with self.metrics.time('fetch', stage=STAGE, source='browser'):
+            tab.get(url)
+        logger.debug(f"Page loaded: {url}")
+        wait_until_ready(tab, self.readiness, self.metrics, STAGE, CARDS_CLASS)
+
+        if self.extraction == 'html':
+            html = tab.html
+            if self.cache:
+                self.cache.put(url, html)
+            with self.metrics.time('parse', stage=STAGE, source='browser'):
+                data = [card.to_dict() for card in parse_discovery_cards(html, self.site_url)]
+            self.count_page(url, data, 'browser')
+            return data
+
+        if self.extraction == 'js':
+            with self.metrics.time('parse', stage=STAGE, source='browser'):
+                payload = tab.run_js(DISCOVERY_CARDS_JS)
+                data = [] if payload is None else [
+                    card.to_dict() for card in parse_card_payload(json.loads(payload), self.site_url)]
+            self.count_page(url, data, 'browser')
+            return data
+
+        if self.cache:
+            self.cache.put(url, tab.html)
+        with self.metrics.time('parse', stage=STAGE, source='browser'):
+            data = self.extract_cards_from_dom(tab)
+        self.count_page(url, data, 'browser')
+        return data
 
-        cards_div = self.page.ele('.styled__DiscoveryCards-sc-jt9hr-7 lnuLcQ')
+    def extract_cards_from_dom(self, tab):
+        """
+        Extracts the cards of a rendered page by querying each field through DrissionPage.
+
+        Args:
+            tab (ChromiumTab): The tab holding the rendered page.
+
+        Returns:
+            list: A list of dictionaries containing the extracted data.
+        """
+        cards_div = tab.ele(f'.{CARDS_CLASS}')
         if cards_div:
-            print("Cards div found.")
-            links = cards_div.eles('.styled__ChildrenLink-sc-i4j3i6-1 kbNjnr styled__DiscoveryCardLink-sc-13ysp3k-0 eyLtsl')
-            print(f"Found {len(links)} links.")
+            logger.debug("Cards div found.")
+            links = cards_div.eles(f'.{CARD_LINK_CLASS}')
+            logger.debug(f"Found {len(links)} links.")
 
             data = []
             for link in links:
                 href = link.attrs.get('href')
                 if not href:
-                    print("No href found for link. Skipping.")
+                    self.metrics.inc('selector_misses', stage=STAGE, selector='card_link')
+                    logger.debug("No href found for link. Skipping.")
                     continue
 
-                full_url = f'https://www.skool.com{href}'
-                print(f'Processing link: {full_url}')
+                full_url = f'{self.site_url}{href}'
+                logger.debug(f'Processing link: {full_url}')
 
-                content_div = link.ele('.styled__DiscoveryCardContent-sc-13ysp3k-4 cggWfX')
+                content_div = link.ele(f'.{CARD_CONTENT_CLASS}')
                 if content_div:
                     # Extract community name
-                    community_name_div = content_div.ele('.styled__TypographyWrapper-sc-m28jfn-0 eoHmvk')
+                    community_name_div = content_div.ele(f'.{TYPOGRAPHY_CLASS}')
                     community_name = community_name_div.text.strip() if community_name_div else 'N/A'
 
                     # Extract status, members, and price
-                    meta_div = content_div.ele('.styled__DiscoveryCardMeta-sc-13ysp3k-7 jjNZwk')
+                    meta_div = content_div.ele(f'.{CARD_META_CLASS}')
                     status, members, price = 'N/A', 'N/A', 'N/A'
                     if meta_div:
                         text_content = meta_div.text.strip()
-                        print(f'Meta div text: {text_content}\n')
-                        parts = re.split(r'•', text_content)
-                        if len(parts) > 0:
-                            status = parts[0].strip()
-                        if len(parts) > 1:
-                            members = parts[1].strip()
-                            if '.' in members and 'k' in members:
-                                members = float(parts[1].split('kMembers')[0]) * 1000
-                            elif 'k' in members and '.' not in members:
-                                members = int(parts[1].split('kMembers')[0]) * 1000
-                            else:
-                                members = int(parts[1].split('Members')[0])
-                        if len(parts) > 2:
-                            price = parts[2]
-                            if '/month' in price:
-                                price = price.split(' /month')[0]
-                    
-                    print(f'Full URL: {full_url}')
-                    print(f'Community Name: {community_name}')
-                    print(f'Status: {status}')
-                    print(f'Members: {members}')
-                    print(f'Price: {price}')
-                    print("=" * 40)
+                        logger.debug(f'Meta div text: {text_content}')
+                        status, members, price = parse_card_meta(text_content)
+
+                    logger.debug(f'Full URL: {full_url}')
+                    logger.debug(f'Community Name: {community_name}')
+                    logger.debug(f'Status: {status}')
+                    logger.debug(f'Members: {members}')
+                    logger.debug(f'Price: {price}')
 
                     data.append({
                         'Full URL': full_url,
@@ -153,39 +394,154 @@ class AgentScraper:
                     })
 
             return data
-        else:
-            print("Cards div not found.")
         return []
 
-    def scrape_all_pages(self):
+    def scrape_pages_concurrently(self, urls, concurrency, on_page=None, extract=None):
+        """
+        Scrapes the given pages with a bounded pool of browser tabs.
+
+        Each worker borrows a tab from the pool, loads and parses one page, then
+        returns the tab for the next page. Results keep the order of `urls`. With the
+        HTTP backend no tabs are opened; browser fallbacks share the main page.
+
+        Args:
+            urls (list): The page URLs to scrape.
+            concurrency (int): The number of tabs to open.
+            on_page (callable, optional): Called with (url, records) as soon as each page is parsed.
+            extract (callable, optional): Called with (url, tab) to extract a page's records.
+                Defaults to extract_data_from_page.
+
+        Returns:
+            list: One list of extracted records per URL, in input order.
+        """
+        extract = extract or self.extract_data_from_page
+        tabs = Queue()
+        if self.fetcher:
+            logger.info(f"Fetching pages over HTTP with {concurrency} workers.")
+            for _ in range(concurrency):
+                tabs.put(None)
+        else:
+            logger.info(f"Opening {concurrency} tabs for concurrent scraping.")
+            for _ in range(concurrency):
+                tabs.put(new_tab(self.page, self.browser_settings))
+
+        def scrape(url):
+            tab = tabs.get()
+            try:
+                page_data = extract(url, tab)
+                if on_page:
+                    on_page(url, page_data)
+                return page_data
+            finally:
+                tabs.put(tab)
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                return list(executor.map(scrape, urls))
+        finally:
+            while not tabs.empty():
+                tab = tabs.get()
+                if tab is not None:
+                    tab.close()
+
+    def scrape_all_pages(self, concurrency=None, checkpoint=None, output_path='main_content_data.csv', store=None,
+                         planner=None):
         """
         Scrapes data from all pages and saves the results to a CSV file.
+
+        When a checkpoint store is given, each page's cards are recorded as soon as the page
+        is parsed, and pages completed by an earlier, interrupted run are not fetched again.
+        A DiscoveryPlanner replaces the ?p=N pages of the base URL with its planned pages,
+        and communities listed on several of them are kept once.
+
+        Args:
+            concurrency (int, optional): Overrides the number of tabs set on the scraper.
+            checkpoint (CheckpointStore, optional): The progress store used to resume the run.
+            output_path (str): The output CSV or Parquet file (default is 'main_content_data.csv').
+            store (CommunityStore, optional): A SQLite store the cards are also upserted into.
+            planner (DiscoveryPlanner, optional): Plans the pages and extracts each of them.
+
+        Returns:
+            pd.DataFrame: The cards of every page, in page order.
         """
-        print(f"Starting to scrape all pages from {self.base_url}")
-        last_page = self.get_last_page_number()
-        print(f"Total number of pages: {last_page}")
-        all_data = []
+        concurrency = max(1, min(concurrency or self.concurrency, MAX_CONCURRENCY))
+        logger.info(f"Starting to scrape all pages from {self.base_url}")
+        if planner:
+            urls = planner.plan()
+            extract = planner.extract
+        else:
+            last_page = self.get_last_page_number()
+            logger.info(f"Total number of pages: {last_page}")
+            urls = [f'{self.base_url}?p={page_num}' for page_num in range(1, last_page + 1)]
+            extract = self.extract_data_from_page
+        pages = checkpoint.completed() if checkpoint else {}
+        pending_urls = [url for url in urls if url not in pages]
+        if pages:
+            logger.info(f"Resuming: {len(urls) - len(pending_urls)} pages already completed.")
+
+        def record(url, page_data):
+            pages[url] = page_data
+            if checkpoint:
+                if page_data:
+                    checkpoint.mark_done(url, page_data)
+                else:
+                    checkpoint.mark_failed(url, "No cards found")
 
-        for page_num in range(1, last_page + 1):
-            print(f"Scraping page {page_num}...")
-            url = f'{self.base_url}?p={page_num}'
-            page_data = self.extract_data_from_page(url)
-            all_data.extend(page_data)
+        if concurrency > 1 and len(pending_urls) > 1:
+            self.scrape_pages_concurrently(pending_urls, min(concurrency, len(pending_urls)), record, extract)
+        else:
+            for url in pending_urls:
+                logger.info(f"Scraping page {urls.index(url) + 1}...")
+                record(url, extract(url))
+
+        all_data = []
+        for url in urls:
+            all_data.extend(pages.get(url, []))
 
         df = pd.DataFrame(all_data)
-        df.to_csv('main_content_data.csv', index=False, encoding='utf-8-sig')
-        print(f"Data has been extracted and saved to 'main_content_data.csv'.")
+        if planner and not df.empty:
+            count = len(df)
+            df = df.drop_duplicates('Full URL', ignore_index=True)
+            if len(df) < count:
+                logger.info(f"Dropped {count - len(df)} communities listed on more than one page.")
+        with self.metrics.time('write', stage=STAGE, target='file'):
+            write_table(df, output_path, stage='discovery')
+        if store:
+            with self.metrics.time('write', stage=STAGE, target='store'):
+                store.write_stage(df, 'discovery')
+        logger.info(f"Data has been extracted and saved to '{output_path}'.")
+        return df
 
     def close(self):
         """
-        Closes the ChromiumPage and quits the browser.
+        Closes the HTTP session and releases the shared browser if one was started.
         """
-        print("Closing the page.")
-        self.page.quit()
+        if self.fetcher:
+            self.fetcher.close()
+        if self._page is not None:
+            logger.info("Closing the page.")
+            release_page(self._page)
 
 if __name__ == "__main__":
+    log_level = logging.INFO  # logging.DEBUG also logs every page load and parsed card field
+    logging.basicConfig(level=log_level, format='%(message)s')
     base_url = 'https://www.skool.com/discovery'
     user_profile = 'Profile 5'
-    scraper = AgentScraper(base_url=base_url, user_profile=user_profile)
-    scraper.scrape_all_pages()
+    concurrency = 4
+    backend = 'browser'  # 'http' skips Chromium unless a page fails to parse; 'cache' re-parses html_cache offline
+    extraction = 'html'  # 'js' collects cards with one in-page script; 'dom' queries every field through the browser
+    browser_settings = BrowserSettings(headless=False)  # headless=True runs Chromium without a window
+    categories = None  # e.g. ['hobbies', 'money'] splits discovery into partitions fetched in parallel
+    page_size = None  # e.g. 100 asks the listing endpoint of the 'http' backend for bigger pages
+    cache = HtmlCache('html_cache')
+    scraper = AgentScraper(base_url=base_url, user_profile=user_profile, concurrency=concurrency, backend=backend,
+                           cache=cache, extraction=extraction, browser_settings=browser_settings)
+    planner = DiscoveryPlanner(scraper, categories=categories, page_size=page_size)
+    checkpoint = CheckpointStore('crawl_state.db', stage='discovery')
+    store = CommunityStore('communities.db')
+    scraper.scrape_all_pages(checkpoint=checkpoint, store=store, planner=planner)
+    checkpoint.clear()
+    checkpoint.close()
+    store.close()
     scraper.close()
+    METRICS.append_jsonl('metrics.jsonl', stage='discovery')
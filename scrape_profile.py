@@ -1,6 +1,20 @@
-from DrissionPage import ChromiumPage, ChromiumOptions
-import pandas as pd
-import time
+import logging
+from browser import BrowserSettings, acquire_page, release_page
+import requests
+from checkpoint import CheckpointStore
+from html_cache import HtmlCache
+from http_fetch import HttpFetcher
+from metrics import METRICS
+from ratelimit import AdaptiveRateLimiter
+from readiness import Readiness, wait_until_ready
+from retry import SELECTOR_MISSING, DeadLetters, Failure, RetryQueue, classify_error, classify_page
+from storage import read_table, write_table
+from store import CommunityStore
+from parsers import GROUP_INFO_CLASSES, INFO_ITEM_CLASS, LINK_CLASS, parse_creator_profile_href
+
+logger = logging.getLogger(__name__)
+
+STAGE = 'about'
 
 class Scraper:
     """
@@ -9,29 +23,90 @@ class Scraper:
     Attributes:
         base_url (str): The base URL to prepend to profile links.
         user_profile (str): The user profile to be used for the ChromiumPage.
-        waited_time (float): The time to wait between requests.
+        waited_time (float): The initial interval between requests, used to seed the rate limiter.
+        backend (str): 'browser' to render pages in Chromium, 'http' to parse the
+            server-rendered HTML and fall back to the browser when that fails, or 'cache'
+            to re-parse pages from the HTML cache without any network access.
+        cache (HtmlCache): The HTML cache that fetched pages are written to, or None.
+        extraction (str): How the browser path reads a rendered page: 'html' grabs page.html
+            once and parses it offline, 'dom' queries each field through DrissionPage.
+        fetcher (HttpFetcher): The HTTP fetcher, or None for the browser backend.
         parsed_info (list): A list to store parsed information (initially empty).
-        page (ChromiumPage): An instance of the ChromiumPage class.
+        rate_limiter (AdaptiveRateLimiter): Paces requests and adapts to the site's health.
+        local_port (int): The debugging port of the launched browser, or None for the default.
+        metrics (Metrics): The registry the fetch, wait, parse and write timers and the page,
+            selector miss and retry counters are reported to.
+        browser_settings (BrowserSettings): How the browser is launched and what its tabs block.
+        readiness (Readiness): Decides when a page loaded in the browser can be parsed.
+        max_attempts (int): How many times a URL that fails transiently is tried per run.
+        retry_delay (float): Seconds before the first retry of a failed URL; doubles per attempt.
+        failures (dict): The last Failure of each /about URL that failed in this run.
+        page (ChromiumPage): An instance of the ChromiumPage class, started on first use.
     """
     
-    def __init__(self, base_url, user_profile, waited_time=1.5):
+    def __init__(self, base_url, user_profile, waited_time=1.5, backend='browser', cache=None, extraction='html',
+                 local_port=None, rate_limiter=None, metrics=None,
+                 browser_settings=None, readiness=None, max_attempts=3, retry_delay=5.0):
         """
         Initializes the Scraper with base URL, user profile, and wait time.
         
         Args:
             base_url (str): The base URL to prepend to profile links.
             user_profile (str): The user profile to be used for the ChromiumPage.
-            waited_time (float): The time to wait between requests (default is 1.5 seconds).
+            waited_time (float): The initial interval between requests (default is 1.5 seconds).
+            backend (str): 'browser', 'http' or 'cache' (default is 'browser').
+            cache (HtmlCache, optional): A cache for fetched HTML; required by the 'cache' backend.
+            extraction (str): 'html' or 'dom' (default is 'html').
+            local_port (int, optional): A dedicated debugging port, so several scrapers can run
+                separate browsers side by side.
+            rate_limiter (AdaptiveRateLimiter, optional): A limiter to share with other scrapers.
+                Defaults to a new limiter starting at one request per `waited_time`.
+            metrics (Metrics, optional): The metrics registry. Defaults to metrics.METRICS.
+            browser_settings (BrowserSettings, optional): Defaults to browser.DEFAULT_SETTINGS.
+            readiness (Readiness, optional): The page readiness waiter. Defaults to a 10 second timeout.
+            max_attempts (int): Attempts per URL for network errors and blocks (default is 3).
+            retry_delay (float): Seconds before the first retry (default is 5).
         """
+        if backend not in ('browser', 'http', 'cache'):
+            raise ValueError(f"Unknown backend: {backend}")
+        if extraction not in ('html', 'dom'):
+            raise ValueError(f"Unknown extraction mode: {extraction}")
         self.base_url = base_url
         self.user_profile = user_profile
         self.waited_time = waited_time
+        self.backend = backend
+        self.cache = cache
+        self.extraction = extraction
+        self.local_port = local_port
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(rate=1 / waited_time)
+        self.metrics = metrics or METRICS
+        self.browser_settings = browser_settings
+        self.readiness = readiness or Readiness()
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.failures = {}
+        self.fetcher = None
+        if backend != 'browser':
+            self.fetcher = HttpFetcher(cache=cache, offline=backend == 'cache', rate_limiter=self.rate_limiter,
+                                       metrics=self.metrics)
         self.parsed_info = []
-        self.page = self.select_user_return_page(user_profile)
+        self._page = self.select_user_return_page(user_profile) if backend == 'browser' else None
+
+    @property
+    def page(self):
+        """
+        Returns the ChromiumPage, starting the browser if it is not running yet.
+
+        Returns:
+            ChromiumPage: An instance of the ChromiumPage class.
+        """
+        if self._page is None:
+            self._page = self.select_user_return_page(self.user_profile)
+        return self._page
 
     def select_user_return_page(self, user):
         """
-        Sets up the Chromium page with the specified user profile.
+        Returns the shared browser on the scraper's debugging port, starting it with the user profile if needed.
         
         Args:
             user (str): The user profile to be used for the ChromiumPage.
@@ -39,17 +114,7 @@ class Scraper:
         Returns:
             ChromiumPage: An instance of the ChromiumPage class.
         """
-        print(f"Setting up the Chromium page with user profile: {user}")
-        options = ChromiumOptions()
-        # Uncomment the following lines if needed for debugging or headless mode:
-        # options.set_argument('--remote-debugging-port=9222')
-        # options.set_argument('--no-sandbox')
-        # options.set_argument('--headless=new') 
-        options.set_user(user=user)
-        page = ChromiumPage(addr_or_opts=options)
-        page.set.cookies.clear()
-        print("ChromiumPage initialized and cookies cleared.\n")
-        return page
+        return acquire_page(user, self.local_port, self.browser_settings)
 
     def fetch_creator_profile_url(self, index, full_url):
         """
@@ -60,65 +125,200 @@ class Scraper:
             full_url (str): The full URL of the creator's page.
         
         Returns:
-            str: The complete URL to the creator's profile, or None if not found.
+            str: The complete URL to the creator's profile, or None if not found. The reason
+                of a failure is left in `failures`.
         """
         about_url = f"{full_url}/about"
-        print(f"{index}. Fetching URL: {about_url}")
+        logger.info(f"{index}. Fetching URL: {about_url}")
+        self.failures.pop(about_url, None)
 
+        if self.fetcher:
+            try:
+                with self.metrics.time('fetch', stage=STAGE, source='http'):
+                    html = self.fetcher.get_html(about_url)
+                with self.metrics.time('parse', stage=STAGE, source='http'):
+                    href = parse_creator_profile_href(html)
+                self.metrics.inc('pages', stage=STAGE, source='http')
+                if href:
+                    logger.debug(f"Profile HREF: {href}")
+                    self.rate_limiter.record_success()
+                    return f"{self.base_url}{href}"
+                self.failures[about_url] = classify_page(html, 'profile link')
+                self.metrics.inc('selector_misses', stage=STAGE, selector='profile_link')
+                logger.warning("Profile link not found in HTTP response. Falling back to the browser.")
+            except (requests.RequestException, ValueError) as e:
+                self.failures[about_url] = classify_error(e)
+                self.metrics.inc('fetch_errors', stage=STAGE, source='http')
+                logger.warning(f"HTTP request failed: {e}. Falling back to the browser.")
+            if self.backend == 'cache':
+                return None
+            self.rate_limiter.record_failure()
+            self.metrics.inc('retries', stage=STAGE, reason='browser_fallback')
+
+        creator_profile_url = self.fetch_creator_profile_url_with_browser(about_url)
+        if creator_profile_url:
+            self.failures.pop(about_url, None)
+            self.rate_limiter.record_success()
+        else:
+            self.rate_limiter.record_failure()
+        return creator_profile_url
+
+    def fetch_creator_profile_url_with_browser(self, about_url):
+        """
+        Renders a community's /about page in the browser and reads the creator's profile URL.
+
+        Args:
+            about_url (str): The URL of the community's /about page.
+
+        Returns:
+            str: The complete URL to the creator's profile, or None if not found. The reason
+                of a failure is left in `failures`.
+        """
         try:
-            self.page.get(about_url)
-            time.sleep(self.waited_time)
+            self.rate_limiter.acquire()
+            with self.metrics.time('fetch', stage=STAGE, source='browser'):
+                self.page.get(about_url)
+            self.metrics.inc('pages', stage=STAGE, source='browser')
+            wait_until_ready(self.page, self.readiness, self.metrics, STAGE, *GROUP_INFO_CLASSES)
+
+            if self.extraction == 'html':
+                html = self.page.html
+                if self.cache:
+                    self.cache.put(about_url, html)
+                with self.metrics.time('parse', stage=STAGE, source='browser'):
+                    href = parse_creator_profile_href(html)
+                if href:
+                    logger.debug(f"Profile HREF: {href}")
+                    return f"{self.base_url}{href}"
+                self.failures[about_url] = classify_page(html, 'profile link')
+                self.metrics.inc('selector_misses', stage=STAGE, selector='profile_link')
+                logger.warning("Href attribute not found.")
+                return None
 
-            div = self.page.ele('.styled__GroupInfo-sc-ahd4cu-3 gdabfl') or self.page.ele('.styled__GroupInfo-sc-ahd4cu-3 hJcEW')
-            div_parent = div.eles('.styled__InfoItem-sc-ahd4cu-5 bSfAkV')[-1]
-            a_tag = div_parent.ele('.styled__ChildrenLink-sc-i4j3i6-1 kbNjnr')
+            if self.cache:
+                self.cache.put(about_url, self.page.html)
+            with self.metrics.time('parse', stage=STAGE, source='browser'):
+                div = self.page.ele(f'.{GROUP_INFO_CLASSES[0]}') or self.page.ele(f'.{GROUP_INFO_CLASSES[1]}')
+                div_parent = div.eles(f'.{INFO_ITEM_CLASS}')[-1]
+                a_tag = div_parent.ele(f'.{LINK_CLASS}')
             if a_tag:
                 href = a_tag.attrs.get('href')
-                print(f"Profile HREF: {href}")
+                logger.debug(f"Profile HREF: {href}")
                 creator_profile_url = f"{self.base_url}{href}"
                 return creator_profile_url
             else:
-                print("Href attribute not found.")
+                self.failures[about_url] = classify_page(self.page.html, 'profile link')
+                self.metrics.inc('selector_misses', stage=STAGE, selector='profile_link')
+                logger.warning("Href attribute not found.")
                 return None
 
         except Exception as e:
-            print(f"Request failed: {e}")
+            self.failures[about_url] = classify_error(e)
+            self.metrics.inc('fetch_errors', stage=STAGE, source='browser')
+            logger.warning(f"Request failed: {e}")
             return None
 
-    def process_dataframe(self, df):
+    def process_dataframe(self, df, checkpoint=None, output_path='data_with_creator_profiles.csv', store=None,
+                          dead_letters=None):
         """
         Processes the DataFrame to fetch creator profile URLs and saves the updated DataFrame.
+
+        When a checkpoint store is given, each row is recorded as soon as it is fetched and
+        URLs completed by an earlier, interrupted run are not fetched again. URLs that fail with
+        a network error or a block are retried after the other rows, with a jittered backoff;
+        URLs that still fail are recorded in `dead_letters`.
         
         Args:
             df (pd.DataFrame): The DataFrame containing the data with 'Full URL' column.
+            checkpoint (CheckpointStore, optional): The progress store used to resume the run.
+            output_path (str): The output CSV or Parquet file (default is 'data_with_creator_profiles.csv').
+            store (CommunityStore, optional): A SQLite store the rows are also upserted into.
+            dead_letters (DeadLetters, optional): The file permanently failed URLs are written to.
         """
-        creator_profile_urls = []
+        results = {}
+        indices = {}
+        retry_queue = RetryQueue(max_attempts=self.max_attempts, base_delay=self.retry_delay)
+        completed = checkpoint.completed() if checkpoint else {}
+        if completed:
+            logger.info(f"Resuming: {len(completed)} URLs already completed.")
+
+        def fetch(index, full_url):
+            creator_profile_url = self.fetch_creator_profile_url(index, full_url)
+            logger.info(f"Scraped Profile URL: {creator_profile_url}")
+            if creator_profile_url:
+                results[full_url] = creator_profile_url
+                if checkpoint:
+                    checkpoint.mark_done(full_url, creator_profile_url)
+                return None
+            return (self.failures.pop(f"{full_url}/about", None)
+                    or Failure(SELECTOR_MISSING, "Creator profile URL not found"))
 
         for index, row in df.iterrows():
             index += 1
             full_url = row['Full URL']
-            creator_profile_url = self.fetch_creator_profile_url(index, full_url)
-            print(f"Scraped Profile URL: {creator_profile_url}\n")
-            if creator_profile_url:
-                creator_profile_urls.append(creator_profile_url)
-            else:
-                creator_profile_urls.append(None)
-            time.sleep(self.waited_time)
-        
-        df['Creator Profile URL'] = creator_profile_urls
-        df.to_csv('data_with_creator_profiles.csv', index=False, encoding='utf-8-sig')
-        print(f"Creator profile URLs have been saved to 'data_with_creator_profiles.csv'.")
+            if full_url in completed:
+                results[full_url] = completed[full_url]
+                continue
+            if full_url in indices:  # The same community listed twice is fetched once
+                continue
+            indices[full_url] = index
+            failure = fetch(index, full_url)
+            if failure and retry_queue.add(full_url, failure):
+                logger.info(f"Scheduled a retry of {full_url} after a {failure.kind} failure.")
+
+        def retry(full_url):
+            self.metrics.inc('retries', stage=STAGE, reason='retry_queue')
+            return fetch(indices[full_url], full_url)
+
+        if len(retry_queue):
+            logger.info(f"Retrying {len(retry_queue)} URLs that failed transiently.")
+            retry_queue.drain(retry)
+        for full_url, (failure, attempts) in retry_queue.dead.items():
+            self.metrics.inc('dead_letters', stage=STAGE, kind=failure.kind)
+            if checkpoint:
+                checkpoint.mark_failed(full_url, failure.reason)
+            if dead_letters:
+                dead_letters.record('creator_profile', full_url, failure, attempts)
+        if dead_letters:
+            for full_url in results:
+                dead_letters.discard('creator_profile', full_url)
+            dead_letters.save()
+
+        df['Creator Profile URL'] = [results.get(full_url) for full_url in df['Full URL']]
+        with self.metrics.time('write', stage=STAGE, target='file'):
+            write_table(df, output_path, stage='creator_profile')
+        if store:
+            with self.metrics.time('write', stage=STAGE, target='store'):
+                store.write_stage(df, 'creator_profile')
+        logger.info(f"Creator profile URLs have been saved to '{output_path}'.")
 
     def close(self):
         """
-        Closes the ChromiumPage instance to free up resources.
+        Closes the HTTP session and releases the shared browser to free up resources.
         """
-        self.page.quit()
+        if self.fetcher:
+            self.fetcher.close()
+        if self._page is not None:
+            release_page(self._page)
 
 if __name__ == "__main__":
+    log_level = logging.INFO  # logging.DEBUG also logs every parsed profile link
+    logging.basicConfig(level=log_level, format='%(message)s')
     base_url = 'https://www.skool.com'
     user_profile = 'Profile 1'
-    scraper = Scraper(base_url=base_url, user_profile=user_profile)
-    df = pd.read_csv("main_content_data.csv")
-    scraper.process_dataframe(df)
+    backend = 'browser'  # 'http' skips Chromium unless a page fails to parse; 'cache' re-parses html_cache offline
+    extraction = 'html'  # 'dom' queries every field through the browser instead of parsing page.html
+    browser_settings = BrowserSettings(headless=False)  # headless=True runs Chromium without a window
+    cache = HtmlCache('html_cache')
+    scraper = Scraper(base_url=base_url, user_profile=user_profile, backend=backend, cache=cache, extraction=extraction,
+                      browser_settings=browser_settings)
+    checkpoint = CheckpointStore('crawl_state.db', stage='creator_profile')
+    df = read_table("main_content_data.csv")
+    store = CommunityStore('communities.db')
+    dead_letters = DeadLetters('dead_letter.csv')  # incremental.replay_dead_letters refetches these later
+    scraper.process_dataframe(df, checkpoint=checkpoint, store=store, dead_letters=dead_letters)
+    checkpoint.clear()
+    checkpoint.close()
+    store.close()
     scraper.close()
+    METRICS.append_jsonl('metrics.jsonl', stage='creator_profile')
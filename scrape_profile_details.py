@@ -1,6 +1,23 @@
-from DrissionPage import ChromiumPage, ChromiumOptions
-import pandas as pd
-import time
+import logging
+from browser import BrowserSettings, acquire_page, release_page
+import requests
+from checkpoint import CheckpointStore
+from html_cache import HtmlCache
+from http_fetch import HttpFetcher
+from metrics import METRICS
+from ratelimit import AdaptiveRateLimiter
+from readiness import Readiness, wait_until_ready
+from retry import SELECTOR_MISSING, DeadLetters, Failure, RetryQueue, classify_error, classify_page
+from storage import read_table, write_table
+from store import CommunityStore
+from parsers import TYPOGRAPHY_CLASS, SOCIAL_LINKS_CLASS, LINK_CLASS, classify_social_links, parse_profile_details
+
+DETAIL_COLUMNS = ('Followers', 'Contributions', 'Instagram', 'Twitter', 'YouTube', 'Facebook', 'LinkedIn', 'Website')
+EMPTY_DETAILS = (None,) * len(DETAIL_COLUMNS)
+
+logger = logging.getLogger(__name__)
+
+STAGE = 'profile'
 
 class Scraper:
     """
@@ -8,25 +25,95 @@ class Scraper:
     
     Attributes:
         user_profile (str): The user profile to be used for the ChromiumPage.
-        waited_time (float): The time to wait between requests (default is 1.5 seconds).
-        page (ChromiumPage): An instance of the ChromiumPage class.
+        waited_time (float): The initial interval between requests, used to seed the rate limiter.
+        backend (str): 'browser' to render pages in Chromium, 'http' to parse the
+            server-rendered HTML and fall back to the browser when that fails, or 'cache'
+            to re-parse pages from the HTML cache without any network access.
+        cache (HtmlCache): The HTML cache that fetched pages are written to, or None.
+        extraction (str): How the browser path reads a rendered page: 'html' grabs page.html
+            once and parses it offline, 'dom' queries each field through DrissionPage.
+        fetcher (HttpFetcher): The HTTP fetcher, or None for the browser backend.
+        rate_limiter (AdaptiveRateLimiter): Paces requests and adapts to the site's health.
+        local_port (int): The debugging port of the launched browser, or None for the default.
+        memo (CheckpointStore): A persistent store of fetched profiles, shared across runs, or None.
+        memo_ttl (float): How many seconds a profile in `memo` is reused before it is fetched again.
+        metrics (Metrics): The registry the fetch, wait, parse and write timers and the page,
+            selector miss and retry counters are reported to.
+        browser_settings (BrowserSettings): How the browser is launched and what its tabs block.
+        readiness (Readiness): Decides when a page loaded in the browser can be parsed.
+        max_attempts (int): How many times a profile that fails transiently is tried per run.
+        retry_delay (float): Seconds before the first retry of a failed profile; doubles per attempt.
+        failures (dict): The last Failure of each profile URL that failed in this run.
+        page (ChromiumPage): An instance of the ChromiumPage class, started on first use.
     """
     
-    def __init__(self, user_profile, waited_time=1.5):
+    def __init__(self, user_profile, waited_time=1.5, backend='browser', cache=None, extraction='html',
+                 local_port=None, rate_limiter=None, memo=None, memo_ttl=7 * 24 * 3600,
+                 metrics=None, browser_settings=None, readiness=None, max_attempts=3, retry_delay=5.0):
         """
         Initializes the Scraper with user profile and wait time.
         
         Args:
             user_profile (str): The user profile to be used for the ChromiumPage.
-            waited_time (float): The time to wait between requests (default is 1.5 seconds).
+            waited_time (float): The initial interval between requests (default is 1.5 seconds).
+            backend (str): 'browser', 'http' or 'cache' (default is 'browser').
+            cache (HtmlCache, optional): A cache for fetched HTML; required by the 'cache' backend.
+            extraction (str): 'html' or 'dom' (default is 'html').
+            local_port (int, optional): A dedicated debugging port, so several scrapers can run
+                separate browsers side by side.
+            rate_limiter (AdaptiveRateLimiter, optional): A limiter to share with other scrapers.
+                Defaults to a new limiter starting at one request per `waited_time`.
+            memo (CheckpointStore, optional): A persistent profile store that is never cleared, so
+                creators fetched by earlier runs are reused.
+            memo_ttl (float): How long a remembered profile is reused (default is one week).
+            metrics (Metrics, optional): The metrics registry. Defaults to metrics.METRICS.
+            browser_settings (BrowserSettings, optional): Defaults to browser.DEFAULT_SETTINGS.
+            readiness (Readiness, optional): The page readiness waiter. Defaults to a 10 second timeout.
+            max_attempts (int): Attempts per profile for network errors and blocks (default is 3).
+            retry_delay (float): Seconds before the first retry (default is 5).
         """
+        if backend not in ('browser', 'http', 'cache'):
+            raise ValueError(f"Unknown backend: {backend}")
+        if extraction not in ('html', 'dom'):
+            raise ValueError(f"Unknown extraction mode: {extraction}")
         self.user_profile = user_profile
         self.waited_time = waited_time
-        self.page = self.select_user_return_page(user_profile)
+        self.backend = backend
+        self.cache = cache
+        self.extraction = extraction
+        self.local_port = local_port
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(rate=1 / waited_time)
+        self.metrics = metrics or METRICS
+        self.browser_settings = browser_settings
+        self.readiness = readiness or Readiness()
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.failures = {}
+        self.fetcher = None
+        if backend != 'browser':
+            self.fetcher = HttpFetcher(cache=cache, offline=backend == 'cache', rate_limiter=self.rate_limiter,
+                                       metrics=self.metrics)
+        self.memo = memo
+        self.memo_ttl = memo_ttl
+        # Details of every creator looked up in this run, seeded with the still-fresh persistent memo
+        self._details = {url: tuple(details) for url, details in memo.completed(max_age=memo_ttl).items()} if memo else {}
+        self._page = self.select_user_return_page(user_profile) if backend == 'browser' else None
+
+    @property
+    def page(self):
+        """
+        Returns the ChromiumPage, starting the browser if it is not running yet.
+
+        Returns:
+            ChromiumPage: An instance of the ChromiumPage class.
+        """
+        if self._page is None:
+            self._page = self.select_user_return_page(self.user_profile)
+        return self._page
 
     def select_user_return_page(self, user):
         """
-        Sets up the Chromium page with the specified user profile.
+        Returns the shared browser on the scraper's debugging port, starting it with the user profile if needed.
         
         Args:
             user (str): The user profile to be used for the ChromiumPage.
@@ -34,17 +121,7 @@ class Scraper:
         Returns:
             ChromiumPage: An instance of the ChromiumPage class.
         """
-        print(f"Setting up the Chromium page with user profile: {user}")
-        options = ChromiumOptions()
-        # Uncomment the following lines if needed for debugging or headless mode:
-        # options.set_argument('--remote-debugging-port=9222')
-        # options.set_argument('--no-sandbox')
-        # options.set_argument('--headless=new') 
-        options.set_user(user=user)
-        page = ChromiumPage(addr_or_opts=options)
-        page.set.cookies.clear()
-        print("ChromiumPage initialized and cookies cleared.\n")
-        return page
+        return acquire_page(user, self.local_port, self.browser_settings)
 
     def fetch_profile_details(self, index, profile_url):
         """
@@ -56,108 +133,246 @@ class Scraper:
         
         Returns:
             tuple: A tuple containing followers count, contributions count, and social media URLs (Instagram, Twitter, YouTube, Facebook, LinkedIn, Website).
+                The reason of a failure is left in `failures`.
+        """
+        self.failures.pop(profile_url, None)
+        if self.fetcher:
+            try:
+                logger.info(f"{index}. Fetching details over HTTP for: {profile_url}")
+                with self.metrics.time('fetch', stage=STAGE, source='http'):
+                    html = self.fetcher.get_html(profile_url)
+                with self.metrics.time('parse', stage=STAGE, source='http'):
+                    details = parse_profile_details(html)
+                self.metrics.inc('pages', stage=STAGE, source='http')
+                if details.followers is not None:
+                    logger.debug(f"Contributions Count: {details.contributions}")
+                    logger.debug(f"Followers Count: {details.followers}")
+                    self.rate_limiter.record_success()
+                    return details.as_tuple()
+                self.failures[profile_url] = classify_page(html, 'followers count')
+                self.metrics.inc('selector_misses', stage=STAGE, selector='followers')
+                logger.warning("Followers not found in HTTP response. Falling back to the browser.")
+            except (requests.RequestException, ValueError) as e:
+                self.failures[profile_url] = classify_error(e)
+                self.metrics.inc('fetch_errors', stage=STAGE, source='http')
+                logger.warning(f"HTTP request failed: {e}. Falling back to the browser.")
+            if self.backend == 'cache':
+                return None, None, None, None, None, None, None, None
+            if isinstance(profile_url, str):
+                self.rate_limiter.record_failure()
+                self.metrics.inc('retries', stage=STAGE, reason='browser_fallback')
+
+        details = self.fetch_profile_details_with_browser(index, profile_url)
+        if isinstance(profile_url, str):  # Rows without a creator profile say nothing about the site
+            if details[0] is not None:
+                self.failures.pop(profile_url, None)
+                self.rate_limiter.record_success()
+            else:
+                self.rate_limiter.record_failure()
+        return details
+
+    def fetch_profile_details_with_browser(self, index, profile_url):
+        """
+        Renders a creator's profile page in the browser and reads the profile details.
+
+        Args:
+            index (int): The index of the current URL being processed (for logging).
+            profile_url (str): The URL of the creator's profile page.
+
+        Returns:
+            tuple: The followers count, contributions count, and social media URLs, or Nones on failure.
         """
         try:
-            print(f"{index}. Fetching details for: {profile_url}")
-            self.page.get(profile_url)
-            # Uncomment the following line if the delay is needed:
-            # time.sleep(self.waited_time)
+            logger.info(f"{index}. Fetching details for: {profile_url}")
+            self.rate_limiter.acquire()
+            with self.metrics.time('fetch', stage=STAGE, source='browser'):
+                self.page.get(profile_url)
+            self.metrics.inc('pages', stage=STAGE, source='browser')
+            # Profiles without social links settle on network idle instead of waiting for the timeout
+            wait_until_ready(self.page, self.readiness, self.metrics, STAGE, SOCIAL_LINKS_CLASS)
+
+            if self.extraction == 'html':
+                html = self.page.html
+                if self.cache:
+                    self.cache.put(profile_url, html)
+                with self.metrics.time('parse', stage=STAGE, source='browser'):
+                    details = parse_profile_details(html)
+                if details.followers is None:
+                    self.failures[profile_url] = classify_page(html, 'followers count')
+                    self.metrics.inc('selector_misses', stage=STAGE, selector='followers')
+                logger.debug(f"Contributions Count: {details.contributions}")
+                logger.debug(f"Followers Count: {details.followers}")
+                return details.as_tuple()
+
+            if self.cache:
+                self.cache.put(profile_url, self.page.html)
 
             # Fetching followers and contributions count
-            followers_div = self.page.eles('.styled__TypographyWrapper-sc-m28jfn-0 eoHmvk')
-            social_media_div = self.page.ele('.styled__UserSocialLinksWrapper-sc-vbxyw2-0 kILtEf')
+            with self.metrics.time('parse', stage=STAGE, source='browser'):
+                followers_div = self.page.eles(f'.{TYPOGRAPHY_CLASS}')
+                social_media_div = self.page.ele(f'.{SOCIAL_LINKS_CLASS}')
             
             if followers_div:
                 contributions_count = followers_div[0].text
                 followers_count = followers_div[1].text
-                print(f"Contributions Count: {contributions_count}")
-                print(f"Followers Count: {followers_count}")
+                logger.debug(f"Contributions Count: {contributions_count}")
+                logger.debug(f"Followers Count: {followers_count}")
             else:
-                print("Followers div not found.")
+                self.failures[profile_url] = classify_page(self.page.html, 'followers count')
+                self.metrics.inc('selector_misses', stage=STAGE, selector='followers')
+                logger.warning("Followers div not found.")
                 followers_count, contributions_count = None, None
 
             # Initialize social media URLs
             instagram_url = twitter_url = youtube_url = facebook_url = linkedin_url = website_url = None
             
             if social_media_div:
-                a_tags = social_media_div.eles('.styled__ChildrenLink-sc-i4j3i6-1 kbNjnr')
-                for a_tag in a_tags:
-                    href = a_tag.attrs.get('href', '')
-                    if 'instagram.com' in href:
-                        instagram_url = href
-                    elif 'twitter.com' in href or 'x.com' in href:
-                        twitter_url = href
-                    elif 'youtube.com' in href:
-                        youtube_url = href
-                    elif 'facebook.com' in href:
-                        facebook_url = href
-                    elif 'linkedin.com' in href:
-                        linkedin_url = href
-                    else:
-                        website_url = href
+                a_tags = social_media_div.eles(f'.{LINK_CLASS}')
+                hrefs = [a_tag.attrs.get('href', '') for a_tag in a_tags]
+                instagram_url, twitter_url, youtube_url, facebook_url, linkedin_url, website_url = classify_social_links(hrefs)
                 
-                print(f"Instagram: {instagram_url}\nTwitter: {twitter_url}\nYouTube: {youtube_url}\nFacebook: {facebook_url}\nLinkedIn: {linkedin_url}\nWebsite: {website_url}\n")
+                logger.debug(f"Instagram: {instagram_url}\nTwitter: {twitter_url}\nYouTube: {youtube_url}\nFacebook: {facebook_url}\nLinkedIn: {linkedin_url}\nWebsite: {website_url}")
 
             return followers_count, contributions_count, instagram_url, twitter_url, youtube_url, facebook_url, linkedin_url, website_url
 
         except Exception as e:
-            print(f"Request failed: {e}")
+            self.failures[profile_url] = classify_error(e)
+            self.metrics.inc('fetch_errors', stage=STAGE, source='browser')
+            logger.warning(f"Request failed: {e}")
             return None, None, None, None, None, None, None, None
 
-    def process_dataframe(self, df):
+    def lookup_profile_details(self, index, profile_url):
+        """
+        Returns a creator's profile details, fetching each creator at most once.
+
+        Creators already looked up in this run, or remembered in `memo`, are not fetched again.
+        Missing URLs are skipped.
+
+        Args:
+            index (int): The index of the current URL being processed (for logging).
+            profile_url (str): The URL of the creator's profile page, or None/NaN.
+
+        Returns:
+            tuple: The followers count, contributions count, and social media URLs, or Nones.
+        """
+        if not isinstance(profile_url, str) or not profile_url:
+            return EMPTY_DETAILS
+        if profile_url not in self._details:
+            details = tuple(self.fetch_profile_details(index, profile_url))
+            self._details[profile_url] = details
+            if self.memo and details[0] is not None:
+                self.memo.mark_done(profile_url, details)
+        return self._details[profile_url]
+
+    def process_dataframe(self, df, checkpoint=None, output_path='full_data.csv', store=None, dead_letters=None):
         """
         Processes the DataFrame to fetch detailed profile information and saves the updated DataFrame.
+
+        Each distinct creator profile is fetched once and its details are copied to every
+        community row that links to it; rows without a profile URL are left empty. When a
+        checkpoint store is given, each profile is recorded as soon as it is fetched and
+        profiles completed by an earlier, interrupted run are not fetched again. Profiles that fail
+        with a network error or a block are retried after the others, with a jittered backoff;
+        profiles that still fail are recorded in `dead_letters`.
         
         Args:
             df (pd.DataFrame): The DataFrame containing the data with 'Creator Profile URL' column.
+            checkpoint (CheckpointStore, optional): The progress store used to resume the run.
+            output_path (str): The output CSV or Parquet file (default is 'full_data.csv').
+            store (CommunityStore, optional): A SQLite store the rows are also upserted into.
+            dead_letters (DeadLetters, optional): The file permanently failed profile URLs are written to.
         """
-        # Initialize lists to store fetched details
-        followers_counts = []
-        contributions_counts = []
-        instagram_urls = []
-        twitter_urls = []
-        youtube_urls = []
-        facebook_urls = []
-        linkedin_urls = []
-        website_urls = []
-
-        for index, row in df.iterrows():
-            index += 1
-            profile_url = row['Creator Profile URL']
-            followers_count, contributions_count, instagram_url, twitter_url, youtube_url, facebook_url, linkedin_url, website_url = self.fetch_profile_details(index, profile_url)
-            followers_counts.append(followers_count)
-            contributions_counts.append(contributions_count)
-            instagram_urls.append(instagram_url)
-            twitter_urls.append(twitter_url)
-            youtube_urls.append(youtube_url)
-            facebook_urls.append(facebook_url)
-            linkedin_urls.append(linkedin_url)
-            website_urls.append(website_url)
-            time.sleep(self.waited_time)
-        
-        # Add the fetched details to the DataFrame
-        df['Followers'] = followers_counts
-        df['Contributions'] = contributions_counts
-        df['Instagram'] = instagram_urls
-        df['Twitter'] = twitter_urls
-        df['YouTube'] = youtube_urls
-        df['Facebook'] = facebook_urls
-        df['LinkedIn'] = linkedin_urls
-        df['Website'] = website_urls
+        profile_urls = df['Creator Profile URL'].tolist()
+        unique_urls = [url for url in dict.fromkeys(profile_urls) if isinstance(url, str) and url]
+        logger.info(f"{len(unique_urls)} unique creator profiles for {len(profile_urls)} communities.")
+        completed = checkpoint.completed() if checkpoint else {}
+        if completed:
+            logger.info(f"Resuming: {len(completed)} profiles already completed.")
+        for url, details in completed.items():
+            self._details.setdefault(url, tuple(details))
+
+        retry_queue = RetryQueue(max_attempts=self.max_attempts, base_delay=self.retry_delay)
+        succeeded = set()
+        indices = {profile_url: index for index, profile_url in enumerate(unique_urls, 1)}
+
+        def checked(profile_url, details):
+            if details[0] is not None:
+                succeeded.add(profile_url)
+                if checkpoint:
+                    checkpoint.mark_done(profile_url, details)
+                return None
+            return self.failures.pop(profile_url, None) or Failure(SELECTOR_MISSING, "Profile details not found")
+
+        for index, profile_url in enumerate(unique_urls, 1):
+            if profile_url in completed:
+                continue
+            failure = checked(profile_url, self.lookup_profile_details(index, profile_url))
+            if failure and retry_queue.add(profile_url, failure):
+                logger.info(f"Scheduled a retry of {profile_url} after a {failure.kind} failure.")
+
+        def retry(profile_url):
+            self.metrics.inc('retries', stage=STAGE, reason='retry_queue')
+            details = tuple(self.fetch_profile_details(indices[profile_url], profile_url))
+            self._details[profile_url] = details
+            if self.memo and details[0] is not None:
+                self.memo.mark_done(profile_url, details)
+            return checked(profile_url, details)
+
+        if len(retry_queue):
+            logger.info(f"Retrying {len(retry_queue)} profiles that failed transiently.")
+            retry_queue.drain(retry)
+        for profile_url, (failure, attempts) in retry_queue.dead.items():
+            self.metrics.inc('dead_letters', stage=STAGE, kind=failure.kind)
+            if checkpoint:
+                checkpoint.mark_failed(profile_url, failure.reason)
+            if dead_letters:
+                dead_letters.record('profile_details', profile_url, failure, attempts)
+        if dead_letters:
+            for profile_url in succeeded | set(completed):
+                dead_letters.discard('profile_details', profile_url)
+            dead_letters.save()
+
+        # Fan the details out to every community row of the creator
+        rows = [self.lookup_profile_details(index, profile_url) for index, profile_url in enumerate(profile_urls, 1)]
+        for position, column in enumerate(DETAIL_COLUMNS):
+            df[column] = [details[position] for details in rows]
 
         # Save the updated DataFrame to a CSV file
-        df.to_csv('full_data.csv', index=False, encoding='utf-8-sig')
-        print(f"Profile details have been saved to 'full_data.csv'.")
+        with self.metrics.time('write', stage=STAGE, target='file'):
+            write_table(df, output_path, stage='profile_details')
+        if store:
+            with self.metrics.time('write', stage=STAGE, target='store'):
+                store.write_stage(df, 'profile_details')
+        logger.info(f"Profile details have been saved to '{output_path}'.")
 
     def close(self):
         """
-        Closes the ChromiumPage instance to free up resources.
+        Closes the HTTP session and releases the shared browser to free up resources.
         """
-        self.page.quit()
+        if self.fetcher:
+            self.fetcher.close()
+        if self._page is not None:
+            release_page(self._page)
 
 if __name__ == "__main__":
+    log_level = logging.INFO  # logging.DEBUG also logs every parsed profile field
+    logging.basicConfig(level=log_level, format='%(message)s')
     user_profile = 'Profile 1'
-    scraper = Scraper(user_profile=user_profile)
-    df = pd.read_csv("data_with_creator_profiles.csv")
-    scraper.process_dataframe(df)
+    backend = 'browser'  # 'http' skips Chromium unless a page fails to parse; 'cache' re-parses html_cache offline
+    extraction = 'html'  # 'dom' queries every field through the browser instead of parsing page.html
+    browser_settings = BrowserSettings(headless=False)  # headless=True runs Chromium without a window
+    cache = HtmlCache('html_cache')
+    memo = CheckpointStore('crawl_state.db', stage='profile_memo')  # Kept across runs, unlike the checkpoint
+    scraper = Scraper(user_profile=user_profile, backend=backend, cache=cache, extraction=extraction, memo=memo,
+                      browser_settings=browser_settings)
+    checkpoint = CheckpointStore('crawl_state.db', stage='profile_details')
+    df = read_table("data_with_creator_profiles.csv")
+    store = CommunityStore('communities.db')
+    dead_letters = DeadLetters('dead_letter.csv')  # incremental.replay_dead_letters refetches these later
+    scraper.process_dataframe(df, checkpoint=checkpoint, store=store, dead_letters=dead_letters)
+    checkpoint.clear()
+    checkpoint.close()
+    memo.close()
+    store.close()
     scraper.close()
+    METRICS.append_jsonl('metrics.jsonl', stage='profile_details')
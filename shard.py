@@ -0,0 +1,250 @@
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+from checkpoint import CheckpointStore
+from html_cache import HtmlCache
+from metrics import METRICS
+import scrape_profile
+import scrape_profile_details
+from storage import read_table, write_table
+
+logger = logging.getLogger(__name__)
+
+# The input column each shardable stage reads its URLs from.
+STAGE_COLUMNS = {
+    'creator_profile': 'Full URL',
+    'profile_details': 'Creator Profile URL',
+}
+
+
+def split_shards(df, shard_count):
+    """
+    Splits a DataFrame into contiguous, order-preserving shards.
+
+    Args:
+        df (pd.DataFrame): The input rows.
+        shard_count (int): The number of shards to create.
+
+    Returns:
+        list: Up to `shard_count` non-empty DataFrames, in input order.
+    """
+    positions = np.array_split(np.arange(len(df)), max(1, min(shard_count, len(df))))
+    return [df.iloc[indices] for indices in positions if len(indices)]
+
+
+def build_scraper(stage, user_profile, local_port, scraper_kwargs):
+    """
+    Creates the scraper that processes one stage's shard.
+
+    Args:
+        stage (str): 'creator_profile' or 'profile_details'.
+        user_profile (str): The browser profile of the worker.
+        local_port (int): The debugging port of the worker's browser.
+        scraper_kwargs (dict): Extra keyword arguments for the scraper.
+
+    Returns:
+        scrape_profile.Scraper or scrape_profile_details.Scraper: The scraper.
+    """
+    kwargs = dict(scraper_kwargs)
+    cache_directory = kwargs.pop('cache_directory', None)
+    if cache_directory:
+        kwargs['cache'] = HtmlCache(cache_directory)
+    if stage == 'creator_profile':
+        kwargs.setdefault('base_url', 'https://www.skool.com')
+        return scrape_profile.Scraper(user_profile=user_profile, local_port=local_port, **kwargs)
+    return scrape_profile_details.Scraper(user_profile=user_profile, local_port=local_port, **kwargs)
+
+
+def run_shard(stage, shard_path, output_path, user_profile, local_port, checkpoint_path, scraper_kwargs,
+              log_level=logging.INFO):
+    """
+    Worker process entry point: processes one shard and writes its CSV.
+
+    The worker's metrics are appended to 'metrics.jsonl' next to the shard output.
+
+    Args:
+        stage (str): 'creator_profile' or 'profile_details'.
+        shard_path (str): The pickled input shard.
+        output_path (str): The CSV file the shard's results are written to.
+        user_profile (str): The browser profile of the worker.
+        local_port (int): The debugging port of the worker's browser.
+        checkpoint_path (str): The shared progress database, or None.
+        scraper_kwargs (dict): Extra keyword arguments for the scraper.
+        log_level (int): The logging level of the worker (default is logging.INFO).
+    """
+    # Spawned workers do not inherit the coordinator's logging configuration
+    logging.basicConfig(level=log_level, format=f'[shard {os.path.basename(shard_path)}] %(message)s')
+    df = pd.read_pickle(shard_path)
+    scraper = build_scraper(stage, user_profile, local_port, scraper_kwargs)
+    checkpoint = CheckpointStore(checkpoint_path, stage=stage) if checkpoint_path else None
+    try:
+        scraper.process_dataframe(df, checkpoint=checkpoint, output_path=output_path)
+    finally:
+        scraper.close()
+        if checkpoint:
+            checkpoint.close()
+        METRICS.append_jsonl(os.path.join(os.path.dirname(output_path), 'metrics.jsonl'), stage=stage,
+                             shard=os.path.basename(shard_path))
+
+
+class ShardCoordinator:
+    """
+    Splits a stage's input URLs into shards and crawls them in parallel worker processes.
+
+    Every worker slot owns a browser profile and a debugging port, so each worker process runs
+    its own Chromium instance. A worker that crashes, is killed, or exceeds `shard_timeout` only
+    loses its own shard, which is put back on the queue for the next free slot. With a
+    checkpoint database, the retried shard resumes after the last URL the dead worker finished.
+
+    Attributes:
+        stage (str): 'creator_profile' or 'profile_details'.
+        profiles (list): One browser profile name per worker slot.
+        base_port (int): Worker slot i uses debugging port base_port + i.
+        work_dir (str): The directory for shard inputs and outputs.
+        max_attempts (int): How many times a shard is tried before it is given up.
+        shard_timeout (float): Seconds after which a running worker is terminated, or None.
+        checkpoint_path (str): The shared progress database, or None.
+        scraper_kwargs (dict): Extra keyword arguments passed to every worker's scraper.
+    """
+
+    def __init__(self, stage, profiles, base_port=9300, work_dir='shards', max_attempts=3, shard_timeout=None,
+                 checkpoint_path=None, scraper_kwargs=None):
+        """
+        Initializes the coordinator.
+
+        Args:
+            stage (str): 'creator_profile' or 'profile_details'.
+            profiles (list): One browser profile name per worker slot.
+            base_port (int): The first worker's debugging port (default is 9300).
+            work_dir (str): The directory for shard inputs and outputs (default is 'shards').
+            max_attempts (int): How many times a shard is tried (default is 3).
+            shard_timeout (float, optional): Seconds after which a running worker is terminated.
+            checkpoint_path (str, optional): A progress database shared by all workers.
+            scraper_kwargs (dict, optional): Extra keyword arguments for every worker's scraper.
+                Use 'cache_directory' instead of 'cache' to share an HtmlCache.
+        """
+        if stage not in STAGE_COLUMNS:
+            raise ValueError(f"Unknown stage: {stage}")
+        self.stage = stage
+        self.profiles = list(profiles)
+        self.base_port = base_port
+        self.work_dir = work_dir
+        self.max_attempts = max_attempts
+        self.shard_timeout = shard_timeout
+        self.checkpoint_path = checkpoint_path
+        self.scraper_kwargs = scraper_kwargs or {}
+
+    def _start(self, context, shard_index, slot):
+        process = context.Process(
+            target=run_shard,
+            args=(self.stage, self._shard_path(shard_index), self._output_path(shard_index), self.profiles[slot],
+                  self.base_port + slot, self.checkpoint_path, self.scraper_kwargs,
+                  logging.getLogger().getEffectiveLevel()),
+            name=f'{self.stage}-shard-{shard_index}',
+        )
+        process.start()
+        logger.info(f"Shard {shard_index} started on worker {slot} ({self.profiles[slot]}, pid {process.pid}).")
+        return process
+
+    def _shard_path(self, shard_index):
+        return os.path.join(self.work_dir, f'{self.stage}_shard_{shard_index}.pkl')
+
+    def _output_path(self, shard_index):
+        return os.path.join(self.work_dir, f'{self.stage}_shard_{shard_index}.csv')
+
+    def run(self, df, output_path, shard_count=None):
+        """
+        Crawls the DataFrame across the worker slots and merges the shard outputs in input order.
+
+        Each distinct URL is crawled once, in the shard of its first row, and its results are
+        copied to every row with that URL, so a creator behind several communities is fetched
+        once even when those communities are far apart. Rows of shards that fail
+        `max_attempts` times are kept in the output with empty result columns, so the merged
+        file always has one row per input row.
+
+        Args:
+            df (pd.DataFrame): The stage input, containing the stage's URL column.
+            output_path (str): The merged CSV or Parquet file.
+            shard_count (int, optional): The number of shards. Defaults to twice the number of workers.
+
+        Returns:
+            list: The indices of the shards that could not be completed.
+        """
+        column = STAGE_COLUMNS[self.stage]
+        if column not in df.columns:
+            raise KeyError(f"Input has no '{column}' column.")
+        os.makedirs(self.work_dir, exist_ok=True)
+        unique = df.drop_duplicates(column)
+        shards = split_shards(unique, shard_count or 2 * len(self.profiles))
+        for shard_index, shard in enumerate(shards):
+            shard.to_pickle(self._shard_path(shard_index))
+            if os.path.exists(self._output_path(shard_index)):
+                os.remove(self._output_path(shard_index))
+        logger.info(f"Split {len(unique)} distinct URLs of {len(df)} rows into {len(shards)} shards "
+                    f"for {len(self.profiles)} workers.")
+
+        context = multiprocessing.get_context('spawn')
+        queue = deque(range(len(shards)))
+        attempts = [0] * len(shards)
+        free_slots = deque(range(len(self.profiles)))
+        running = {}
+        failed = []
+
+        while queue or running:
+            while queue and free_slots:
+                shard_index, slot = queue.popleft(), free_slots.popleft()
+                attempts[shard_index] += 1
+                running[shard_index] = (self._start(context, shard_index, slot), slot, time.monotonic())
+
+            time.sleep(0.5)
+            for shard_index, (process, slot, started) in list(running.items()):
+                if process.is_alive():
+                    if self.shard_timeout is None or time.monotonic() - started < self.shard_timeout:
+                        continue
+                    logger.warning(f"Shard {shard_index} timed out. Terminating worker {slot}.")
+                    process.terminate()
+                process.join()
+                del running[shard_index]
+                free_slots.append(slot)
+
+                if process.exitcode == 0 and os.path.exists(self._output_path(shard_index)):
+                    logger.info(f"Shard {shard_index} finished.")
+                elif attempts[shard_index] < self.max_attempts:
+                    logger.warning(f"Shard {shard_index} died (exit code {process.exitcode}). Re-queueing.")
+                    queue.append(shard_index)
+                else:
+                    logger.error(f"Shard {shard_index} failed {attempts[shard_index]} times. Giving up.")
+                    failed.append(shard_index)
+
+        parts = []
+        for shard_index, shard in enumerate(shards):
+            if shard_index in failed:
+                parts.append(shard.astype(str).where(shard.notna(), ''))
+            else:
+                parts.append(pd.read_csv(self._output_path(shard_index), dtype=str, keep_default_na=False))
+        merged = pd.concat(parts, ignore_index=True).fillna('')
+        # Fan each URL's results out to all of its rows
+        result_columns = [name for name in merged.columns if name not in df.columns]
+        results = merged.set_index(column)[result_columns]
+        rows = df.astype(str).where(df.notna(), '').reset_index(drop=True)
+        merged = pd.concat([rows, results.reindex(rows[column]).reset_index(drop=True)], axis=1).fillna('')
+        write_table(merged, output_path, stage=self.stage)
+        logger.info(f"Merged {len(shards) - len(failed)} of {len(shards)} shards into '{output_path}'.")
+        return sorted(failed)
+
+
+if __name__ == "__main__":
+    log_level = logging.INFO  # Workers log at the same level; logging.DEBUG also logs every parsed field
+    logging.basicConfig(level=log_level, format='%(message)s')
+    profiles = ['Profile 1', 'Profile 2', 'Profile 3', 'Profile 4']
+    for stage, input_path, output_path in [('creator_profile', 'main_content_data.csv', 'data_with_creator_profiles.csv'),
+                                           ('profile_details', 'data_with_creator_profiles.csv', 'full_data.csv')]:
+        coordinator = ShardCoordinator(stage, profiles, checkpoint_path='crawl_state.db')
+        if not coordinator.run(read_table(input_path), output_path):
+            checkpoint = CheckpointStore('crawl_state.db', stage=stage)
+            checkpoint.clear()
+            checkpoint.close()
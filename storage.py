@@ -0,0 +1,236 @@
+import os
+import pandas as pd
+from preprocessing import transform_count_column
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet support is optional; CSV keeps working without pyarrow
+    pa = pq = None
+
+# Arrow type names used by the stage schemas: 'string', 'category' (a dictionary-encoded
+# string for low-cardinality columns) and 'int' (a nullable 64-bit integer count).
+DISCOVERY_FIELDS = (
+    ('Full URL', 'string'),
+    ('Community Name', 'string'),
+    ('Status', 'category'),
+    ('Members', 'int'),
+    ('Price', 'category'),
+)
+CREATOR_PROFILE_FIELDS = DISCOVERY_FIELDS + (
+    ('Creator Profile URL', 'string'),
+)
+PROFILE_DETAILS_FIELDS = CREATOR_PROFILE_FIELDS + (
+    ('Followers', 'int'),
+    ('Contributions', 'int'),
+    ('Instagram', 'string'),
+    ('Twitter', 'string'),
+    ('YouTube', 'string'),
+    ('Facebook', 'string'),
+    ('LinkedIn', 'string'),
+    ('Website', 'string'),
+)
+STAGE_FIELDS = {
+    'discovery': DISCOVERY_FIELDS,
+    'creator_profile': CREATOR_PROFILE_FIELDS,
+    'profile_details': PROFILE_DETAILS_FIELDS,
+}
+
+
+def _arrow_type(kind):
+    if kind == 'category':
+        return pa.dictionary(pa.int32(), pa.string())
+    if kind == 'int':
+        return pa.int64()
+    return pa.string()
+
+
+def stage_schema(stage, columns=()):
+    """
+    Returns the Arrow schema of a stage's output.
+
+    Args:
+        stage (str): 'discovery', 'creator_profile' or 'profile_details'.
+        columns (iterable): Columns of the table; ones the stage does not declare are stored as strings.
+
+    Returns:
+        pa.Schema: The schema, with the declared fields first.
+    """
+    if stage not in STAGE_FIELDS:
+        raise ValueError(f"Unknown stage: {stage}")
+    fields = [(name, _arrow_type(kind)) for name, kind in STAGE_FIELDS[stage]]
+    declared = {name for name, _ in fields}
+    fields += [(str(column), pa.string()) for column in columns if column not in declared]
+    return pa.schema(fields)
+
+
+def conform(df, stage):
+    """
+    Converts a stage's DataFrame to the column types declared for the stage.
+
+    Counts such as '1.2k', 1200.0 or 'N/A' become nullable integers, low-cardinality text
+    becomes categorical, and everything else becomes text. Declared columns missing from the
+    DataFrame are added empty.
+
+    Args:
+        df (pd.DataFrame): The stage output.
+        stage (str): 'discovery', 'creator_profile' or 'profile_details'.
+
+    Returns:
+        pd.DataFrame: A typed copy, with the declared columns first.
+    """
+    if stage not in STAGE_FIELDS:
+        raise ValueError(f"Unknown stage: {stage}")
+    typed = pd.DataFrame(index=df.index)
+    kinds = dict(STAGE_FIELDS[stage])
+    for name in [name for name, _ in STAGE_FIELDS[stage]] + [column for column in df.columns if column not in kinds]:
+        column = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype='object')
+        kind = kinds.get(name, 'string')
+        if kind == 'int':
+            typed[name] = transform_count_column(column)
+        elif kind == 'category':
+            typed[name] = column.astype('string').astype('category')
+        else:
+            typed[name] = column.astype('string')
+    return typed
+
+
+class CsvStorage:
+    """
+    Stores stage outputs as UTF-8 CSV files with a BOM, as the scripts always have.
+    """
+
+    extension = '.csv'
+
+    def write(self, df, path, stage=None):
+        """
+        Writes a stage's output.
+
+        Args:
+            df (pd.DataFrame): The stage output.
+            path (str): The CSV file.
+            stage (str, optional): The stage name; CSV files are written untyped.
+        """
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+
+    def read(self, path, columns=None, text=False):
+        """
+        Reads a stage's output.
+
+        Args:
+            path (str): The CSV file.
+            columns (list, optional): The columns to load. Defaults to all of them.
+            text (bool): Load every value as it was written, as a string, with '' for missing values.
+
+        Returns:
+            pd.DataFrame: The rows.
+        """
+        if text:
+            return pd.read_csv(path, usecols=columns, dtype=str, keep_default_na=False)
+        return pd.read_csv(path, usecols=columns)
+
+
+class ParquetStorage:
+    """
+    Stores stage outputs as typed Parquet files.
+
+    Every string column is dictionary-encoded in the file, and the low-cardinality columns are
+    declared as Arrow dictionaries, so they load back as pandas categoricals. Reads can load
+    only the columns a stage needs.
+
+    Attributes:
+        compression (str): The Parquet compression codec.
+    """
+
+    extension = '.parquet'
+
+    def __init__(self, compression='zstd'):
+        """
+        Initializes the storage.
+
+        Args:
+            compression (str): The Parquet compression codec (default is 'zstd').
+        """
+        if pa is None:
+            raise ImportError("Parquet storage requires pyarrow. Install it with 'pip install pyarrow'.")
+        self.compression = compression
+
+    def write(self, df, path, stage=None):
+        """
+        Writes a stage's output with the stage's schema.
+
+        Args:
+            df (pd.DataFrame): The stage output.
+            path (str): The Parquet file.
+            stage (str, optional): The stage name. Without it, column types are inferred.
+        """
+        if stage:
+            table = pa.Table.from_pandas(conform(df, stage), schema=stage_schema(stage, df.columns),
+                                         preserve_index=False)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        string_columns = [field.name for field in table.schema
+                          if pa.types.is_string(field.type) or pa.types.is_dictionary(field.type)]
+        pq.write_table(table, path, compression=self.compression, use_dictionary=string_columns)
+
+    def read(self, path, columns=None, text=False):
+        """
+        Reads a stage's output.
+
+        Args:
+            path (str): The Parquet file.
+            columns (list, optional): The columns to load. Defaults to all of them.
+            text (bool): Load every value as a string, with '' for missing values.
+
+        Returns:
+            pd.DataFrame: The rows.
+        """
+        df = pd.read_parquet(path, columns=columns)
+        if text:
+            df = df.astype('string').fillna('').astype(object)
+        return df
+
+
+def storage_for(path):
+    """
+    Picks the storage backend from a file's extension.
+
+    Args:
+        path (str): A '.csv' or '.parquet' file.
+
+    Returns:
+        CsvStorage or ParquetStorage: The storage for the file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ParquetStorage.extension:
+        return ParquetStorage()
+    if extension == CsvStorage.extension:
+        return CsvStorage()
+    raise ValueError(f"Unsupported storage format: {path}")
+
+
+def write_table(df, path, stage=None):
+    """
+    Writes a stage's output in the format given by the file extension.
+
+    Args:
+        df (pd.DataFrame): The stage output.
+        path (str): A '.csv' or '.parquet' file.
+        stage (str, optional): 'discovery', 'creator_profile' or 'profile_details'.
+    """
+    storage_for(path).write(df, path, stage=stage)
+
+
+def read_table(path, columns=None, text=False):
+    """
+    Reads a stage's output in the format given by the file extension.
+
+    Args:
+        path (str): A '.csv' or '.parquet' file.
+        columns (list, optional): The columns to load. Defaults to all of them.
+        text (bool): Load every value as a string, with '' for missing values (default is False).
+
+    Returns:
+        pd.DataFrame: The rows.
+    """
+    return storage_for(path).read(path, columns=columns, text=text)
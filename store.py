@@ -0,0 +1,279 @@
+import logging
+import sqlite3
+import threading
+import time
+import pandas as pd
+from preprocessing import transform_count_column, transform_price_column
+
+logger = logging.getLogger(__name__)
+
+SOCIAL_PLATFORMS = ('Instagram', 'Twitter', 'YouTube', 'Facebook', 'LinkedIn', 'Website')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS communities (
+    url TEXT PRIMARY KEY,
+    name TEXT,
+    status TEXT,
+    members INTEGER,
+    price TEXT,
+    monthly_price REAL,
+    creator_profile_url TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS communities_creator ON communities (creator_profile_url);
+CREATE INDEX IF NOT EXISTS communities_price ON communities (monthly_price, members);
+CREATE INDEX IF NOT EXISTS communities_members ON communities (members);
+
+CREATE TABLE IF NOT EXISTS creators (
+    profile_url TEXT PRIMARY KEY,
+    followers INTEGER,
+    contributions INTEGER,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS social_links (
+    profile_url TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (profile_url, platform)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS social_links_platform ON social_links (platform, profile_url);
+
+CREATE VIEW IF NOT EXISTS main_content_data AS
+SELECT url AS "Full URL", name AS "Community Name", status AS "Status", members AS "Members", price AS "Price"
+FROM communities;
+
+CREATE VIEW IF NOT EXISTS data_with_creator_profiles AS
+SELECT url AS "Full URL", name AS "Community Name", status AS "Status", members AS "Members", price AS "Price",
+       creator_profile_url AS "Creator Profile URL"
+FROM communities;
+
+CREATE VIEW IF NOT EXISTS full_data AS
+SELECT c.url AS "Full URL", c.name AS "Community Name", c.status AS "Status", c.members AS "Members",
+       c.price AS "Price", c.creator_profile_url AS "Creator Profile URL",
+       p.followers AS "Followers", p.contributions AS "Contributions",
+       (SELECT url FROM social_links WHERE profile_url = c.creator_profile_url AND platform = 'Instagram') AS "Instagram",
+       (SELECT url FROM social_links WHERE profile_url = c.creator_profile_url AND platform = 'Twitter') AS "Twitter",
+       (SELECT url FROM social_links WHERE profile_url = c.creator_profile_url AND platform = 'YouTube') AS "YouTube",
+       (SELECT url FROM social_links WHERE profile_url = c.creator_profile_url AND platform = 'Facebook') AS "Facebook",
+       (SELECT url FROM social_links WHERE profile_url = c.creator_profile_url AND platform = 'LinkedIn') AS "LinkedIn",
+       (SELECT url FROM social_links WHERE profile_url = c.creator_profile_url AND platform = 'Website') AS "Website"
+FROM communities c LEFT JOIN creators p ON p.profile_url = c.creator_profile_url;
+'''
+
+# Paid communities above a member count whose creator links a given platform. SQLite walks the
+# social_links_platform index for the platform's links, looks up each creator's communities through
+# communities_creator, filters them on price and members, and sorts the matches in a temporary b-tree.
+PAID_COMMUNITIES_WITH_LINK_SQL = '''
+SELECT c.url, c.name, c.members, c.price, c.creator_profile_url, s.url AS link
+FROM communities c
+JOIN social_links s ON s.profile_url = c.creator_profile_url AND s.platform = ?
+WHERE c.monthly_price > 0 AND c.members > ?
+ORDER BY c.members DESC
+'''
+
+
+def _values(series):
+    # Converts pandas missing values to None for sqlite3
+    return series.astype(object).where(series.notna(), None)
+
+
+class CommunityStore:
+    """
+    An embedded SQLite store of communities, creators and their social links.
+
+    All three scrapers can write their stage output here. Rows are upserted by URL in batched
+    transactions, so re-running a stage updates rows in place. The main_content_data,
+    data_with_creator_profiles and full_data views have the same columns as the CSV files of
+    the same names, and export_csv writes them out.
+
+    Attributes:
+        path (str): The path to the SQLite database file.
+        batch_size (int): The number of rows written per transaction.
+    """
+
+    def __init__(self, path='communities.db', batch_size=1000):
+        """
+        Opens (or creates) the store.
+
+        Args:
+            path (str): The path to the SQLite database file (default is 'communities.db').
+            batch_size (int): The number of rows written per transaction (default is 1000).
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def _write_batches(self, sql, rows):
+        rows = list(rows)
+        with self._lock:
+            for start in range(0, len(rows), self.batch_size):
+                with self._conn:  # One transaction per batch
+                    self._conn.executemany(sql, rows[start:start + self.batch_size])
+        return len(rows)
+
+    def upsert_communities(self, df):
+        """
+        Inserts or updates communities from a discovery or creator profile DataFrame.
+
+        Args:
+            df (pd.DataFrame): Rows with 'Full URL', 'Community Name', 'Status', 'Members' and
+                'Price', and optionally 'Creator Profile URL'.
+
+        Returns:
+            int: The number of rows written.
+        """
+        prices, monthly_prices = transform_price_column(df['Price'])
+        columns = [_values(df['Full URL']), _values(df['Community Name']), _values(df['Status']),
+                   _values(transform_count_column(df['Members'])), _values(prices), _values(monthly_prices),
+                   [time.time()] * len(df)]
+        names = ['url', 'name', 'status', 'members', 'price', 'monthly_price', 'updated_at']
+        if 'Creator Profile URL' in df.columns:
+            columns.append(_values(df['Creator Profile URL']))
+            names.append('creator_profile_url')
+        updates = ', '.join(f'{name} = excluded.{name}' for name in names[1:])
+        return self._write_batches(
+            f'INSERT INTO communities ({", ".join(names)}) VALUES ({", ".join("?" * len(names))}) '
+            f'ON CONFLICT (url) DO UPDATE SET {updates}',
+            zip(*columns)
+        )
+
+    def upsert_creators(self, df):
+        """
+        Inserts or updates creators and their social links from a profile details DataFrame.
+
+        A creator's links are replaced by the ones on its latest profile.
+
+        Args:
+            df (pd.DataFrame): Rows with 'Creator Profile URL', 'Followers', 'Contributions'
+                and one column per platform in SOCIAL_PLATFORMS.
+
+        Returns:
+            int: The number of creators written.
+        """
+        df = df[df['Creator Profile URL'].notna()].drop_duplicates('Creator Profile URL', keep='last')
+        creators = list(zip(_values(df['Creator Profile URL']), _values(transform_count_column(df['Followers'])),
+                            _values(transform_count_column(df['Contributions'])), [time.time()] * len(df)))
+        links = [
+            [(profile_url, platform, url) for platform, url in zip(SOCIAL_PLATFORMS, urls) if url]
+            for profile_url, urls in zip(_values(df['Creator Profile URL']),
+                                         zip(*(_values(df[platform]) for platform in SOCIAL_PLATFORMS)))
+        ]
+        with self._lock:
+            for start in range(0, len(creators), self.batch_size):
+                batch = creators[start:start + self.batch_size]
+                with self._conn:  # A creator and its links change in the same transaction
+                    self._conn.executemany(
+                        'INSERT INTO creators (profile_url, followers, contributions, updated_at) VALUES (?, ?, ?, ?) '
+                        'ON CONFLICT (profile_url) DO UPDATE SET followers = excluded.followers, '
+                        'contributions = excluded.contributions, updated_at = excluded.updated_at',
+                        batch
+                    )
+                    self._conn.executemany('DELETE FROM social_links WHERE profile_url = ?',
+                                           [(creator[0],) for creator in batch])
+                    self._conn.executemany(
+                        'INSERT INTO social_links (profile_url, platform, url) VALUES (?, ?, ?)',
+                        [link for creator_links in links[start:start + self.batch_size] for link in creator_links]
+                    )
+        return len(creators)
+
+    def write_stage(self, df, stage):
+        """
+        Writes a stage's output DataFrame to the store.
+
+        Args:
+            df (pd.DataFrame): The stage output.
+            stage (str): 'discovery', 'creator_profile' or 'profile_details'.
+        """
+        if stage not in ('discovery', 'creator_profile', 'profile_details'):
+            raise ValueError(f"Unknown stage: {stage}")
+        if df.empty:
+            logger.warning(f"No rows of stage '{stage}' to store.")
+            return
+        if stage == 'discovery':
+            count = self.upsert_communities(df)
+        elif stage == 'creator_profile':
+            count = self.upsert_communities(df)
+        else:
+            self.upsert_communities(df)
+            count = self.upsert_creators(df)
+        logger.info(f"Stored {count} rows of stage '{stage}' in '{self.path}'.")
+
+    def query(self, sql, params=()):
+        """
+        Runs a read-only query.
+
+        Args:
+            sql (str): The SQL query.
+            params (tuple): The query parameters.
+
+        Returns:
+            pd.DataFrame: The result rows.
+        """
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def explain(self, sql, params=()):
+        """
+        Returns SQLite's query plan, to check that a query uses the indexes.
+
+        Args:
+            sql (str): The SQL query.
+            params (tuple): The query parameters.
+
+        Returns:
+            list: The plan steps, e.g. 'SEARCH c USING INDEX communities_price (monthly_price>?)'.
+        """
+        with self._lock:
+            return [row[3] for row in self._conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+    def paid_communities_with_link(self, min_members=10_000, platform='YouTube'):
+        """
+        Finds paid communities above a member count whose creator links a given platform.
+
+        Args:
+            min_members (int): The member count to exceed (default is 10,000).
+            platform (str): One of SOCIAL_PLATFORMS (default is 'YouTube').
+
+        Returns:
+            pd.DataFrame: The matching communities with the creator's link, largest first.
+        """
+        return self.query(PAID_COMMUNITIES_WITH_LINK_SQL, (platform, min_members))
+
+    def export_csv(self, view, path):
+        """
+        Writes one of the CSV views to a file.
+
+        Args:
+            view (str): 'main_content_data', 'data_with_creator_profiles' or 'full_data'.
+            path (str): The CSV file.
+        """
+        if view not in ('main_content_data', 'data_with_creator_profiles', 'full_data'):
+            raise ValueError(f"Unknown view: {view}")
+        df = self.query(f'SELECT * FROM {view}')
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        logger.info(f"Exported {len(df)} rows of '{view}' to '{path}'.")
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    # Loads the latest stage outputs into the store and runs the example query.
+    store = CommunityStore('communities.db')
+    store.write_stage(pd.read_csv('main_content_data.csv', dtype=str), 'discovery')
+    store.write_stage(pd.read_csv('full_data.csv', dtype=str), 'profile_details')
+    print(store.explain(PAID_COMMUNITIES_WITH_LINK_SQL, ('YouTube', 10_000)))
+    print(store.paid_communities_with_link(min_members=10_000, platform='YouTube'))
+    store.export_csv('full_data', 'full_data_export.csv')
+    store.close()
@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, 'benchmarks'))
+
+from replay_server import ReplayServer
+
+
+@pytest.fixture
+def replay_server():
+    """
+    Serves 3 synthetic discovery pages of 10 cards, with the listing endpoint under build 'test-build'.
+    """
+    server = ReplayServer(cards=10, pages=3, build_id='test-build').start()
+    yield server
+    server.stop()
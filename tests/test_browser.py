@@ -0,0 +1,42 @@
+import pytest
+import browser
+
+
+class FakePage:
+    def __init__(self, addr_or_opts):
+        self.address = addr_or_opts.address
+        self.quits = 0
+
+    def run_cdp(self, command, **params):
+        pass
+
+    def quit(self):
+        self.quits += 1
+
+
+@pytest.fixture(autouse=True)
+def fake_browsers(monkeypatch):
+    monkeypatch.setattr(browser, 'ChromiumPage', FakePage)
+    monkeypatch.setattr(browser, '_browsers', {})
+
+
+def test_scrapers_on_the_default_port_share_one_browser_until_the_last_release():
+    first = browser.acquire_page('Profile 1')
+    second = browser.acquire_page('Profile 2')  # Same port, so DrissionPage would attach to the same browser
+
+    assert second is first
+    browser.release_page(first)
+    assert first.quits == 0  # Still used by the second scraper
+    browser.release_page(second)
+    assert first.quits == 1
+
+
+def test_scrapers_on_their_own_ports_get_their_own_browsers():
+    first = browser.acquire_page('Profile 1', local_port=9301)
+    second = browser.acquire_page('Profile 2', local_port=9302)
+
+    assert second is not first
+    assert (first.address, second.address) == ('127.0.0.1:9301', '127.0.0.1:9302')
+    browser.release_page(first)
+    assert (first.quits, second.quits) == (1, 0)
+    browser.release_page(second)
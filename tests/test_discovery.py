@@ -0,0 +1,134 @@
+import pytest
+from discovery import DiscoveryPlanner, Partition, data_url, with_query
+from fixtures import discovery_page_html
+from html_cache import HtmlCache
+from metrics import Metrics
+from parsers import PAGINATION_BUTTON_CLASS, PAGINATION_CLASS, parse_discovery_cards
+from ratelimit import AdaptiveRateLimiter
+from scrape import AgentScraper
+
+
+@pytest.fixture
+def scraper(replay_server):
+    scraper = AgentScraper(base_url=f'{replay_server.url}/discovery', user_profile='test', backend='http',
+                           concurrency=4, rate_limiter=AdaptiveRateLimiter(rate=1000, max_rate=1000),
+                           metrics=Metrics())
+    yield scraper
+    scraper.close()
+
+
+def html_cards(server, page, category=None):
+    html = discovery_page_html(server.cards, page, server.pages, category)
+    return [card.to_dict() for card in parse_discovery_cards(html, server.url)]
+
+
+def extract_all(planner):
+    return [card for url in planner.plan() for card in planner.extract(url)]
+
+
+def test_with_query_and_data_url():
+    assert with_query('https://x.test/discovery', c='a', p=2, limit=None) == 'https://x.test/discovery?c=a&p=2'
+    assert with_query('https://x.test/discovery?p=1', p=3) == 'https://x.test/discovery?p=3'
+    assert data_url('https://x.test/discovery?p=2', 'b1') == 'https://x.test/_next/data/b1/discovery.json?p=2'
+    assert Partition('https://x.test/discovery?c=a', page_size=50).page_url(2) == \
+        'https://x.test/discovery?c=a&p=2&limit=50'
+
+
+def test_plan_probes_each_partition_once(replay_server, scraper):
+    planner = DiscoveryPlanner(scraper)
+    urls = planner.plan()
+
+    assert urls == [f'{replay_server.url}/discovery?p={n}' for n in (1, 2, 3)]
+    assert planner.partitions[0].build_id == 'test-build'
+    assert planner.plan() == urls
+    assert replay_server.requests == 1
+
+
+def test_extract_reads_later_pages_from_the_listing_endpoint(replay_server, scraper):
+    planner = DiscoveryPlanner(scraper)
+    cards = extract_all(planner)
+
+    assert cards == [card for page in (1, 2, 3) for card in html_cards(replay_server, page)]
+    assert replay_server.requests == 3  # The probe, then pages 2 and 3 from the endpoint
+    counters = scraper.metrics.snapshot()['counters']
+    assert counters['pages{source="api",stage="discovery"}'] == 2
+    assert counters['pages{source="http",stage="discovery"}'] == 1
+
+
+def test_page_size_probe_uses_larger_endpoint_pages(replay_server, scraper):
+    planner = DiscoveryPlanner(scraper, page_size=15)
+    urls = planner.plan()
+    cards = extract_all(planner)
+
+    assert urls == [f'{replay_server.url}/discovery?p={n}&limit=15' for n in (1, 2)]
+    assert sorted(card['Full URL'] for card in cards) == sorted(
+        card['Full URL'] for page in (1, 2, 3) for card in html_cards(replay_server, page))
+    assert replay_server.requests == 3  # The probe, the resized page 1, and page 2
+
+
+def test_page_size_not_larger_than_html_pages_is_ignored(replay_server, scraper):
+    planner = DiscoveryPlanner(scraper, page_size=5)
+
+    assert len(planner.plan()) == 3
+    assert planner.partitions[0].page_size is None
+
+
+def test_categories_are_planned_as_separate_partitions(replay_server, scraper):
+    planner = DiscoveryPlanner(scraper, categories=['a', 'b'])
+    urls = planner.plan()
+    cards = extract_all(planner)
+
+    assert urls == [f'{replay_server.url}/discovery?c={c}&p={n}' for c in ('a', 'b') for n in (1, 2, 3)]
+    assert cards == [card for c in ('a', 'b') for page in (1, 2, 3) for card in html_cards(replay_server, page, c)]
+
+
+def test_retired_build_id_falls_back_to_html(replay_server, scraper):
+    planner = DiscoveryPlanner(scraper)
+    planner.plan()
+    replay_server.build_id = 'new-build'  # The site was redeployed after the probe
+    cards = extract_all(planner)
+
+    assert cards == [card for page in (1, 2, 3) for card in html_cards(replay_server, page)]
+    assert planner.partitions[0].build_id is None
+    counters = scraper.metrics.snapshot()['counters']
+    assert counters['fetch_errors{source="api",stage="discovery"}'] == 1
+    assert counters['retries{reason="html_fallback",stage="discovery"}'] == 1
+
+
+def test_data_api_disabled_reads_html_pages(replay_server, scraper):
+    planner = DiscoveryPlanner(scraper, data_api=False)
+    cards = extract_all(planner)
+
+    assert planner.partitions[0].build_id is None
+    assert cards == [card for page in (1, 2, 3) for card in html_cards(replay_server, page)]
+    assert 'pages{source="api",stage="discovery"}' not in scraper.metrics.snapshot()['counters']
+
+
+def test_scrape_all_pages_keeps_overlapping_communities_once(replay_server, scraper, tmp_path):
+    render = replay_server.render
+    # Both categories list the same communities
+    replay_server.render = lambda path, query: render(
+        path, '&'.join(param for param in query.split('&') if not param.startswith('c=')))
+    planner = DiscoveryPlanner(scraper, categories=['a', 'b'])
+    df = scraper.scrape_all_pages(output_path=str(tmp_path / 'main_content_data.csv'), planner=planner)
+
+    assert len(planner.plan()) == 6
+    assert len(df) == 30
+    assert df['Full URL'].is_unique
+    assert (tmp_path / 'main_content_data.csv').exists()
+
+
+def test_a_malformed_first_page_only_affects_its_own_partition(tmp_path):
+    cache = HtmlCache(str(tmp_path / 'cache'))
+    # The last pagination button is not a number
+    cache.put('https://s.test/discovery', f'<div class="{PAGINATION_CLASS}">'
+                                          f'<button class="{PAGINATION_BUTTON_CLASS}">Next</button></div>')
+    cache.put('https://s.test/discovery?c=a', discovery_page_html(cards=5, last_page=2, category='a'))
+    scraper = AgentScraper(base_url='https://s.test/discovery', user_profile='test', backend='cache', cache=cache,
+                           metrics=Metrics())
+    planner = DiscoveryPlanner(scraper, categories=[None, 'a'])
+
+    assert planner.plan() == ['https://s.test/discovery?p=1', 'https://s.test/discovery?c=a&p=1',
+                              'https://s.test/discovery?c=a&p=2']
+    assert planner.extract('https://s.test/discovery?c=a&p=1')  # Kept from the probe
+    scraper.close()
@@ -0,0 +1,52 @@
+import os
+import time
+from html_cache import HtmlCache
+
+
+def page(seed):
+    return f'<html>{os.urandom(1000).hex()}{seed}</html>'  # Incompressible, so every entry has about the same size
+
+
+def test_get_returns_what_was_put(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put('https://x.test/a', '<html>a</html>')
+
+    assert cache.get('https://x.test/a') == '<html>a</html>'
+    assert cache.get('https://x.test/b') is None
+
+
+def test_stale_entries_are_only_served_with_ignore_ttl(tmp_path, monkeypatch):
+    cache = HtmlCache(str(tmp_path), ttl=60)
+    cache.put('https://x.test/a', '<html>a</html>')
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+
+    assert cache.get('https://x.test/a') is None
+    assert cache.get('https://x.test/a', ignore_ttl=True) == '<html>a</html>'
+
+
+def test_least_recently_used_entry_is_evicted_first(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put('https://x.test/a', page('a'))
+    cache.put('https://x.test/b', page('b'))
+    os.utime(cache._path('https://x.test/a'), (1000, 1000))
+    os.utime(cache._path('https://x.test/b'), (2000, 2000))
+    cache.get('https://x.test/a')  # A hit makes 'a' the most recently used entry
+    cache.max_bytes = cache.size() + 100
+
+    cache.put('https://x.test/c', page('c'))
+
+    assert cache.get('https://x.test/b') is None
+    assert cache.get('https://x.test/a') is not None
+    assert cache.get('https://x.test/c') is not None
+    assert cache.size() <= cache.max_bytes
+    assert cache.size() == sum(entry.stat().st_size for entry in os.scandir(tmp_path))
+
+
+def test_overwriting_an_entry_keeps_the_size_accurate(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put('https://x.test/a', page('a'))
+    cache.put('https://x.test/a', page('a'))
+
+    assert cache.size() == sum(entry.stat().st_size for entry in os.scandir(tmp_path))
+    assert HtmlCache(str(tmp_path)).size() == cache.size()
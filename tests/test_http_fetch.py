@@ -0,0 +1,55 @@
+import pytest
+import requests
+from html_cache import HtmlCache
+from http_fetch import CacheMissError, HttpFetcher
+from metrics import Metrics
+from parsers import parse_discovery_cards
+
+
+def test_get_html_returns_server_rendered_page(replay_server):
+    fetcher = HttpFetcher()
+    html = fetcher.get_html(f'{replay_server.url}/discovery?p=2')
+    fetcher.close()
+
+    cards = parse_discovery_cards(html, replay_server.url)
+    assert len(cards) == 10
+    assert cards[0].full_url == f'{replay_server.url}/community-2-0'
+
+
+def test_get_html_raises_on_error_status(replay_server):
+    metrics = Metrics()
+    fetcher = HttpFetcher(metrics=metrics)
+    with pytest.raises(requests.HTTPError):
+        fetcher.get_html(f'{replay_server.url}/discovery?p=4')
+    fetcher.close()
+
+    assert metrics.snapshot()['counters'] == {'http_responses{status="404"}': 1}
+
+
+def test_cached_page_is_not_fetched_again(replay_server, tmp_path):
+    metrics = Metrics()
+    fetcher = HttpFetcher(cache=HtmlCache(str(tmp_path)), metrics=metrics)
+    url = f'{replay_server.url}/discovery?p=1'
+    first = fetcher.get_html(url)
+    second = fetcher.get_html(url)
+    fetcher.close()
+
+    assert first == second
+    assert replay_server.requests == 1
+    assert metrics.snapshot()['counters']['cache_hits{}'] == 1
+
+
+def test_offline_fetcher_serves_only_the_cache(replay_server, tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put(f'{replay_server.url}/discovery?p=1', '<html>cached</html>')
+    fetcher = HttpFetcher(cache=cache, offline=True)
+
+    assert fetcher.get_html(f'{replay_server.url}/discovery?p=1') == '<html>cached</html>'
+    with pytest.raises(CacheMissError):
+        fetcher.get_html(f'{replay_server.url}/discovery?p=2')
+    assert replay_server.requests == 0
+
+
+def test_offline_fetcher_needs_a_cache():
+    with pytest.raises(ValueError):
+        HttpFetcher(offline=True)
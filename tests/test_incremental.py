@@ -0,0 +1,71 @@
+import pandas as pd
+from incremental import PROFILE_URL_COLUMNS, CommunityIndex, merge_results, read_output
+
+
+def card(slug, members=100, price='$49'):
+    return {'Full URL': f'https://s.test/{slug}', 'Community Name': slug.title(), 'Status': 'Private',
+            'Members': members, 'Price': price}
+
+
+def test_diff_returns_new_and_changed_communities(tmp_path):
+    index = CommunityIndex(str(tmp_path / 'state.db'))
+    index.record([card('a'), card('b'), card('c')], seen_at=1000)
+
+    delta = index.diff([card('a'), card('b', members=200), card('c', price='Free'), card('d')])
+
+    assert [record['Full URL'] for record in delta] == ['https://s.test/b', 'https://s.test/c', 'https://s.test/d']
+    assert index.get('https://s.test/b')['Members'] == '100'  # diff() leaves the index alone
+    index.close()
+
+
+def test_record_only_moves_last_changed_on_a_change(tmp_path):
+    index = CommunityIndex(str(tmp_path / 'state.db'))
+    index.record([card('a'), card('b')], seen_at=1000)
+    index.record([card('a'), card('b', members=200)], seen_at=2000)
+
+    assert index.get('https://s.test/a') == {'Community Name': 'A', 'Status': 'Private', 'Members': '100',
+                                             'Price': '$49', 'First Seen': 1000, 'Last Seen': 2000,
+                                             'Last Changed': 1000}
+    assert index.get('https://s.test/b')['Last Changed'] == 2000
+    assert index.get('https://s.test/missing') is None
+    index.close()
+
+
+def test_merge_results_keeps_unchanged_rows_and_drops_delisted_ones(tmp_path):
+    listing = pd.DataFrame([card('a'), card('b', members=200), card('c')]).astype(str)
+    previous = pd.DataFrame({'Full URL': ['https://s.test/a', 'https://s.test/b', 'https://s.test/gone'],
+                             'Community Name': ['A', 'B', 'Gone'],
+                             'Creator Profile URL': ['https://s.test/@x', 'https://s.test/@old', 'https://s.test/@z']})
+    delta = pd.DataFrame({'Full URL': ['https://s.test/b', 'https://s.test/c'], 'Community Name': ['B', 'C'],
+                          'Creator Profile URL': ['https://s.test/@new', '']})
+
+    merged = merge_results(listing, delta, previous, str(tmp_path / 'profiles.csv'))
+
+    assert merged['Full URL'].tolist() == ['https://s.test/a', 'https://s.test/b', 'https://s.test/c']
+    assert merged['Creator Profile URL'].tolist() == ['https://s.test/@x', 'https://s.test/@new', '']
+    assert merged['Members'].tolist() == ['100', '200', '100']  # Listing columns come from the current listing
+    assert pd.read_csv(tmp_path / 'profiles.csv', dtype=str, keep_default_na=False).equals(merged)
+
+
+def test_merge_results_without_previous_output(tmp_path):
+    listing = pd.DataFrame([card('a'), card('b')]).astype(str)
+    delta = pd.DataFrame({'Full URL': ['https://s.test/a'], 'Creator Profile URL': ['https://s.test/@x']})
+
+    merged = merge_results(listing, delta, None, str(tmp_path / 'profiles.csv'))
+
+    assert merged['Creator Profile URL'].tolist() == ['https://s.test/@x', '']
+
+
+def test_merge_results_round_trips_parquet_as_text(tmp_path):
+    listing = pd.DataFrame([card('a'), card('b', members='1.2k')]).astype(str)
+    delta = pd.DataFrame({'Full URL': ['https://s.test/a'], 'Creator Profile URL': ['https://s.test/@x']})
+    path = str(tmp_path / 'profiles.parquet')
+
+    merge_results(listing, delta, None, path, stage='creator_profile')
+
+    assert read_output(path, columns=PROFILE_URL_COLUMNS).to_dict('records') == [
+        {'Full URL': 'https://s.test/a', 'Creator Profile URL': 'https://s.test/@x'},
+        {'Full URL': 'https://s.test/b', 'Creator Profile URL': ''},
+    ]
+    assert read_output(path)['Members'].tolist() == ['100', '1200']  # Typed as counts in the file
+    assert read_output(str(tmp_path / 'missing.parquet')) is None
@@ -0,0 +1,101 @@
+import pytest
+from fixtures import about_page_html, discovery_listing_props, discovery_page_html, profile_page_html
+from parsers import (parse_card_meta, parse_card_payload, parse_creator_profile_href, parse_discovery_cards,
+                     parse_last_page_number, parse_listing_payload, parse_next_data, parse_profile_details)
+
+SITE_URL = 'https://www.skool.com'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Private • 1.2kMembers • $49 /month', ('Private', 1200, '$49')),
+    ('Private • 2.5kMembers • $9.99 /month', ('Private', 2500, '$9.99')),
+    ('Public • 12kMembers • Free', ('Public', 12000, 'Free')),
+    ('Private • 312Members', ('Private', 312, 'N/A')),
+    ('Private', ('Private', 'N/A', 'N/A')),
+])
+def test_parse_card_meta(text, expected):
+    status, members, price = parse_card_meta(text)
+
+    assert (status, members, price) == expected
+    assert type(members) is type(expected[1])
+
+
+def test_parse_last_page_number():
+    assert parse_last_page_number(discovery_page_html(cards=3, last_page=17)) == 17
+    assert parse_last_page_number('<html><body></body></html>') is None
+
+
+def test_parse_discovery_cards():
+    cards = parse_discovery_cards(discovery_page_html(cards=5, page=2), SITE_URL)
+
+    assert [card.full_url for card in cards] == [f'{SITE_URL}/community-2-{i}' for i in range(5)]
+    assert cards[1].to_dict() == {'Full URL': f'{SITE_URL}/community-2-1', 'Community Name': 'Community 2-1',
+                                  'Status': 'Private', 'Members': 2100, 'Price': '$49'}
+    assert cards[0].price == 'Free'
+
+
+def test_parse_discovery_cards_without_cards():
+    assert parse_discovery_cards('<html><body></body></html>', SITE_URL) == []
+
+
+def test_parse_card_payload_skips_cards_without_href_or_content():
+    items = [
+        {'href': '/a', 'content': True, 'name': ' A ', 'meta': 'Private • 10Members • Free'},
+        {'href': None, 'content': True, 'name': 'B', 'meta': None},
+        {'href': '/c', 'content': False, 'name': None, 'meta': None},
+        {'href': '/d', 'content': True, 'name': None, 'meta': None},
+    ]
+    cards = parse_card_payload(items, SITE_URL)
+
+    assert [(card.full_url, card.community_name, card.status) for card in cards] == [
+        (f'{SITE_URL}/a', 'A', 'Private'), (f'{SITE_URL}/d', 'N/A', 'N/A')]
+
+
+def test_listing_payload_cards_match_html_cards():
+    html_cards = [card.to_dict() for card in parse_discovery_cards(discovery_page_html(cards=12, page=2), SITE_URL)]
+    payload = {'pageProps': discovery_listing_props(cards=12, page=2, last_page=3)}
+    json_cards, last_page = parse_listing_payload(payload, SITE_URL)
+
+    assert [card.to_dict() for card in json_cards] == html_cards
+    assert [tuple(map(type, card.values())) for card in html_cards] == [
+        tuple(map(type, card.to_dict().values())) for card in json_cards]
+    assert last_page == 3
+
+
+def test_parse_next_data():
+    next_data = parse_next_data(discovery_page_html(cards=2, last_page=5, build_id='abc'))
+
+    assert next_data['buildId'] == 'abc'
+    cards, last_page = parse_listing_payload(next_data, SITE_URL)
+    assert [card.full_url for card in cards] == [f'{SITE_URL}/community-1-0', f'{SITE_URL}/community-1-1']
+    assert last_page == 5
+    assert parse_next_data(discovery_page_html(cards=2)) is None
+
+
+def test_parse_creator_profile_href():
+    assert parse_creator_profile_href(about_page_html('/@someone')) == '/@someone'
+    assert parse_creator_profile_href('<html><body></body></html>') is None
+
+
+def test_parse_profile_details():
+    details = parse_profile_details(profile_page_html(contributions='7', followers='2.5k'))
+
+    assert (details.contributions, details.followers) == ('7', '2.5k')
+    assert details.instagram == 'https://instagram.com/creator'
+    assert details.twitter == 'https://x.com/creator'
+    assert details.website == 'https://creator.dev'
+
+
+def test_parse_profile_details_without_links():
+    details = parse_profile_details(profile_page_html(links=[]))
+
+    assert details.instagram is None and details.website is None
+
+
+@pytest.mark.parametrize('html', ['', '   \n', '<!-- -->'])
+def test_parsers_return_empty_results_for_blank_pages(html):
+    assert parse_last_page_number(html) is None
+    assert parse_discovery_cards(html, SITE_URL) == []
+    assert parse_next_data(html) is None
+    assert parse_creator_profile_href(html) is None
+    assert parse_profile_details(html).followers is None
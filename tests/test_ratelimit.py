@@ -0,0 +1,68 @@
+import pytest
+import ratelimit
+from ratelimit import AdaptiveRateLimiter
+
+
+class FakeClock:
+    """
+    Replaces the time module inside ratelimit, so sleeping only advances a counter.
+    """
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, 'time', clock)
+    monkeypatch.setattr(ratelimit.random, 'uniform', lambda low, high: high)
+    return clock
+
+
+def test_acquire_paces_requests_at_the_rate(clock):
+    limiter = AdaptiveRateLimiter(rate=2.0)
+    start = clock.now
+    for _ in range(5):
+        limiter.acquire()
+
+    assert clock.now - start == pytest.approx(2.0)  # The first token is ready, then one per 0.5s
+
+
+def test_rate_increases_additively_and_decreases_multiplicatively(clock):
+    limiter = AdaptiveRateLimiter(rate=1.0, max_rate=1.2, increase=0.1, decrease=0.5, min_rate=0.3)
+    limiter.record_success()
+    assert limiter.rate == pytest.approx(1.1)
+    limiter.record_success()
+    limiter.record_success()
+    assert limiter.rate == pytest.approx(1.2)
+
+    limiter.record_failure()
+    assert limiter.rate == pytest.approx(0.6)
+    limiter.record_failure()
+    assert limiter.rate == pytest.approx(0.3)
+
+
+def test_failures_back_off_exponentially_until_a_success(clock):
+    limiter = AdaptiveRateLimiter(rate=100.0, max_rate=100.0, min_rate=100.0, base_backoff=2.0, max_backoff=5.0)
+    limiter.acquire()
+
+    waits = []
+    for _ in range(3):
+        limiter.record_failure()
+        start = clock.now
+        limiter.acquire()
+        waits.append(clock.now - start)
+    assert waits == pytest.approx([2.0, 4.0, 5.0])
+
+    limiter.record_success()
+    limiter.record_failure()
+    start = clock.now
+    limiter.acquire()
+    assert clock.now - start == pytest.approx(2.0)
@@ -0,0 +1,35 @@
+import json
+from metrics import Metrics
+from readiness import Readiness, wait_until_ready
+
+
+class FakeTab:
+    def __init__(self, *states):
+        self.states = list(states)
+
+    def run_js(self, script, selectors):
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return json.dumps(state)
+
+
+def test_wait_until_ready_counts_a_found_selector():
+    metrics = Metrics()
+    tab = FakeTab({'found': -1, 'state': 'loading', 'resources': 1},
+                  {'found': 0, 'state': 'interactive', 'resources': 2})
+
+    outcome = wait_until_ready(tab, Readiness(poll_interval=0), metrics, 'about', 'cards')
+
+    assert outcome == 'selector'
+    snapshot = metrics.snapshot()
+    assert snapshot['counters']['waits{outcome="selector",stage="about"}'] == 1
+    assert snapshot['timers']['wait{stage="about"}']['count'] == 1
+
+
+def test_a_settled_page_without_its_target_ends_the_wait_early():
+    metrics = Metrics()
+    tab = FakeTab({'found': -1, 'state': 'complete', 'resources': 3})
+
+    outcome = wait_until_ready(tab, Readiness(timeout=5, idle_time=0, poll_interval=0), metrics, 'profile', 'links')
+
+    assert outcome == 'idle'
+    assert metrics.snapshot()['counters']['waits{outcome="idle",stage="profile"}'] == 1
@@ -0,0 +1,141 @@
+import pandas as pd
+import pytest
+import requests
+import retry
+from http_fetch import CacheMissError
+from incremental import dead_letter_urls
+from retry import (BLOCKED, CACHE_MISS, NETWORK, SELECTOR_MISSING, DeadLetters, Failure, RetryQueue, classify_error,
+                   classify_page)
+
+
+class FakeClock:
+    """
+    Replaces the time module inside retry, so sleeping only advances a counter.
+    """
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry, 'time', clock)
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: high)
+    return clock
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"HTTP {status}", response=response)
+
+
+@pytest.mark.parametrize('error, kind', [
+    (http_error(429), BLOCKED),
+    (http_error(403), BLOCKED),
+    (http_error(503), NETWORK),
+    (http_error(404), SELECTOR_MISSING),
+    (requests.ConnectionError('reset'), NETWORK),
+    (CacheMissError('https://s.test/a is not in the HTML cache.'), CACHE_MISS),
+    (ValueError('bad page'), SELECTOR_MISSING),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error).kind == kind
+
+
+def test_cache_misses_are_not_retried():
+    assert not classify_error(CacheMissError('missing')).transient
+
+
+def test_classify_page_spots_challenge_pages():
+    assert classify_page('<html><div id="cf-challenge"></div></html>', 'group info').kind == BLOCKED
+    assert classify_page('<html><body>Too Many Requests</body></html>', 'group info').kind == BLOCKED
+    assert classify_page('<html><body>Hello</body></html>', 'group info') == Failure(
+        SELECTOR_MISSING, 'No group info on the page')
+    assert classify_page(None, 'social links').kind == SELECTOR_MISSING
+
+
+def test_blocked_failures_back_off_exponentially(clock):
+    queue = RetryQueue(max_attempts=4, base_delay=5.0, max_delay=12.0)
+    assert queue.add('https://s.test/a', Failure(BLOCKED, 'HTTP 429'))
+    attempts = []
+
+    def fetch(url):
+        attempts.append(clock.now)
+        return Failure(BLOCKED, 'HTTP 429') if len(attempts) < 3 else None
+
+    assert queue.drain(fetch) == 1
+    assert clock.sleeps == [5.0, 10.0, 12.0]  # Doubling per attempt, capped at max_delay
+    assert attempts == [105.0, 115.0, 127.0]
+    assert queue.dead == {}
+
+
+def test_urls_are_given_up_after_max_attempts(clock):
+    queue = RetryQueue(max_attempts=2, base_delay=1.0)
+    queue.add('https://s.test/a', Failure(NETWORK, 'reset'))
+
+    assert queue.drain(lambda url: Failure(NETWORK, 'reset again')) == 0
+    assert queue.dead == {'https://s.test/a': (Failure(NETWORK, 'reset again'), 2)}
+    assert len(queue) == 0
+
+
+def test_permanent_failures_are_not_scheduled(clock):
+    queue = RetryQueue()
+
+    assert not queue.add('https://s.test/a', Failure(SELECTOR_MISSING, 'No group info on the page'))
+    assert len(queue) == 0
+    assert queue.dead['https://s.test/a'][1] == 1
+
+
+def test_drain_retries_in_due_order(clock):
+    queue = RetryQueue(base_delay=1.0)
+    queue.add('https://s.test/a', Failure(NETWORK, 'reset'))
+    clock.now -= 0.5
+    queue.add('https://s.test/b', Failure(NETWORK, 'reset'))  # Scheduled second, but due first
+    fetched = []
+
+    queue.drain(lambda url: fetched.append(url))
+
+    assert fetched == ['https://s.test/b', 'https://s.test/a']
+
+
+def test_dead_letters_survive_a_reload_and_filter_by_kind(tmp_path, clock):
+    path = str(tmp_path / 'dead_letter.csv')
+    dead_letters = DeadLetters(path)
+    dead_letters.record('creator_profile', 'https://s.test/a', Failure(NETWORK, 'reset'), 3)
+    clock.now += 1
+    dead_letters.record('creator_profile', 'https://s.test/b', Failure(SELECTOR_MISSING, 'No group info'), 1)
+    clock.now += 1
+    dead_letters.record('profile_details', 'https://s.test/@x', Failure(BLOCKED, 'HTTP 429'), 3)
+    dead_letters.save()
+
+    reloaded = DeadLetters(path)
+    assert reloaded.urls('creator_profile') == ['https://s.test/a', 'https://s.test/b']
+    assert reloaded.urls('creator_profile', kinds=retry.TRANSIENT) == ['https://s.test/a']
+    reloaded.discard('creator_profile', 'https://s.test/a')
+    assert reloaded.urls('creator_profile') == ['https://s.test/b']
+
+
+def test_dead_letter_urls_only_requeues_transient_failures(tmp_path, clock):
+    dead_letters = DeadLetters(str(tmp_path / 'dead_letter.csv'))
+    dead_letters.record('creator_profile', 'https://s.test/a', Failure(NETWORK, 'reset'), 3)
+    dead_letters.record('creator_profile', 'https://s.test/b', Failure(SELECTOR_MISSING, 'No group info'), 1)
+    dead_letters.record('creator_profile', 'https://s.test/c', Failure(CACHE_MISS, 'missing'), 1)
+    dead_letters.record('profile_details', 'https://s.test/@x', Failure(BLOCKED, 'HTTP 429'), 3)
+    dead_letters.record('profile_details', 'https://s.test/@y', Failure(SELECTOR_MISSING, 'No social links'), 1)
+    profiles = pd.DataFrame({'Full URL': ['https://s.test/d', 'https://s.test/e'],
+                             'Creator Profile URL': ['https://s.test/@x', 'https://s.test/@y']})
+
+    assert dead_letter_urls(dead_letters, profiles) == {'https://s.test/a', 'https://s.test/d'}
@@ -0,0 +1,20 @@
+from html_cache import HtmlCache
+from metrics import Metrics
+import scrape_profile
+import scrape_profile_details
+
+
+def test_empty_cached_pages_are_misses_not_errors(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put('https://www.skool.com/group/about', '')
+    cache.put('https://www.skool.com/@creator', '')
+    profile_scraper = scrape_profile.Scraper(base_url='https://www.skool.com', user_profile='test', backend='cache',
+                                             cache=cache, metrics=Metrics())
+    details_scraper = scrape_profile_details.Scraper(user_profile='test', backend='cache', cache=cache,
+                                                     metrics=Metrics())
+
+    assert profile_scraper.fetch_creator_profile_url(1, 'https://www.skool.com/group') is None
+    assert profile_scraper.failures['https://www.skool.com/group/about'].kind == 'selector_missing'
+    assert details_scraper.lookup_profile_details(1, 'https://www.skool.com/@creator')[0] is None
+    profile_scraper.close()
+    details_scraper.close()
@@ -0,0 +1,78 @@
+import os
+import pandas as pd
+from shard import ShardCoordinator, split_shards
+
+
+def fake_worker(shard_path, output_path, log_path, die_once):
+    """
+    Stands in for shard.run_shard: logs the URLs it crawls and writes one follower count per row.
+    """
+    marker = f'{shard_path}.died'
+    if die_once and not os.path.exists(marker):
+        open(marker, 'w').close()
+        os._exit(1)
+    df = pd.read_pickle(shard_path)
+    with open(log_path, 'a') as f:
+        f.writelines(f'{url}\n' for url in df['Creator Profile URL'])
+    df['Followers'] = [f'{url[-1]}k' for url in df['Creator Profile URL']]
+    df.to_csv(output_path, index=False)
+
+
+class FakeCoordinator(ShardCoordinator):
+    def __init__(self, work_dir, die_once=(), **kwargs):
+        super().__init__('profile_details', ['Profile A', 'Profile B'], work_dir=str(work_dir), **kwargs)
+        self.log_path = os.path.join(work_dir, 'crawled.txt')
+        self.die_once = set(die_once)
+
+    def _start(self, context, shard_index, slot):
+        process = context.Process(target=fake_worker, args=(self._shard_path(shard_index),
+                                                            self._output_path(shard_index), self.log_path,
+                                                            shard_index in self.die_once))
+        process.start()
+        return process
+
+    def crawled(self):
+        with open(self.log_path) as f:
+            return f.read().split()
+
+
+def test_split_shards_preserves_order():
+    df = pd.DataFrame({'n': range(5)})
+
+    assert [shard['n'].tolist() for shard in split_shards(df, 2)] == [[0, 1, 2], [3, 4]]
+    assert len(split_shards(df, 10)) == 5
+
+
+def test_each_creator_is_crawled_once_and_fanned_out(tmp_path):
+    urls = ['https://s.test/@a', 'https://s.test/@b', 'https://s.test/@a', 'https://s.test/@c', 'https://s.test/@b']
+    df = pd.DataFrame({'Full URL': [f'https://s.test/g{i}' for i in range(5)], 'Creator Profile URL': urls})
+    coordinator = FakeCoordinator(tmp_path)
+
+    assert coordinator.run(df, str(tmp_path / 'full_data.csv'), shard_count=3) == []
+
+    assert sorted(coordinator.crawled()) == ['https://s.test/@a', 'https://s.test/@b', 'https://s.test/@c']
+    merged = pd.read_csv(tmp_path / 'full_data.csv')
+    assert merged['Full URL'].tolist() == df['Full URL'].tolist()
+    assert merged['Followers'].tolist() == ['ak', 'bk', 'ak', 'ck', 'bk']
+
+
+def test_shard_of_a_dead_worker_is_requeued(tmp_path):
+    df = pd.DataFrame({'Creator Profile URL': [f'https://s.test/@{name}' for name in 'abcd']})
+    coordinator = FakeCoordinator(tmp_path, die_once=[1])
+
+    assert coordinator.run(df, str(tmp_path / 'full_data.csv'), shard_count=2) == []
+
+    assert os.path.exists(coordinator._shard_path(1) + '.died')
+    assert sorted(coordinator.crawled()) == df['Creator Profile URL'].tolist()
+    assert pd.read_csv(tmp_path / 'full_data.csv')['Followers'].tolist() == ['ak', 'bk', 'ck', 'dk']
+
+
+def test_shard_is_given_up_after_max_attempts(tmp_path):
+    df = pd.DataFrame({'Creator Profile URL': [f'https://s.test/@{name}' for name in 'abcd']})
+    coordinator = FakeCoordinator(tmp_path, die_once=[0], max_attempts=1)
+
+    assert coordinator.run(df, str(tmp_path / 'full_data.csv'), shard_count=2) == [0]
+
+    merged = pd.read_csv(tmp_path / 'full_data.csv', keep_default_na=False)
+    assert merged['Creator Profile URL'].tolist() == df['Creator Profile URL'].tolist()
+    assert merged['Followers'].tolist() == ['', '', 'ck', 'dk']